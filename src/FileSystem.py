@@ -1,5 +1,6 @@
 from __future__ import annotations
 import os
+import subprocess
 import sys
 
 
@@ -41,10 +42,17 @@ def font(font_name: str) -> str | None:
     return os.path.abspath(path).replace('\\', '/') if os.path.exists(path) else None
 
 
+def open_command(target: str) -> list[str]:
+    """Returns the command that opens target (a file, a folder or a url) with its default application.
+    target is one argument of the command, it is never parsed by a shell."""
+    return ["open" if PLATFORM == "darwin" else "xdg-open", target]
+
+
 def open_file(file_path: str | None) -> None:
+    """Opens file_path with its default application without waiting for it."""
     if file_path is not None:
         if PLATFORM in ('win32',):
             os.startfile(file_path)
         elif PLATFORM in ('linux', 'darwin'):
-            os.system(f'xdg-open {file_path}')
-
+            subprocess.Popen(open_command(file_path), stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL,
+                             start_new_session=True)
@@ -9,7 +9,7 @@ import json
 from os import path
 from typing import Optional, Union
 
-from FileSystem import abspath, SAVE_FILE
+from FileSystem import SAVE_FILE, PROGRAM_DIR
 
 
 JsonType = Union[dict, list, tuple, str, int, float, bool, None]
@@ -29,7 +29,8 @@ def _create_empty_save_file(file_path: str) -> None:
 def _prepare_save_file(save_file: Optional[str] = None) -> str:
     """If the save_file exists, retruns the save_file path. Otherwise, creates a new save_file."""
 
-    abs_file_path = SAVE_FILE if save_file is None else abspath(save_file)
+    # FileSystem.abspath returns None for a file that doesn't exist yet.
+    abs_file_path = SAVE_FILE if save_file is None else path.abspath(path.join(PROGRAM_DIR, save_file))
 
     if not path.exists(abs_file_path):
         _create_empty_save_file(abs_file_path)
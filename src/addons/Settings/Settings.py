@@ -1,5 +1,4 @@
 from typing import overload
-from importlib import reload
 import contextlib
 from typing import Optional, Tuple, Any
 from PyQt5 import QtCore, QtGui
@@ -23,8 +22,7 @@ from PyQt5.QtWidgets import (
 import SaveFile as Data
 from addon import AddOnBase
 from ui import BaseWindow, Entry
-from settings import UI_SCALE, CORNER_RADIUS
-import settings as GlobalSettings  # for reloading the values
+from settings import DEFAULT_UI_SCALE, ui_scale
 
 from .structure import STRUCTURE, UPDATE, ENTRY, SPIN, KEY, SETTING_TYPE, TYPE, OPTIONS
 
@@ -144,16 +142,23 @@ class SettingsUI(QWidget):
                 return Data.get_setting(setting_name)
 
         def set_setting_value(*_, setting_name: str = setting_key, value: Any = None) -> None:
+            if setting_name == "ui_scale":
+                # the scale service saves the value and updates the live widgets.
+                ui_scale.set_value(value)
+                return
             with contextlib.suppress(Data.NotFoundException):
                 Data.apply_setting(setting_name, value)
-            reload(GlobalSettings)
 
         def reset_setting_value(*_, setting_name: str = setting_key, widget: QSpinBox = None) -> None:
-            with contextlib.suppress(Data.NotFoundException):
-                Data.remove_setting(setting_name)
+            if setting_name == "ui_scale":
+                ui_scale.reset()
+            else:
+                with contextlib.suppress(Data.NotFoundException):
+                    Data.remove_setting(setting_name)
             if widget is not None:
-                reload(GlobalSettings)
-                widget.setValue(UI_SCALE)
+                widget.blockSignals(True)
+                widget.setValue(ui_scale.value)
+                widget.blockSignals(False)
 
         if setting_type == ENTRY:
             setting_layout.addWidget(entry := QLineEdit())
@@ -167,7 +172,7 @@ class SettingsUI(QWidget):
                 spinbox = QDoubleSpinBox()
                 
             setting_layout.addWidget(spinbox)
-            spinbox.setValue(value if (value:=get_setting_value()) is not None else UI_SCALE)
+            spinbox.setValue(value if (value:=get_setting_value()) is not None else DEFAULT_UI_SCALE)
             spinbox.setRange(0, 10)
             spinbox.setSingleStep(0.1)
             spinbox.valueChanged.connect(lambda value: set_setting_value(value=value))
@@ -0,0 +1,180 @@
+"""History of the picked colors.
+
+ColorHistory keeps at most capacity colors in a ring buffer, the oldest color is overwritten by a new one,
+and a set of its colors ignores the colors that are already in it. Adding a color is O(1) however long
+the history gets. ColorHistoryModel shows it newest first in a QListView, which only paints the rows
+on the screen, and saves it through the settings of the addon."""
+
+from __future__ import annotations
+
+from typing import Any, Iterator
+
+from PyQt5.QtCore import QAbstractListModel, QModelIndex, QTimer, Qt
+from PyQt5.QtGui import QColor
+
+from SaveFile import NotFoundException  # pylint: disable=import-error
+
+from .colorspace import hex_to_rgb
+
+
+HISTORY_SIZE = 100
+# milliseconds to wait before saving the history after a change.
+SAVE_DELAY = 1000
+
+
+def _is_hex_color(color: str) -> bool:
+    try:
+        hex_to_rgb(color)
+    except ValueError:
+        return False
+    return True
+
+
+class ColorHistory:
+    def __init__(self, capacity: int = HISTORY_SIZE) -> None:
+        self._capacity = max(capacity, 1)
+        self._slots: list[str | None] = [None] * self._capacity
+        # slot of the oldest color and number of colors.
+        self._start = 0
+        self._count = 0
+        self._colors: set[str] = set()
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __contains__(self, color: str) -> bool:
+        return color in self._colors
+
+    def __getitem__(self, index: int) -> str:
+        """Returns the index-th newest color."""
+        if not 0 <= index < self._count:
+            raise IndexError(index)
+        return self._slots[(self._start + self._count - 1 - index) % self._capacity]
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterates the colors from the newest."""
+        return (self[index] for index in range(self._count))
+
+    @property
+    def capacity(self) -> int:
+        return self._capacity
+
+    def add(self, color: str) -> tuple[bool, str | None]:
+        """Adds color as the newest color. Returns whether it was added and the color it evicted."""
+        if color in self._colors:
+            return False, None
+        evicted = None
+        if self._count == self._capacity:
+            evicted = self._slots[self._start]
+            self._colors.discard(evicted)
+            self._slots[self._start] = color
+            self._start = (self._start + 1) % self._capacity
+        else:
+            self._slots[(self._start + self._count) % self._capacity] = color
+            self._count += 1
+        self._colors.add(color)
+        return True, evicted
+
+    def pop_oldest(self) -> str:
+        if self._count == 0:
+            raise IndexError("pop from an empty history")
+        color = self._slots[self._start]
+        self._slots[self._start] = None
+        self._start = (self._start + 1) % self._capacity
+        self._count -= 1
+        self._colors.discard(color)
+        return color
+
+    def remove(self, index: int) -> str:
+        """Removes the index-th newest color. O(n), the colors after it are moved."""
+        colors = list(self)
+        color = colors.pop(index)
+        self._reset(reversed(colors))
+        return color
+
+    def clear(self) -> None:
+        self._reset([])
+
+    def _reset(self, colors_oldest_first) -> None:
+        self._slots = [None] * self._capacity
+        self._start = self._count = 0
+        self._colors.clear()
+        for color in colors_oldest_first:
+            self.add(color)
+
+
+class ColorHistoryModel(QAbstractListModel):
+    ColorRole = Qt.ItemDataRole.UserRole
+
+    def __init__(self, store, setting_name: str = "color_history") -> None:
+        """store keeps the history, it is the AddOnBase of the addon (get_setting and apply_setting)."""
+        super().__init__()
+        self._store = store
+        self._setting_name = setting_name
+        self._history = ColorHistory(int(self._get_setting("history_size", HISTORY_SIZE)))
+        colors = self._get_setting(setting_name, [])
+        for color in reversed(colors if isinstance(colors, list) else []):
+            if isinstance(color, str) and _is_hex_color(color):
+                self._history.add(color)
+
+        self._save_timer = QTimer(self)
+        self._save_timer.setSingleShot(True)
+        self._save_timer.setInterval(SAVE_DELAY)
+        self._save_timer.timeout.connect(self.save)
+
+    def _get_setting(self, name: str, default: Any) -> Any:
+        try:
+            return self._store.get_setting(name)
+        except NotFoundException:
+            return default
+
+    @property
+    def history(self) -> ColorHistory:
+        return self._history
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:  # pylint: disable=invalid-name
+        return 0 if parent.isValid() else len(self._history)
+
+    def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole) -> Any:
+        if not index.isValid() or index.row() >= len(self._history):
+            return None
+        color = self._history[index.row()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            return f"{color}    {hex_to_rgb(color)}"
+        if role == Qt.ItemDataRole.DecorationRole:
+            return QColor(color)
+        if role == Qt.ItemDataRole.ToolTipRole:
+            return "Double click to copy the hex color"
+        if role == self.ColorRole:
+            return color
+        return None
+
+    def add(self, color: str) -> None:
+        """Adds color at the top. The oldest color is removed from the bottom if the history is full."""
+        if color in self._history:
+            return
+        if len(self._history) == self._history.capacity:
+            last = len(self._history) - 1
+            self.beginRemoveRows(QModelIndex(), last, last)
+            self._history.pop_oldest()
+            self.endRemoveRows()
+        self.beginInsertRows(QModelIndex(), 0, 0)
+        self._history.add(color)
+        self.endInsertRows()
+        self._save_timer.start()
+
+    def remove(self, row: int) -> None:
+        self.beginRemoveRows(QModelIndex(), row, row)
+        self._history.remove(row)
+        self.endRemoveRows()
+        self._save_timer.start()
+
+    def clear(self) -> None:
+        self.beginResetModel()
+        self._history.clear()
+        self.endResetModel()
+        self._save_timer.start()
+
+    def save(self) -> None:
+        self._save_timer.stop()
+        self._store.apply_setting(self._setting_name, list(self._history))
@@ -1,18 +1,14 @@
 import sys
 import os
+import threading
 from typing import Optional
 
 from pynput import mouse
 
-from numpy import array
-
 from PyQt5.QtWidgets import (QApplication, QWidget, QLabel, QVBoxLayout,
-                             QGridLayout, QFrame, QSizePolicy,
-                             QSpacerItem, QPushButton)
-from PyQt5.QtGui import QCursor, QPainter, QPixmap, QColor, QIcon, QPen, QPainterPath, QImage, QRadialGradient, QBrush
-from PyQt5.QtCore import Qt, QTimer, pyqtSignal, QRectF
-from PyQt5.QtSvg import QSvgWidget
-from PIL import ImageGrab, Image
+                             QGridLayout, QPushButton, QListView)
+from PyQt5.QtGui import QPainter, QColor, QIcon, QPen, QImage, QGuiApplication
+from PyQt5.QtCore import Qt, QTimer, pyqtSignal, QRect, QObject
 from addon import AddOnBase
 
 
@@ -29,8 +25,18 @@ from ui.custom_button import RedButton, TextButton  # pylint: disable=import-err
 
 if __name__ == "__main__":
     from vcolorpicker import ColorPicker
+    from screen_capture import grab_around, grab_region, center_color, image_pixels
+    from palette import extract_palette, DOMINANT_COLORS
+    from color_history import ColorHistoryModel
+    from colorspace import hex_to_rgb, rgb_to_hex
+    from magnifier import Magnifier
 else:
     from .vcolorpicker import ColorPicker
+    from .screen_capture import grab_around, grab_region, center_color, image_pixels
+    from .palette import extract_palette, DOMINANT_COLORS
+    from .color_history import ColorHistoryModel
+    from .colorspace import hex_to_rgb, rgb_to_hex
+    from .magnifier import Magnifier
 
 
 def resize_image(image, target_width, target_height):
@@ -46,105 +52,67 @@ def get_pixel_from_position(position) -> str:
     Returns:
         str: Pixel color in hex format
     """
-    pixel = ImageGrab.grab().load()[position.x(), position.y()]
-
-    # convert pixel color to hex
-    pixel = f"#{pixel[0]:02x}{pixel[1]:02x}{pixel[2]:02x}"
+    return center_color(grab_around(position, 0))
 
-    return pixel
 
+class ColorHistoryWidget(QWidget):
+    """The picked colors, newest first. The list view only creates the rows on the screen,
+    so a long history costs a row of data per color instead of a widget per color."""
 
-class SelectedColorWidget(QWidget):
-    def __init__(self, color: str = '#000000'):
+    def __init__(self, model: ColorHistoryModel):
         super().__init__()
-        self.color = color
+        self.model = model
         self.clipboard = QApplication.clipboard()
         self.layout = QGridLayout()
-
-        self.copy_svg_icon = QSvgWidget(os.path.join(os.path.dirname(
-            os.path.abspath(__file__)), "icons", "copy-icon.svg"))
-        self.copy_svg_icon = self.copy_svg_icon.grab()
-
+        self.layout.setContentsMargins(0, 0, 0, 0)
         self.setLayout(self.layout)
 
-        self.delete_widget_btn = RedButton()
-        self.delete_widget_btn.setToolTip("Remove selected color")
-
-        # scale button size to 50% of default
-        self.delete_widget_btn.setIconSize(
-            self.delete_widget_btn.iconSize() * 0.5)
-
-        self.delete_widget_btn.clicked.connect(self.delete_widget)
-
-        self.color_label_hex = QLabel("Hex Color:")
-        self.color_label_hex.setFont(get_font(DEFAULT_BOLD, 12))
-        self.color_label_hex.setStyleSheet("color: #000000;")
-        self.color_label_hex.setAlignment(Qt.AlignRight | Qt.AlignVCenter)
-
-        self.color_value_hex = QLabel(self.color)
-        self.color_value_hex.setFont(get_font(DEFAULT_REGULAR, 10))
-        self.color_value_hex.setStyleSheet("color: #000000;")
-        self.color_value_hex.setAlignment(Qt.AlignLeft | Qt.AlignVCenter)
-
-        self.copy_color_hex_btn = QPushButton()
-        self.copy_color_hex_btn.setFixedWidth(25)
-        self.copy_color_hex_btn.setIcon(QIcon(self.copy_svg_icon))
-        self.copy_color_hex_btn.setStyleSheet('background: white;')
-        self.copy_color_hex_btn.setStyleSheet(
-            "QPushButton:hover { " + f"background-color: {self.color}; " + "}")
-        self.copy_color_hex_btn.clicked.connect(
-            lambda: self.clipboard.setText(self.color))
-
-        self.layout.addWidget(self.color_label_hex, 0, 0, 1, 3)
-        self.layout.addWidget(self.color_value_hex, 0, 3, 1, 5)
-        self.layout.addWidget(self.copy_color_hex_btn, 0, 8, 1, 1)
-        self.layout.addWidget(self.delete_widget_btn, 0, 9, 1, 1)
-
-        self.color_label_rgb = QLabel("RGB Color:")
-        self.color_label_rgb.setFont(get_font(DEFAULT_BOLD, 12))
-        self.color_label_rgb.setStyleSheet("color: #000000;")
-        self.color_label_rgb.setAlignment(Qt.AlignRight | Qt.AlignVCenter)
-
-        self.color_value_rgb = QLabel(str(QColor(self.color).getRgb()[0:3]))
-        self.color_value_rgb.setFont(get_font(DEFAULT_REGULAR, 10))
-        self.color_value_rgb.setStyleSheet("color: #000000;")
-        self.color_value_rgb.setAlignment(Qt.AlignLeft | Qt.AlignVCenter)
-
-        self.copy_color_rgb_btn = QPushButton()
-        self.copy_color_rgb_btn.setFixedWidth(25)
-        self.copy_color_rgb_btn.setIcon(QIcon(self.copy_svg_icon))
-        self.copy_color_rgb_btn.setStyleSheet('background: white;')
-
-        # set color on hover to match color of selected color
-        self.copy_color_rgb_btn.setStyleSheet(
-            "QPushButton:hover { " + f"background-color: {self.color}; " + "}")
-        self.copy_color_rgb_btn.clicked.connect(
-            lambda: self.clipboard.setText(str(QColor(self.color).getRgb()[0:3])))
-
-        self.layout.addWidget(self.color_label_rgb, 1, 0, 1, 3)
-        self.layout.addWidget(self.color_value_rgb, 1, 3, 1, 5)
-        self.layout.addWidget(self.copy_color_rgb_btn, 1, 8, 1, 1)
-
-        self.color_display_box = QFrame()
-        self.color_display_box.setStyleSheet(
-            f"background-color: {self.color};")
-        self.color_display_box.setMaximumSize(280, 280)
-        self.color_display_box.setMinimumSize(280, 25)
-        self.color_display_box.setFrameShape(QFrame.Box)
-        self.color_display_box.setFrameShape(QFrame.StyledPanel)
-
-        self.color_display_box.setFrameShadow(QFrame.Raised)
-        self.color_display_box.setLineWidth(2)
-
-        self.layout.addWidget(self.color_display_box, 2, 0, 1, 10)
-
-        # add a spacer to push the color display box to the top
-        self.layout.addItem(QSpacerItem(
-            0, 0, QSizePolicy.Minimum, QSizePolicy.Expanding), 3, 0, 1, 10)
-
-    def delete_widget(self):
-        self.deleteLater()
-        buddy_color_picker.resize_signal.emit()
+        self.title = QLabel("Color History")
+        self.title.setFont(get_font(DEFAULT_BOLD, 12))
+        self.title.setStyleSheet("color: #000000;")
+
+        self.list_view = QListView()
+        self.list_view.setModel(model)
+        self.list_view.setUniformItemSizes(True)
+        self.list_view.setFont(get_font(DEFAULT_REGULAR, 10))
+        self.list_view.setMinimumHeight(150)
+        self.list_view.doubleClicked.connect(lambda index: self.copy_hex())
+
+        copy_icon = QIcon(os.path.join(os.path.dirname(os.path.abspath(__file__)), "icons", "copy-icon.svg"))
+        self.copy_hex_button = QPushButton(copy_icon, "Hex")
+        self.copy_hex_button.setToolTip("Copy the hex color")
+        self.copy_hex_button.clicked.connect(self.copy_hex)
+        self.copy_rgb_button = QPushButton(copy_icon, "RGB")
+        self.copy_rgb_button.setToolTip("Copy the RGB color")
+        self.copy_rgb_button.clicked.connect(self.copy_rgb)
+        self.remove_button = QPushButton("Remove")
+        self.remove_button.setShortcut(Qt.Key_Delete)
+        self.remove_button.clicked.connect(self.remove_selected)
+        self.clear_button = QPushButton("Clear")
+        self.clear_button.clicked.connect(model.clear)
+
+        self.layout.addWidget(self.title, 0, 0, 1, 4)
+        self.layout.addWidget(self.list_view, 1, 0, 1, 4)
+        self.layout.addWidget(self.copy_hex_button, 2, 0)
+        self.layout.addWidget(self.copy_rgb_button, 2, 1)
+        self.layout.addWidget(self.remove_button, 2, 2)
+        self.layout.addWidget(self.clear_button, 2, 3)
+
+    def selected_color(self) -> Optional[str]:
+        index = self.list_view.currentIndex()
+        return self.model.data(index, ColorHistoryModel.ColorRole) if index.isValid() else None
+
+    def copy_hex(self):
+        if (color := self.selected_color()) is not None:
+            self.clipboard.setText(color)
+
+    def copy_rgb(self):
+        if (color := self.selected_color()) is not None:
+            self.clipboard.setText(str(hex_to_rgb(color)))
+
+    def remove_selected(self):
+        if (index := self.list_view.currentIndex()).isValid():
+            self.model.remove(index.row())
 
 
 class ColorPickerWidget(ColorPicker):
@@ -158,25 +126,169 @@ class ColorPickerWidget(ColorPicker):
         buddy_color_picker.show()
 
 
+class RegionSelector(QWidget):
+    """Covers the desktop and lets the user drag out a rectangle. Escape cancels."""
+
+    region_selected = pyqtSignal(QRect)
+    cancelled = pyqtSignal()
+
+    def __init__(self):
+        super().__init__()
+        self.setWindowFlags(Qt.FramelessWindowHint | Qt.WindowStaysOnTopHint | Qt.Tool)
+        self.setAttribute(Qt.WA_TranslucentBackground)
+        self.setCursor(Qt.CrossCursor)
+        self._origin = None
+        self._selection = QRect()
+
+    def start(self):
+        self._origin = None
+        self._selection = QRect()
+        self.setGeometry(QGuiApplication.primaryScreen().virtualGeometry())
+        self.show()
+        self.activateWindow()
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        # a transparent window doesn't receive the mouse events, the desktop is dimmed slightly instead.
+        painter.fillRect(self.rect(), QColor(0, 0, 0, 60))
+        if not self._selection.isEmpty():
+            selection = self._selection.translated(-self.geometry().topLeft())
+            painter.setCompositionMode(QPainter.CompositionMode_Clear)
+            painter.fillRect(selection, Qt.transparent)
+            painter.setCompositionMode(QPainter.CompositionMode_SourceOver)
+            painter.setPen(QPen(QColor('white'), 1, Qt.DashLine))
+            painter.drawRect(selection.adjusted(0, 0, -1, -1))
+        painter.end()
+
+    def mousePressEvent(self, event):
+        self._origin = event.globalPos()
+
+    def mouseMoveEvent(self, event):
+        if self._origin is not None:
+            self._selection = QRect(self._origin, event.globalPos()).normalized()
+            self.update()
+
+    def mouseReleaseEvent(self, event):
+        if self._origin is None:
+            return
+        selection = QRect(self._origin, event.globalPos()).normalized()
+        self.hide()
+        if selection.width() > 1 and selection.height() > 1:
+            self.region_selected.emit(selection)
+        else:
+            self.cancelled.emit()
+
+    def keyPressEvent(self, event):
+        if event.key() == Qt.Key_Escape:
+            self.hide()
+            self.cancelled.emit()
+
+
+class PaletteExtractor(QObject):
+    """Extracts the palette of a captured region on a worker thread.
+    palette_ready is emitted with every progressive palette of the last extracted region,
+    failed with the error if its extraction fails."""
+
+    palette_ready = pyqtSignal(object)
+    failed = pyqtSignal(str)
+    _palette_extracted = pyqtSignal(int, object)
+    _extraction_failed = pyqtSignal(int, str)
+
+    def __init__(self):
+        super().__init__()
+        self._generation = 0
+        self._palette_extracted.connect(self._on_palette_extracted)
+        self._extraction_failed.connect(self._on_extraction_failed)
+
+    def extract(self, image: QImage) -> None:
+        # a new region makes the palettes of the previous one stale, its thread stops at its next palette.
+        self._generation += 1
+        threading.Thread(target=self._extract, args=(image, self._generation), daemon=True).start()
+
+    def _extract(self, image: QImage, generation: int) -> None:
+        # image is kept alive here, image_pixels is a view of its pixels.
+        try:
+            for palette in extract_palette(image_pixels(image)):
+                if generation != self._generation:
+                    return
+                self._palette_extracted.emit(generation, palette)
+        except Exception as err:  # pylint: disable=broad-except
+            self._extraction_failed.emit(generation, str(err))
+
+    def _on_palette_extracted(self, generation: int, palette) -> None:
+        if generation == self._generation:
+            self.palette_ready.emit(palette)
+
+    def _on_extraction_failed(self, generation: int, error: str) -> None:
+        if generation == self._generation:
+            self.failed.emit(error)
+
+
+class PaletteWidget(QWidget):
+    """Swatches of the average, median and dominant colors of the last region. click a swatch to keep its color."""
+
+    def __init__(self):
+        super().__init__()
+        self.layout = QGridLayout()
+        self.setLayout(self.layout)
+
+        self.title = QLabel("Region Palette")
+        self.title.setFont(get_font(DEFAULT_BOLD, 12))
+        self.title.setStyleSheet("color: #000000;")
+        self.layout.addWidget(self.title, 0, 0, 1, DOMINANT_COLORS + 2)
+
+        # the swatches are created once and recolored for every palette.
+        self.swatches = []
+        for column in range(DOMINANT_COLORS + 2):
+            swatch = QPushButton()
+            swatch.setFixedSize(36, 36)
+            swatch.clicked.connect(lambda checked, swatch=swatch: buddy_color_picker.add_selected_color_signal.emit(
+                swatch.property("color")))
+            self.swatches.append(swatch)
+            self.layout.addWidget(swatch, 1, column)
+
+    def set_error(self, error: str) -> None:
+        self.title.setText("Region Palette (failed)")
+        self.title.setToolTip(error)
+        for swatch in self.swatches:
+            swatch.hide()
+
+    def set_palette(self, palette) -> None:
+        self.title.setText("Region Palette" if palette.final else "Region Palette (refining...)")
+        self.title.setToolTip("")
+        colors = [(palette.average, "Average"), (palette.median, "Median")]
+        colors += [(color, f"Dominant {share:.0%}") for color, share in palette.dominant]
+        for index, swatch in enumerate(self.swatches):
+            if index >= len(colors):
+                swatch.hide()
+                continue
+            color, name = colors[index]
+            color = rgb_to_hex(color)
+            swatch.setProperty("color", color)
+            swatch.setToolTip(f"{name}: {color}")
+            swatch.setStyleSheet(f"background-color: {color}; border: 1px solid #808080; border-radius: 4px;")
+            swatch.show()
+
+
 class BuddyColorPicker(BaseWindow):
     add_selected_color_signal = pyqtSignal(str)
-    resize_signal = pyqtSignal()
 
     def __init__(self):
         super().__init__()
         self.layout = QVBoxLayout()
-        self.selected_color_widget = None
-        self.selected_color_widgets = 0
-        self.added_colors = []
-        
+        # the history is saved in the settings of the addon.
+        self.history_model = ColorHistoryModel(AddOnBase())
+        QApplication.instance().aboutToQuit.connect(self.history_model.save)
+
         self._desktop_color_picker = MagnifierWidget()
         self._color_picker = ColorPickerWidget()
+        self._region_selector = RegionSelector()
+        self._palette_extractor = PaletteExtractor()
 
         self.setLayout(self.layout)
         self.setMaximumHeight(800)
 
         self.add_selected_color_signal.connect(self.add_selected_color)
-        self.resize_signal.connect(self.resize_self)
 
         # self.findChildren(InnerPart)[0].edit_button.hide()
 
@@ -187,12 +299,23 @@ class BuddyColorPicker(BaseWindow):
             self.start_desktop_color_picker)
         self.color_picker.clicked.connect(self.start_color_picker)
 
+        self.region_palette = TextButton(text=" Region Palette ")
+        self.region_palette.clicked.connect(self.start_region_palette)
+        self._region_selector.region_selected.connect(self.extract_region_palette)
+        self._region_selector.cancelled.connect(self.show)
+
+        self.palette_widget = PaletteWidget()
+        self.palette_widget.hide()
+        self._palette_extractor.palette_ready.connect(self.palette_widget.set_palette)
+        self._palette_extractor.failed.connect(self.palette_widget.set_error)
+
         self.layout.addWidget(self.desktop_color_picker)
         self.layout.addWidget(self.color_picker)
+        self.layout.addWidget(self.region_palette)
+        self.layout.addWidget(self.palette_widget)
 
-        self.vertical_spacer = QSpacerItem(
-            0, 0, QSizePolicy.Minimum, QSizePolicy.Expanding)
-        self.layout.addItem(self.vertical_spacer)
+        self.history_widget = ColorHistoryWidget(self.history_model)
+        self.layout.addWidget(self.history_widget)
 
         self.animate = True
         self.adjustSize()
@@ -206,172 +329,49 @@ class BuddyColorPicker(BaseWindow):
         self.hide()
         self._color_picker.show()
 
+    def start_region_palette(self):
+        self.hide()
+        self._region_selector.start()
+
+    def extract_region_palette(self, region: QRect):
+        # wait for the selector to disappear from the screen before grabbing it.
+        QTimer.singleShot(100, lambda: self._extract_region_palette(region))
+
+    def _extract_region_palette(self, region: QRect):
+        self._palette_extractor.extract(grab_region(region.x(), region.y(), region.width(), region.height()))
+        self.palette_widget.show()
+        self.show()
+        self.adjustSize()
+
     def on_close_button_clicked(self):
         self.hide()
         self._desktop_color_picker.hide()
         self._color_picker.hide()
+        self._region_selector.hide()
 
     def add_selected_color(self, color: str):
-        if color not in self.added_colors:
-            self.added_colors.append(color)
-            self.selected_color_widget = SelectedColorWidget(color=color)
-            self.layout.insertWidget(
-                self.layout.count() - 1, self.selected_color_widget)
-
-            self.selected_color_widgets = len(
-                self.findChildren(SelectedColorWidget))
-            self.setMinimumHeight(300 + 100 * self.selected_color_widgets)
-            if self.selected_color_widgets > 5:
-                for ind, selected_color_widget in enumerate(self.findChildren(SelectedColorWidget)):
-                    if ind < self.selected_color_widgets - 5:
-                        selected_color_widget.hide()
-
-    def resize_self(self):
-        self.setMinimumHeight(100 + 100 * self.selected_color_widgets)
-        self.setMaximumHeight(200 + 100 * self.selected_color_widgets)
-        self.adjustSize()
+        self.history_model.add(color)
 
 
-class MagnifierWidget(QWidget):
+class MagnifierWidget(Magnifier):
+    """The magnifier of the desktop color picker. It follows the mouse and picks the color under a click."""
+
     def __init__(self, parent: Optional[QWidget] = None):
-        super().__init__()
-        self.parent = parent
-        self.color = '#000000'
-        self.track_color = False
+        super().__init__(parent)
         self.listener = None
-        self.initUI()
-
-    def initUI(self):
-        self.layout = QVBoxLayout(self)
-        self.setWindowFlags(Qt.FramelessWindowHint | Qt.WindowStaysOnTopHint)
-        self.setAttribute(Qt.WA_TranslucentBackground)
-
-        self.label = QLabel(self)
-        self.label.resize(340, 340)
-
-        self.layout.addWidget(self.label)
-
-        screen_geometry = QApplication.desktop().screenGeometry()
-        window_width = self.width()
-        x_pos = screen_geometry.width() - window_width - -200
-        y_pos = 50
-
-        self.move(x_pos, y_pos)
-
-        self.timer = QTimer()
-        self.timer.timeout.connect(self.capture)
-        self.timer.start(60)
-
-    def paintEvent(self, event):
-        # Override QWidget's paint event to draw a circular mask with smooth edges
-        path = QPainterPath()
-        # Adjust the rectangle dimensions
-        path.addEllipse(QRectF(self.rect()).adjusted(7, 7, -7, -7))
-        mask = QPainter(self)
-        mask.setRenderHint(QPainter.Antialiasing)  # Enable anti-aliasing
-        mask.setClipPath(path)
-        mask.fillRect(self.rect(), Qt.black)
-
-    def generatePixmapMask(self, diameter):
-        # Create QPixmap with transparency
-        mask = QPixmap(diameter, diameter)
-        mask.fill(Qt.transparent)
-
-        # Create QPainter to draw on the QPixmap
-        painter = QPainter(mask)
-        painter.setRenderHint(QPainter.Antialiasing)
-
-        # Create radial gradient
-        gradient = QRadialGradient(
-            diameter / 2, diameter / 2, diameter / 2, diameter / 2, diameter / 2)
-        gradient.setColorAt(0, QColor(0, 0, 0, 255))
-        gradient.setColorAt(1, QColor(0, 0, 0, 0))
-
-        # Set gradient as brush
-        painter.setBrush(QBrush(gradient))
-        painter.setPen(Qt.NoPen)
-
-        # Draw ellipse
-        painter.drawEllipse(0, 0, diameter, diameter)
-        painter.end()
-
-        return mask
 
     def start_color_picker(self):
         self.listener = mouse.Listener(
-            on_click=lambda x, y, button, pressed: self.mousePressEvent(pressed))
+            on_click=lambda x, y, button, pressed: self.mousePressEvent(pressed),
+            on_move=self._on_mouse_move)
         self.listener.start()
         self.track_color = True
         self.move(50, 50)
         self.set_track_color(True)
+        self._last_position = None
+        self._wake_up()
         # self.title_layout.setContentsMargins(20, 10, 0, 10)
 
-    def capture(self):
-        if self.track_color:
-            cursor = QCursor.pos()
-            self.color = get_pixel_from_position(cursor)
-            x, y = cursor.x() - 8, cursor.y() - 8
-            x, y = int(x), int(y)
-
-            screen = ImageGrab.grab(bbox=(x, y, x + 17, y + 17))
-            screen_resized = screen.resize((340, 340), resample=Image.NEAREST)
-
-            screen_np = array(screen_resized)
-
-            height, width, channel = screen_np.shape
-            bytesPerLine = 3 * width
-            qImg = QImage(screen_np.data, width, height,
-                          bytesPerLine, QImage.Format_RGB888)
-
-            pixmap = QPixmap.fromImage(qImg)
-
-            painter = QPainter(pixmap)
-            pen = QPen(QColor('gray'), 1, Qt.SolidLine)
-            painter.setPen(pen)
-
-            pixel_size = 340 // 17
-
-            center = 340 // 2
-
-            for i in range(center % pixel_size, 340, pixel_size):
-                painter.drawLine(i - pixel_size // 2, 0,
-                                 i - pixel_size // 2, 340)
-                painter.drawLine(0, i - pixel_size // 2,
-                                 340, i - pixel_size // 2)
-
-            pen = QPen(QColor('white'), 1, Qt.SolidLine)
-            painter.setPen(pen)
-            painter.drawRect(center - pixel_size // 2 - 2, center -
-                             pixel_size // 2 - 2, pixel_size + 3, pixel_size + 3)
-
-            pen = QPen(QColor('black'), 2, Qt.SolidLine)
-            painter.setPen(pen)
-            painter.drawRect(center - pixel_size // 2, center -
-                             pixel_size // 2, pixel_size, pixel_size)
-
-            painter.end()
-
-            self.label.setPixmap(pixmap)
-
-            # Apply mask to pixmap
-            mask = self.generatePixmapMask(pixmap.width())
-            pixmap.setMask(mask.mask())
-
-            # Create QPainterPath
-            path = QPainterPath()
-            path.addEllipse(QRectF(0, 0, 0, 0))
-
-            # Create mask QPainter
-            mask_painter = QPainter(pixmap)
-            mask_painter.setRenderHint(QPainter.Antialiasing)
-            mask_painter.setClipPath(path)
-
-            # Draw pixmap onto itself using the mask painter
-            mask_painter.drawPixmap(0, 0, pixmap)
-            mask_painter.end()
-
-            self.label.setPixmap(pixmap)
-
     def mousePressEvent(self, event):
         self.set_track_color(False)
         self.listener.stop()
@@ -379,9 +379,6 @@ class MagnifierWidget(QWidget):
         buddy_color_picker.add_selected_color_signal.emit(self.color)
         buddy_color_picker.show()
 
-    def set_track_color(self, track_color: bool) -> None:
-        self.track_color = track_color
-
 
 buddy_color_picker = BuddyColorPicker()
 AddOnBase().activate = lambda: buddy_color_picker.show() if buddy_color_picker.isHidden() else buddy_color_picker.hide()
@@ -0,0 +1,166 @@
+"""Color space conversions of whole arrays of colors.
+
+The functions take an array of colors with the channels in the last axis, shape (..., 3), and convert
+every color at once with numpy. A single color given as a tuple (or a str for hex) takes a scalar path
+without numpy, which is faster for one color, and gets a tuple back.
+
+RGB channels are 0-255, uint8 arrays are normalized through a lookup table instead of a division.
+HSV and HLS channels are 0-1, like colorsys. The vcolorpicker functions (hsv2rgb, ...) are the scalar
+versions for its 0-100 hsv scale."""
+
+from __future__ import annotations
+
+import colorsys
+from typing import Sequence, Union
+
+import numpy as np
+
+
+Color = Union[tuple, np.ndarray]
+
+# 8 bit channel value: the same value in 0-1.
+_UNIT = np.arange(256, dtype=np.float64) / 255.0
+# ascii code: value of the hex digit, 255 for the codes that are not hex digits.
+_NIBBLE = np.full(256, 255, dtype=np.uint8)
+for _digit, _char in enumerate(b"0123456789abcdef"):
+    _NIBBLE[_char] = _NIBBLE[bytes([_char]).upper()[0]] = _digit
+# 8 bit channel value: ascii codes of its two hex digits.
+_HEX_DIGITS = np.frombuffer("".join(f"{value:02x}" for value in range(256)).encode("ascii"),
+                            dtype=np.uint8).reshape(256, 2)
+
+
+def _unit_rgb(rgb: Color) -> np.ndarray:
+    rgb = np.asarray(rgb)
+    if rgb.dtype == np.uint8:
+        return _UNIT[rgb]
+    return rgb.astype(np.float64) / 255.0
+
+
+def _hue(rgb: np.ndarray, maxc: np.ndarray, delta: np.ndarray) -> np.ndarray:
+    """The hue of HSV and HLS, like colorsys. 0 for the grays."""
+    r, g, b = rgb[..., 0], rgb[..., 1], rgb[..., 2]
+    safe_delta = np.where(delta == 0, 1.0, delta)
+    rc, gc, bc = (maxc - r) / safe_delta, (maxc - g) / safe_delta, (maxc - b) / safe_delta
+    hue = np.where(r == maxc, bc - gc, np.where(g == maxc, 2.0 + rc - bc, 4.0 + gc - rc))
+    return np.where(delta == 0, 0.0, (hue / 6.0) % 1.0)
+
+
+def rgb_to_hsv(rgb: Color) -> Color:
+    """Converts 0-255 RGB colors to 0-1 HSV colors."""
+    if isinstance(rgb, tuple):
+        return colorsys.rgb_to_hsv(rgb[0] / 255.0, rgb[1] / 255.0, rgb[2] / 255.0)
+    rgb = _unit_rgb(rgb)
+    maxc, minc = rgb.max(axis=-1), rgb.min(axis=-1)
+    delta = maxc - minc
+    saturation = np.divide(delta, maxc, out=np.zeros_like(maxc), where=maxc > 0)
+    return np.stack((_hue(rgb, maxc, delta), saturation, maxc), axis=-1)
+
+
+def hsv_to_rgb(hsv: Color) -> Color:
+    """Converts 0-1 HSV colors to 0-255 RGB colors. the result is float, use to_rgb8 for 8 bit channels."""
+    if isinstance(hsv, tuple):
+        r, g, b = colorsys.hsv_to_rgb(*hsv[:3])
+        return r * 255.0, g * 255.0, b * 255.0
+    hsv = np.asarray(hsv, dtype=np.float64)
+    h, s, v = hsv[..., 0], hsv[..., 1], hsv[..., 2]
+    sector = np.floor(h * 6.0)
+    f = h * 6.0 - sector
+    sector = sector.astype(np.int64) % 6
+    p, q, t = v * (1.0 - s), v * (1.0 - s * f), v * (1.0 - s * (1.0 - f))
+    r = np.choose(sector, (v, q, p, p, t, v))
+    g = np.choose(sector, (t, v, v, q, p, p))
+    b = np.choose(sector, (p, p, t, v, v, q))
+    return np.stack((r, g, b), axis=-1) * 255.0
+
+
+def rgb_to_hls(rgb: Color) -> Color:
+    """Converts 0-255 RGB colors to 0-1 HLS colors."""
+    if isinstance(rgb, tuple):
+        return colorsys.rgb_to_hls(rgb[0] / 255.0, rgb[1] / 255.0, rgb[2] / 255.0)
+    rgb = _unit_rgb(rgb)
+    maxc, minc = rgb.max(axis=-1), rgb.min(axis=-1)
+    delta, total = maxc - minc, maxc + minc
+    lightness = total / 2.0
+    divisor = np.where(lightness <= 0.5, total, 2.0 - total)
+    saturation = np.divide(delta, divisor, out=np.zeros_like(delta), where=delta > 0)
+    return np.stack((_hue(rgb, maxc, delta), lightness, saturation), axis=-1)
+
+
+def _hls_channel(m1: np.ndarray, m2: np.ndarray, hue: np.ndarray) -> np.ndarray:
+    hue = hue % 1.0
+    return np.where(hue < 1.0 / 6.0, m1 + (m2 - m1) * hue * 6.0,
+                    np.where(hue < 0.5, m2,
+                             np.where(hue < 2.0 / 3.0, m1 + (m2 - m1) * (2.0 / 3.0 - hue) * 6.0, m1)))
+
+
+def hls_to_rgb(hls: Color) -> Color:
+    """Converts 0-1 HLS colors to 0-255 RGB colors. the result is float, use to_rgb8 for 8 bit channels."""
+    if isinstance(hls, tuple):
+        r, g, b = colorsys.hls_to_rgb(*hls[:3])
+        return r * 255.0, g * 255.0, b * 255.0
+    hls = np.asarray(hls, dtype=np.float64)
+    h, l, s = hls[..., 0], hls[..., 1], hls[..., 2]
+    m2 = np.where(l <= 0.5, l * (1.0 + s), l + s - l * s)
+    m1 = 2.0 * l - m2
+    rgb = (_hls_channel(m1, m2, h + 1.0 / 3.0), _hls_channel(m1, m2, h), _hls_channel(m1, m2, h - 1.0 / 3.0))
+    return np.stack(rgb, axis=-1) * 255.0
+
+
+def to_rgb8(rgb: Color) -> Color:
+    """Rounds 0-255 RGB colors to 8 bit channels."""
+    if isinstance(rgb, tuple):
+        return tuple(min(max(round(channel), 0), 255) for channel in rgb[:3])
+    return np.clip(np.rint(rgb), 0, 255).astype(np.uint8)
+
+
+def hex_to_rgb(hex_colors: Union[str, Sequence[str]]) -> Color:
+    """Converts "#rrggbb" or "rrggbb" colors to 8 bit RGB colors, a str to a tuple and a list to a (n, 3) array.
+
+    Raises:
+        ValueError: if a color is not 6 hex digits.
+    """
+    if isinstance(hex_colors, str):
+        value = hex_colors.lstrip("#")
+        if len(value) != 6:
+            raise ValueError(f"Invalid hex color: {hex_colors}")
+        return int(value[0:2], 16), int(value[2:4], 16), int(value[4:6], 16)
+
+    values = [hex_color.lstrip("#") for hex_color in hex_colors]
+    if any(len(value) != 6 for value in values):
+        raise ValueError("Hex colors must have 6 hex digits")
+    nibbles = _NIBBLE[np.frombuffer("".join(values).encode("ascii", "replace"), dtype=np.uint8)]
+    if (nibbles == 255).any():
+        raise ValueError("Hex colors must have 6 hex digits")
+    nibbles = nibbles.reshape(-1, 3, 2)
+    return nibbles[..., 0] * np.uint8(16) + nibbles[..., 1]
+
+
+def rgb_to_hex(rgb: Color) -> Union[str, list[str]]:
+    """Converts 0-255 RGB colors to "#rrggbb", a tuple to a str and an array to a list of the flattened colors."""
+    if isinstance(rgb, tuple):
+        return "#%02x%02x%02x" % to_rgb8(rgb)
+    rgb = np.asarray(rgb)
+    rgb = rgb.reshape(-1, 3) if rgb.dtype == np.uint8 else to_rgb8(rgb.reshape(-1, 3))
+    text = np.empty((len(rgb), 7), dtype=np.uint8)
+    text[:, 0] = ord("#")
+    text[:, 1:] = _HEX_DIGITS[rgb].reshape(-1, 6)
+    return text.view("S7").ravel().astype("U7").tolist()
+
+
+def lighten(rgb: Color, amount: float = 0.5) -> Color:
+    """Adds amount (0-1) to the lightness of 0-255 RGB colors. returns 8 bit colors, like utils.colors.lighten_color."""
+    return _shift_lightness(rgb, amount)
+
+
+def darken(rgb: Color, amount: float = 0.5) -> Color:
+    """Subtracts amount (0-1) from the lightness of 0-255 RGB colors. returns 8 bit colors."""
+    return _shift_lightness(rgb, -amount)
+
+
+def _shift_lightness(rgb: Color, amount: float) -> Color:
+    if isinstance(rgb, tuple):
+        h, l, s = rgb_to_hls(rgb)
+        return to_rgb8(hls_to_rgb((h, min(max(l + amount, 0.0), 1.0), s)))
+    hls = rgb_to_hls(rgb)
+    hls[..., 1] = np.clip(hls[..., 1] + amount, 0.0, 1.0)
+    return to_rgb8(hls_to_rgb(hls))
@@ -0,0 +1,187 @@
+"""Magnifier of the desktop color picker.
+
+Magnifier captures and shows the screen around the cursor. Listening to the mouse and picking the color
+on a click are left to MagnifierWidget of the color picker, so the magnifier can be used on its own."""
+
+from __future__ import annotations
+
+from typing import Optional
+
+from PyQt5.QtWidgets import QApplication, QWidget, QVBoxLayout
+from PyQt5.QtGui import (QCursor, QPainter, QPixmap, QColor, QPen, QPainterPath, QImage, QRadialGradient,
+                         QBrush, QGuiApplication)
+from PyQt5.QtCore import Qt, QTimer, pyqtSignal, QRectF
+
+from .screen_capture import grab_around, center_color
+
+
+# pixels of the screen around the cursor shown by the magnifier on each side of the center pixel.
+MAGNIFIER_RADIUS = 8
+# width and height of the magnifier in pixels.
+MAGNIFIER_SIZE = 340
+# milliseconds between the captures while nothing changes under a still cursor is doubled up to this.
+IDLE_INTERVAL = 1000
+
+
+class MagnifierView(QWidget):
+    """Shows the captured pixels scaled up with a grid over them.
+    A frame is one scaled drawImage of the capture and one blit of the grid, which is drawn once."""
+
+    def __init__(self, parent: Optional[QWidget] = None):
+        super().__init__(parent)
+        self.setFixedSize(MAGNIFIER_SIZE, MAGNIFIER_SIZE)
+        self.setAttribute(Qt.WA_OpaquePaintEvent)
+        self._image = QImage()
+        self._grid = self._render_grid()
+
+    def set_image(self, image: QImage) -> None:
+        self._image = image
+        self.update()
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        if self._image.isNull():
+            # the widget is opaque, what is under it is not painted.
+            painter.fillRect(self.rect(), Qt.black)
+            painter.end()
+            return
+        # without SmoothPixmapTransform drawImage scales with nearest neighbour, every pixel becomes a square.
+        painter.drawImage(self.rect(), self._image)
+        painter.drawPixmap(0, 0, self._grid)
+        painter.end()
+
+    @staticmethod
+    def _render_grid() -> QPixmap:
+        grid = QPixmap(MAGNIFIER_SIZE, MAGNIFIER_SIZE)
+        grid.fill(Qt.transparent)
+        painter = QPainter(grid)
+        painter.setPen(QPen(QColor('gray'), 1, Qt.SolidLine))
+
+        pixel_size = MAGNIFIER_SIZE // (2 * MAGNIFIER_RADIUS + 1)
+        center = MAGNIFIER_SIZE // 2
+
+        for i in range(center % pixel_size, MAGNIFIER_SIZE, pixel_size):
+            painter.drawLine(i - pixel_size // 2, 0,
+                             i - pixel_size // 2, MAGNIFIER_SIZE)
+            painter.drawLine(0, i - pixel_size // 2,
+                             MAGNIFIER_SIZE, i - pixel_size // 2)
+
+        painter.setPen(QPen(QColor('white'), 1, Qt.SolidLine))
+        painter.drawRect(center - pixel_size // 2 - 2, center -
+                         pixel_size // 2 - 2, pixel_size + 3, pixel_size + 3)
+
+        painter.setPen(QPen(QColor('black'), 2, Qt.SolidLine))
+        painter.drawRect(center - pixel_size // 2, center -
+                         pixel_size // 2, pixel_size, pixel_size)
+        painter.end()
+        return grid
+
+
+class Magnifier(QWidget):
+    """Shows the screen around the cursor while picking a color.
+    The screen is captured once per frame of the display while the cursor moves or the pixels under it change.
+    When nothing changes the captures slow down to one per IDLE_INTERVAL, a mouse move brings them back."""
+
+    cursor_moved = pyqtSignal()
+
+    def __init__(self, parent: Optional[QWidget] = None):
+        super().__init__()
+        self.parent = parent
+        self.color = '#000000'
+        self.track_color = False
+        self._last_position = None
+        self._last_image = QImage()
+        # milliseconds of a frame of the screen under the cursor.
+        self._frame_interval = 16
+        self.initUI()
+
+    def initUI(self):
+        self.layout = QVBoxLayout(self)
+        self.setWindowFlags(Qt.FramelessWindowHint | Qt.WindowStaysOnTopHint)
+        self.setAttribute(Qt.WA_TranslucentBackground)
+
+        self.label = MagnifierView(self)
+        # the magnifier is round, the same mask is used for every frame.
+        self.label.setMask(self.generatePixmapMask(MAGNIFIER_SIZE).mask())
+
+        self.layout.addWidget(self.label)
+
+        screen_geometry = QApplication.desktop().screenGeometry()
+        window_width = self.width()
+        x_pos = screen_geometry.width() - window_width - -200
+        y_pos = 50
+
+        self.move(x_pos, y_pos)
+
+        # the timer only runs while a color is picked.
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.capture)
+        self.cursor_moved.connect(self._wake_up)
+
+    def paintEvent(self, event):
+        # Override QWidget's paint event to draw a circular mask with smooth edges
+        path = QPainterPath()
+        # Adjust the rectangle dimensions
+        path.addEllipse(QRectF(self.rect()).adjusted(7, 7, -7, -7))
+        mask = QPainter(self)
+        mask.setRenderHint(QPainter.Antialiasing)  # Enable anti-aliasing
+        mask.setClipPath(path)
+        mask.fillRect(self.rect(), Qt.black)
+
+    def generatePixmapMask(self, diameter):
+        # Create QPixmap with transparency
+        mask = QPixmap(diameter, diameter)
+        mask.fill(Qt.transparent)
+
+        # Create QPainter to draw on the QPixmap
+        painter = QPainter(mask)
+        painter.setRenderHint(QPainter.Antialiasing)
+
+        # Create radial gradient
+        gradient = QRadialGradient(
+            diameter / 2, diameter / 2, diameter / 2, diameter / 2, diameter / 2)
+        gradient.setColorAt(0, QColor(0, 0, 0, 255))
+        gradient.setColorAt(1, QColor(0, 0, 0, 0))
+
+        # Set gradient as brush
+        painter.setBrush(QBrush(gradient))
+        painter.setPen(Qt.NoPen)
+
+        # Draw ellipse
+        painter.drawEllipse(0, 0, diameter, diameter)
+        painter.end()
+
+        return mask
+
+    def capture(self):
+        if not self.track_color:
+            self.timer.stop()
+            return
+
+        position = QCursor.pos()
+        moved = position != self._last_position
+        if moved:
+            self._last_position = position
+            screen = QGuiApplication.screenAt(position) or QGuiApplication.primaryScreen()
+            self._frame_interval = max(int(1000 / (screen.refreshRate() or 60)), 1)
+
+        # one grab of the region under the cursor gives both the color and the magnified image.
+        image = grab_around(position, MAGNIFIER_RADIUS)
+        if moved or image != self._last_image:
+            self._last_image = image
+            self.color = center_color(image)
+            self.label.set_image(image)
+            self.timer.setInterval(self._frame_interval)
+        else:
+            self.timer.setInterval(min(self.timer.interval() * 2, IDLE_INTERVAL))
+
+    def _on_mouse_move(self, x, y):
+        # called on the thread of the listener for every mouse move, the signal is only sent to wake up the timer.
+        if self.track_color and self.timer.interval() > self._frame_interval:
+            self.cursor_moved.emit()
+
+    def _wake_up(self):
+        self.timer.start(self._frame_interval)
+
+    def set_track_color(self, track_color: bool) -> None:
+        self.track_color = track_color
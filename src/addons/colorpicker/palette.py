@@ -0,0 +1,120 @@
+"""Average, median and dominant colors of the pixels of a screen region.
+
+A large region is downsampled with a stride to at most MAX_SAMPLES pixels, which keeps a full screen
+palette well under a second. extract_palette yields the palettes progressively: first the average, the median
+and k-means of a small COARSE_SAMPLES sample, then the k-means of the full sample, refined from the coarse
+centers, after every few iterations. Everything is vectorized with numpy, run it on a worker thread."""
+
+from __future__ import annotations
+
+import math
+from typing import Iterator
+
+import numpy as np
+
+from .colorspace import to_rgb8
+
+
+# pixels used for the palette of a region. the region is downsampled to this.
+MAX_SAMPLES = 1 << 16
+COARSE_SAMPLES = 1 << 12
+DOMINANT_COLORS = 5
+MAX_ITERATIONS = 20
+# k-means iterations between two progressive palettes.
+ITERATIONS_PER_YIELD = 4
+# k-means stops when no center moves more than this in a channel.
+TOLERANCE = 0.5
+
+
+class Palette:
+    def __init__(self, average: tuple, median: tuple, dominant: list[tuple[tuple, float]], final: bool) -> None:
+        # 8 bit rgb tuples. dominant is sorted by the share of the pixels of the color.
+        self.average = average
+        self.median = median
+        self.dominant = dominant
+        self.final = final
+
+    def __repr__(self) -> str:
+        return f"Palette({self.average}, {self.median}, {self.dominant}, final={self.final})"
+
+
+def downsample(pixels: np.ndarray, max_samples: int = MAX_SAMPLES) -> np.ndarray:
+    """Returns at most max_samples pixels of an (height, width, 3) image as a (n, 3) array.
+    The pixels are taken with the same stride in both directions, so every part of the region is sampled."""
+    height, width = pixels.shape[:2]
+    step = max(math.ceil(math.sqrt(height * width / max_samples)), 1)
+    return pixels[::step, ::step].reshape(-1, pixels.shape[-1])
+
+
+def _to_rgb8(color: np.ndarray) -> tuple:
+    return tuple(to_rgb8(color).tolist())
+
+
+def _initial_centers(samples: np.ndarray, k: int, rng: np.random.Generator) -> np.ndarray:
+    """k-means++: every next center is picked with a probability of its squared distance to the picked ones."""
+    centers = [samples[rng.integers(len(samples))]]
+    distances = ((samples - centers[0]) ** 2).sum(axis=1)
+    for _ in range(1, k):
+        total = distances.sum()
+        if total == 0:
+            break  # less than k distinct colors
+        centers.append(samples[rng.choice(len(samples), p=distances / total)])
+        distances = np.minimum(distances, ((samples - centers[-1]) ** 2).sum(axis=1))
+    return np.array(centers)
+
+
+def _assign(samples: np.ndarray, centers: np.ndarray) -> np.ndarray:
+    # |x - c|^2 = |x|^2 - 2 x.c + |c|^2, |x|^2 is the same for every center.
+    distances = (centers ** 2).sum(axis=1) - 2.0 * samples @ centers.T
+    return distances.argmin(axis=1)
+
+
+def kmeans(samples: np.ndarray, centers: np.ndarray,
+           iterations: int = MAX_ITERATIONS) -> Iterator[tuple[np.ndarray, np.ndarray, bool]]:
+    """Refines centers on samples. Yields the centers, the sample count of each center and
+    whether the centers converged after every iteration."""
+    centers = centers.astype(np.float64)
+    k = len(centers)
+    for _ in range(iterations):
+        labels = _assign(samples, centers)
+        counts = np.bincount(labels, minlength=k)
+        sums = np.stack([np.bincount(labels, weights=samples[:, channel], minlength=k) for channel in range(3)],
+                        axis=1)
+        # a center without samples stays where it is.
+        new_centers = np.where(counts[:, None] > 0, sums / np.maximum(counts, 1)[:, None], centers)
+        converged = bool(np.abs(new_centers - centers).max() <= TOLERANCE)
+        centers = new_centers
+        yield centers, counts, converged
+        if converged:
+            return
+
+
+def _dominant(centers: np.ndarray, counts: np.ndarray) -> list[tuple[tuple, float]]:
+    total = counts.sum()
+    order = np.argsort(counts)[::-1]
+    colors = to_rgb8(centers).tolist()
+    return [(tuple(colors[index]), float(counts[index] / total)) for index in order if counts[index] > 0]
+
+
+def extract_palette(pixels: np.ndarray, k: int = DOMINANT_COLORS, seed: int = 0) -> Iterator[Palette]:
+    """Yields progressively better palettes of an (height, width, 3) RGB image, the last one is final."""
+    samples = downsample(pixels).astype(np.float64)
+    if len(samples) == 0:
+        raise ValueError("The region has no pixels")
+    rng = np.random.default_rng(seed)
+    average = _to_rgb8(samples.mean(axis=0))
+    median = _to_rgb8(np.median(samples, axis=0))
+
+    coarse = downsample(pixels, COARSE_SAMPLES).astype(np.float64)
+    centers = _initial_centers(coarse, k, rng)
+    for centers, counts, _ in kmeans(coarse, centers):
+        pass
+    yield Palette(average, median, _dominant(centers, counts), final=len(samples) == len(coarse))
+    if len(samples) == len(coarse):
+        return
+
+    for iteration, (centers, counts, converged) in enumerate(kmeans(samples, centers), 1):
+        if converged or iteration == MAX_ITERATIONS:
+            yield Palette(average, median, _dominant(centers, counts), final=True)
+        elif iteration % ITERATIONS_PER_YIELD == 0:
+            yield Palette(average, median, _dominant(centers, counts), final=False)
@@ -0,0 +1,77 @@
+"""Region only screen capture of the color picker.
+
+Grabbing the whole desktop to read one pixel costs tens of megabytes per grab on large screens.
+grab_region asks the screens under the region for only those pixels, so the magnifier grabs
+a (2 * radius + 1) square around the cursor once per tick and reads the color of its center from the same image."""
+
+from __future__ import annotations
+
+import numpy as np
+from PIL import ImageGrab
+from PyQt5.QtCore import QPoint, QRect, Qt
+from PyQt5.QtGui import QColor, QGuiApplication, QImage, QPainter, QScreen
+
+
+def _grab_screen(screen: QScreen, rect: QRect) -> QImage:
+    """Returns the pixels of rect, in desktop coordinates, from screen. rect must be on the screen."""
+    geometry = screen.geometry()
+    # the coordinates of grabWindow(0, ...) are relative to the screen.
+    image = screen.grabWindow(0, rect.x() - geometry.x(), rect.y() - geometry.y(), rect.width(), rect.height()).toImage()
+    if not image.isNull() and image.size() != rect.size():
+        # the grab is in device pixels on high dpi screens.
+        image = image.scaled(rect.size(), Qt.IgnoreAspectRatio, Qt.FastTransformation)
+    return image
+
+
+def _grab_screens(region: QRect) -> QImage:
+    """Returns the pixels of region from every screen it's on. The parts that are on no screen are black.
+    Returns a null image if a screen can't be grabbed."""
+    parts = [(screen, part) for screen in QGuiApplication.screens()
+             if not (part := screen.geometry().intersected(region)).isEmpty()]
+    if len(parts) == 1 and parts[0][1] == region:
+        return _grab_screen(*parts[0])
+    grabs = [(part, _grab_screen(screen, part)) for screen, part in parts]
+    if any(grab.isNull() for _, grab in grabs):
+        return QImage()
+    image = QImage(region.size(), QImage.Format_RGB32)
+    image.fill(Qt.black)
+    painter = QPainter(image)
+    for part, grab in grabs:
+        painter.drawImage(part.topLeft() - region.topLeft(), grab)
+    painter.end()
+    return image
+
+
+def grab_region(x: int, y: int, width: int, height: int) -> QImage:
+    """Returns the pixels of the screens in the rectangle, in desktop coordinates, as an RGB32 QImage."""
+    image = _grab_screens(QRect(x, y, width, height))
+    if image.isNull():
+        # platforms where Qt can't grab the screen (wayland). PIL crops the region out of a full screen grab there.
+        grab = ImageGrab.grab(bbox=(x, y, x + width, y + height), all_screens=True).convert("RGB")
+        image = QImage(grab.tobytes(), grab.width, grab.height, 3 * grab.width, QImage.Format_RGB888).copy()
+    if image.width() != width or image.height() != height:
+        # the grab is in device pixels on high dpi screens.
+        image = image.scaled(width, height, Qt.IgnoreAspectRatio, Qt.FastTransformation)
+    return image.convertToFormat(QImage.Format_RGB32)
+
+
+def grab_around(position: QPoint, radius: int) -> QImage:
+    """Returns the (2 * radius + 1) square of the screen centered on position."""
+    size = 2 * radius + 1
+    return grab_region(position.x() - radius, position.y() - radius, size, size)
+
+
+def center_color(image: QImage) -> str:
+    """Returns the color of the center pixel of image in hex format."""
+    return QColor(image.pixel(image.width() // 2, image.height() // 2)).name()
+
+
+def image_pixels(image: QImage) -> np.ndarray:
+    """Returns an (height, width, 3) RGB view of the pixels of an RGB32 image, without copying them.
+    The view is only valid while image is alive and not modified."""
+    bits = image.constBits()
+    bits.setsize(image.sizeInBytes())
+    rows = np.frombuffer(bits, dtype=np.uint8).reshape(image.height(), image.bytesPerLine())
+    # RGB32 pixels are 0xffRRGGBB words, in memory B, G, R, 0xff on little endian machines.
+    pixels = rows[:, :image.width() * 4].reshape(image.height(), image.width(), 4)
+    return pixels[..., 2::-1] if np.little_endian else pixels[..., 1:]
@@ -0,0 +1,77 @@
+"""Cached backgrounds of the saturation/value square and the hue strip.
+
+The square of a hue is rendered once into a QImage and kept for its hue bucket, the hue strip is rendered
+once for its size. GradientView paints such an image, so moving a selector only blits a cached image
+instead of restyling a stylesheet gradient."""
+
+from functools import lru_cache
+
+from PyQt5.QtCore import QRectF, Qt
+from PyQt5.QtGui import QColor, QImage, QLinearGradient, QPainter, QPainterPath
+from PyQt5.QtWidgets import QFrame
+
+
+SV_SIZE = 200
+# hues (0-100) are rounded to this many buckets, a bucket is about one position of the hue selector.
+HUE_BUCKETS = 200
+# 160 KB each, enough for the hues around the one being dragged.
+CACHED_SQUARES = 32
+CORNER_RADIUS = 5
+
+
+def hue_bucket(hue: float) -> int:
+    """The bucket of a hue in the 0-100 range of the picker."""
+    return round(min(max(hue, 0), 100) / 100 * HUE_BUCKETS) % HUE_BUCKETS
+
+
+@lru_cache(maxsize=CACHED_SQUARES)
+def sv_image(bucket: int, size: int = SV_SIZE) -> QImage:
+    """The saturation/value square of a hue bucket: white to the hue from left to right, black at the bottom."""
+    image = QImage(size, size, QImage.Format_RGB32)
+    painter = QPainter(image)
+    saturation = QLinearGradient(0, 0, size, 0)
+    saturation.setColorAt(0, Qt.white)
+    saturation.setColorAt(1, QColor.fromHsvF(bucket / HUE_BUCKETS, 1, 1))
+    painter.fillRect(image.rect(), saturation)
+    value = QLinearGradient(0, 0, 0, size)
+    value.setColorAt(0, QColor(0, 0, 0, 0))
+    value.setColorAt(1, Qt.black)
+    painter.fillRect(image.rect(), value)
+    painter.end()
+    return image
+
+
+@lru_cache(maxsize=4)
+def hue_image(width: int, height: int) -> QImage:
+    """The hue strip, red at the bottom through every hue to red at the top."""
+    image = QImage(width, height, QImage.Format_RGB32)
+    gradient = QLinearGradient(0, height, 0, 0)
+    for stop in range(7):
+        gradient.setColorAt(stop / 6, QColor.fromHsvF(stop % 6 / 6, 1, 1))
+    painter = QPainter(image)
+    painter.fillRect(image.rect(), gradient)
+    painter.end()
+    return image
+
+
+class GradientView(QFrame):
+    """A frame that paints a cached image with rounded corners."""
+
+    def __init__(self, parent=None) -> None:
+        super().__init__(parent)
+        self._image = None
+
+    def set_image(self, image: QImage) -> None:
+        if image is not self._image:
+            self._image = image
+            self.update()
+
+    def paintEvent(self, event) -> None:  # pylint: disable=invalid-name
+        if self._image is None:
+            return
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.Antialiasing)
+        path = QPainterPath()
+        path.addRoundedRect(QRectF(self.rect()), CORNER_RADIUS, CORNER_RADIUS)
+        painter.setClipPath(path)
+        painter.drawImage(self.rect(), self._image)
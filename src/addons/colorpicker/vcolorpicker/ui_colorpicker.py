@@ -1,18 +1,113 @@
 # -*- coding: utf-8 -*-
 
-# Form implementation generated from reading ui file 'ui_light_alpha.ui'
+# The widget tree of the ColorPicker, shared by the light and the dark theme, with and without alpha.
 #
-# Created by: PyQt5 UI code generator 5.15.0
-#
-# WARNING: Any manual changes made to this file will be lost when pyuic5 is
-# run again.  Do not edit this file unless you know what you are doing.
+# It was generated from ui/ui_light_alpha.ui and merged with the other three designs by hand. The widgets
+# are built once, apply_theme only sets the stylesheets of a theme from THEMES and set_alpha_visible
+# shows or hides the alpha field, so neither needs a new tree.
 
 
 import os
 import sys
-from PyQt5 import QtCore, QtGui, QtWidgets
+from PyQt5 import QtCore, QtWidgets
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))))
 from ui.custom_button import RedButton  # pylint: disable=import-error, unused-import
+from .gradients import GradientView, hue_image
+
+
+THEMES = {
+    "light": {
+        "text": "#000",
+        "field": "#bbb",
+        "field_focus": "#444",
+        "button": "#777",
+        "button_text": "#333",
+        "button_hover_text": "#111",
+        "background": "#eee",
+        "title_bar": "white",
+        "title_bar_height": 40,
+        "title": "#444",
+        "hue_selector": "#222",
+        "label": "#666",
+        "button_bar": "#ccc",
+    },
+    "dark": {
+        "text": "rgb(221, 221, 221)",
+        "field": "#303030",
+        "field_focus": "#aaaaaa",
+        "button": "#aaa",
+        "button_text": "#ccc",
+        "button_hover_text": "#222",
+        "background": "#202020",
+        "title_bar": "rgb(48, 48, 48)",
+        "title_bar_height": 32,
+        "title": "#fff",
+        "hue_selector": "#aaa",
+        "label": "#aaaaaa",
+        "button_bar": "#1d1d1d",
+    },
+}
+
+# %-templates, the braces of the stylesheets would clash with str.format.
+PICKER_STYLE = ("QWidget{\n"
+                "    background-color: none;\n"
+                "}\n"
+                "\n"
+                "/*  LINE EDIT */\n"
+                "QLineEdit{\n"
+                "    color: %(text)s;\n"
+                "    background-color: %(field)s;\n"
+                "    border: 2px solid %(field)s;\n"
+                "    border-radius: 5px;\n"
+                "    selection-color: rgb(16, 16, 16);\n"
+                "    selection-background-color: rgb(221, 51, 34);\n"
+                "    font-family: Segoe UI;\n"
+                "    font-size: 11pt;\n"
+                "}\n"
+                "QLineEdit::focus{\n"
+                "    border-color: %(field_focus)s;\n"
+                "}\n"
+                "\n"
+                "/* PUSH BUTTON */\n"
+                "QPushButton{\n"
+                "    border: 2px solid %(button)s;\n"
+                "    border-radius: 5px;\n"
+                "    font-family: Segoe UI;\n"
+                "    font-size: 9pt;\n"
+                "    font-weight: bold;\n"
+                "    color: %(button_text)s;\n"
+                "    width: 100px;\n"
+                "}\n"
+                "QPushButton:hover{\n"
+                "    border: 2px solid %(button)s;\n"
+                "    color: %(button_hover_text)s;\n"
+                "    background-color: %(button)s;\n"
+                "}\n"
+                "QPushButton:pressed{\n"
+                "    border: 2px solid #aaa;\n"
+                "    color: #222;\n"
+                "    background-color: #aaa;\n"
+                "}")
+DROP_SHADOW_FRAME_STYLE = ("QFrame{\n"
+                           "background-color: %(background)s;\n"
+                           "border-radius: 10px;\n"
+                           "}")
+WINDOW_TITLE_STYLE = ("QLabel{\n"
+                      "    color: %(title)s;\n"
+                      "    font-family: Segoe UI;\n"
+                      "    font-size: 9pt;\n"
+                      "}")
+EDITFIELDS_STYLE = ("QLabel{\n"
+                    "    font-family: Segoe UI;\n"
+                    "    font-weight: bold;\n"
+                    "    font-size: 11pt;\n"
+                    "    color: %(label)s;\n"
+                    "    border-radius: 5px;\n"
+                    "}\n")
+BUTTON_BAR_STYLE = ("QFrame{\n"
+                    "background-color: %(button_bar)s;\n"
+                    "padding: 5px\n"
+                    "}\n")
 
 
 class Ui_ColorPicker(object):
@@ -28,54 +123,12 @@ class Ui_ColorPicker(object):
         ColorPicker.setSizePolicy(sizePolicy)
         ColorPicker.setMinimumSize(QtCore.QSize(420, 300))
         ColorPicker.setMaximumSize(QtCore.QSize(420, 300))
-        ColorPicker.setStyleSheet("QWidget{\n"
-                                  "    background-color: none;\n"
-                                  "}\n"
-                                  "\n"
-                                  "/*  LINE EDIT */\n"
-                                  "QLineEdit{\n"
-                                  "    color: #000;\n"
-                                  "    background-color: #bbb;\n"
-                                  "    border: 2px solid #bbb;\n"
-                                  "    border-radius: 5px;\n"
-                                  "    selection-color: rgb(16, 16, 16);\n"
-                                  "    selection-background-color: rgb(221, 51, 34);\n"
-                                  "    font-family: Segoe UI;\n"
-                                  "    font-size: 11pt;\n"
-                                  "}\n"
-                                  "QLineEdit::focus{\n"
-                                  "    border-color: #444;\n"
-                                  "}\n"
-                                  "\n"
-                                  "/* PUSH BUTTON */\n"
-                                  "QPushButton{\n"
-                                  "    border: 2px solid #777;\n"
-                                  "    border-radius: 5px;\n"
-                                  "    font-family: Segoe UI;\n"
-                                  "    font-size: 9pt;\n"
-                                  "    font-weight: bold;\n"
-                                  "    color: #333;\n"
-                                  "    width: 100px;\n"
-                                  "}\n"
-                                  "QPushButton:hover{\n"
-                                  "    border: 2px solid #777;\n"
-                                  "    color: #111;\n"
-                                  "    background-color: #777;\n"
-                                  "}\n"
-                                  "QPushButton:pressed{\n"
-                                  "    border: 2px solid #aaa;\n"
-                                  "    color: #222;\n"
-                                  "    background-color: #aaa;\n"
-                                  "}")
+        self.picker = ColorPicker
         self.verticalLayout = QtWidgets.QVBoxLayout(ColorPicker)
         self.verticalLayout.setContentsMargins(10, 10, 10, 10)
         self.verticalLayout.setSpacing(0)
         self.verticalLayout.setObjectName("verticalLayout")
         self.drop_shadow_frame = QtWidgets.QFrame(ColorPicker)
-        self.drop_shadow_frame.setStyleSheet("QFrame{\n"
-                                             "background-color: #eee;\n"
-                                             "border-radius: 10px;\n"
-                                             "}")
         self.drop_shadow_frame.setFrameShape(QtWidgets.QFrame.StyledPanel)
         self.drop_shadow_frame.setFrameShadow(QtWidgets.QFrame.Raised)
         self.drop_shadow_frame.setObjectName("drop_shadow_frame")
@@ -84,8 +137,6 @@ class Ui_ColorPicker(object):
         self.verticalLayout_3.setSpacing(10)
         self.verticalLayout_3.setObjectName("verticalLayout_3")
         self.title_bar = QtWidgets.QFrame(self.drop_shadow_frame)
-        self.title_bar.setMinimumSize(QtCore.QSize(0, 40))
-        self.title_bar.setStyleSheet("background-color: white;")
         self.title_bar.setFrameShape(QtWidgets.QFrame.StyledPanel)
         self.title_bar.setFrameShadow(QtWidgets.QFrame.Raised)
         self.title_bar.setObjectName("title_bar")
@@ -105,34 +156,10 @@ class Ui_ColorPicker(object):
             self.window_title.sizePolicy().hasHeightForWidth())
         self.window_title.setSizePolicy(sizePolicy)
         self.window_title.setMaximumSize(QtCore.QSize(16777215, 16777215))
-        self.window_title.setStyleSheet("QLabel{\n"
-                                        "    color: #444;\n"
-                                        "    font-family: Segoe UI;\n"
-                                        "    font-size: 9pt;\n"
-                                        "}")
         self.window_title.setAlignment(QtCore.Qt.AlignCenter)
         self.window_title.setObjectName("window_title")
         self.horizontalLayout_2.addWidget(self.window_title)
         self.exit_btn = RedButton(self.title_bar)
-        # self.exit_btn = QtWidgets.QPushButton(self.title_bar)
-        # self.exit_btn.setMinimumSize(QtCore.QSize(16, 16))
-        # self.exit_btn.setMaximumSize(QtCore.QSize(16, 16))
-        # self.exit_btn.setFocusPolicy(QtCore.Qt.NoFocus)
-        # self.exit_btn.setStyleSheet("QPushButton{\n"
-        #                             "    border: none;\n"
-        #                             "    background-color: #888;\n"
-        #                             "    border-radius: 8px\n"
-        #                             "}\n"
-        #                             "QPushButton:hover{\n"
-        #                             "    background-color: #444;\n"
-        #                             "}")
-        # self.exit_btn.setText("")
-        # icon = QtGui.QIcon()
-        # icon.addPixmap(QtGui.QPixmap(":/img/exit.ico"),
-        #                QtGui.QIcon.Normal, QtGui.QIcon.Off)
-        # self.exit_btn.setIcon(icon)
-        # self.exit_btn.setIconSize(QtCore.QSize(12, 12))
-        # self.exit_btn.setObjectName("exit_btn")
         self.horizontalLayout_2.addWidget(self.exit_btn)
         self.verticalLayout_3.addWidget(self.title_bar)
         self.content_bar = QtWidgets.QFrame(self.drop_shadow_frame)
@@ -145,13 +172,10 @@ class Ui_ColorPicker(object):
         self.horizontalLayout.setContentsMargins(10, 0, 10, 0)
         self.horizontalLayout.setSpacing(10)
         self.horizontalLayout.setObjectName("horizontalLayout")
-        self.color_view = QtWidgets.QFrame(self.content_bar)
+        # the gradients of color_view and hue_bg are cached images, see gradients.py
+        self.color_view = GradientView(self.content_bar)
         self.color_view.setMinimumSize(QtCore.QSize(200, 200))
         self.color_view.setMaximumSize(QtCore.QSize(200, 200))
-        self.color_view.setStyleSheet("/* ALL CHANGES HERE WILL BE OVERWRITTEN */;\n"
-                                      "background-color: qlineargradient(x1:1, x2:0, stop:0 hsl(0%,100%,50%), stop:1 rgba(255, 255, 255, 255));\n"
-                                      "\n"
-                                      "")
         self.color_view.setFrameShape(QtWidgets.QFrame.StyledPanel)
         self.color_view.setFrameShadow(QtWidgets.QFrame.Raised)
         self.color_view.setObjectName("color_view")
@@ -160,10 +184,7 @@ class Ui_ColorPicker(object):
         self.verticalLayout_2.setSpacing(0)
         self.verticalLayout_2.setObjectName("verticalLayout_2")
         self.black_overlay = QtWidgets.QFrame(self.color_view)
-        self.black_overlay.setStyleSheet("background-color: qlineargradient(spread:pad, x1:0, y1:0, x2:0, y2:1, stop:0 rgba(0, 0, 0, 0), stop:1 rgba(0, 0, 0, 255));\n"
-                                         "border-radius: 4px;\n"
-                                         "\n"
-                                         "")
+        self.black_overlay.setStyleSheet("background-color: none;")
         self.black_overlay.setFrameShape(QtWidgets.QFrame.StyledPanel)
         self.black_overlay.setFrameShadow(QtWidgets.QFrame.Raised)
         self.black_overlay.setObjectName("black_overlay")
@@ -191,23 +212,19 @@ class Ui_ColorPicker(object):
         self.horizontalLayout.addWidget(self.color_view)
         self.frame_2 = QtWidgets.QFrame(self.content_bar)
         self.frame_2.setMinimumSize(QtCore.QSize(40, 0))
-        self.frame_2.setStyleSheet("")
         self.frame_2.setFrameShape(QtWidgets.QFrame.StyledPanel)
         self.frame_2.setFrameShadow(QtWidgets.QFrame.Raised)
         self.frame_2.setObjectName("frame_2")
-        self.hue_bg = QtWidgets.QFrame(self.frame_2)
+        self.hue_bg = GradientView(self.frame_2)
         self.hue_bg.setGeometry(QtCore.QRect(10, 0, 20, 200))
         self.hue_bg.setMinimumSize(QtCore.QSize(20, 200))
-        self.hue_bg.setStyleSheet("background-color: qlineargradient(spread:pad, x1:0, y1:1, x2:0, y2:0, stop:0 rgba(255, 0, 0, 255), stop:0.166 rgba(255, 255, 0, 255), stop:0.333 rgba(0, 255, 0, 255), stop:0.5 rgba(0, 255, 255, 255), stop:0.666 rgba(0, 0, 255, 255), stop:0.833 rgba(255, 0, 255, 255), stop:1 rgba(255, 0, 0, 255));\n"
-                                  "border-radius: 5px;")
+        self.hue_bg.set_image(hue_image(20, 200))
         self.hue_bg.setFrameShape(QtWidgets.QFrame.StyledPanel)
         self.hue_bg.setFrameShadow(QtWidgets.QFrame.Raised)
         self.hue_bg.setObjectName("hue_bg")
         self.hue_selector = QtWidgets.QLabel(self.frame_2)
         self.hue_selector.setGeometry(QtCore.QRect(7, 185, 26, 15))
         self.hue_selector.setMinimumSize(QtCore.QSize(26, 0))
-        self.hue_selector.setStyleSheet("background-color: #222;\n"
-                                        "border-radius: 5px;")
         self.hue_selector.setText("")
         self.hue_selector.setObjectName("hue_selector")
         self.hue = QtWidgets.QFrame(self.frame_2)
@@ -221,14 +238,6 @@ class Ui_ColorPicker(object):
         self.editfields = QtWidgets.QFrame(self.content_bar)
         self.editfields.setMinimumSize(QtCore.QSize(110, 200))
         self.editfields.setMaximumSize(QtCore.QSize(120, 200))
-        self.editfields.setStyleSheet("QLabel{\n"
-                                      "    font-family: Segoe UI;\n"
-                                      "    font-weight: bold;\n"
-                                      "    font-size: 11pt;\n"
-                                      "    color: #666;\n"
-                                      "    border-radius: 5px;\n"
-                                      "}\n"
-                                      "")
         self.editfields.setFrameShape(QtWidgets.QFrame.StyledPanel)
         self.editfields.setFrameShadow(QtWidgets.QFrame.Raised)
         self.editfields.setObjectName("editfields")
@@ -237,18 +246,13 @@ class Ui_ColorPicker(object):
         self.formLayout.setSpacing(5)
         self.formLayout.setObjectName("formLayout")
         self.color_vis = QtWidgets.QLabel(self.editfields)
-        self.color_vis.setMinimumSize(QtCore.QSize(0, 24))
-        self.color_vis.setStyleSheet("/* ALL CHANGES HERE WILL BE OVERWRITTEN */;\n"
-                                     "background-color: rgb(255, 255, 255);\n"
-                                     "")
+        self.color_vis.setStyleSheet("background-color: rgb(255, 255, 255);")
         self.color_vis.setText("")
         self.color_vis.setObjectName("color_vis")
         self.formLayout.setWidget(
             0, QtWidgets.QFormLayout.FieldRole, self.color_vis)
         self.lastcolor_vis = QtWidgets.QLabel(self.editfields)
-        self.lastcolor_vis.setMinimumSize(QtCore.QSize(0, 24))
-        self.lastcolor_vis.setStyleSheet("/* ALL CHANGES HERE WILL BE OVERWRITTEN */;\n"
-                                         "background-color: rgb(0, 0, 0);")
+        self.lastcolor_vis.setStyleSheet("background-color: rgb(0, 0, 0);")
         self.lastcolor_vis.setText("")
         self.lastcolor_vis.setObjectName("lastcolor_vis")
         self.formLayout.setWidget(
@@ -280,15 +284,6 @@ class Ui_ColorPicker(object):
         self.blue.setObjectName("blue")
         self.formLayout.setWidget(
             4, QtWidgets.QFormLayout.FieldRole, self.blue)
-        self.hex = QtWidgets.QLineEdit(self.editfields)
-        self.hex.setAlignment(QtCore.Qt.AlignCenter)
-        self.hex.setObjectName("hex")
-        self.formLayout.setWidget(6, QtWidgets.QFormLayout.FieldRole, self.hex)
-        self.lbl_hex = QtWidgets.QLabel(self.editfields)
-        self.lbl_hex.setStyleSheet("font-size: 14pt;")
-        self.lbl_hex.setObjectName("lbl_hex")
-        self.formLayout.setWidget(
-            6, QtWidgets.QFormLayout.LabelRole, self.lbl_hex)
         self.alpha = QtWidgets.QLineEdit(self.editfields)
         self.alpha.setAlignment(QtCore.Qt.AlignCenter)
         self.alpha.setObjectName("alpha")
@@ -298,6 +293,15 @@ class Ui_ColorPicker(object):
         self.lbl_alpha.setObjectName("lbl_alpha")
         self.formLayout.setWidget(
             5, QtWidgets.QFormLayout.LabelRole, self.lbl_alpha)
+        self.hex = QtWidgets.QLineEdit(self.editfields)
+        self.hex.setAlignment(QtCore.Qt.AlignCenter)
+        self.hex.setObjectName("hex")
+        self.formLayout.setWidget(6, QtWidgets.QFormLayout.FieldRole, self.hex)
+        self.lbl_hex = QtWidgets.QLabel(self.editfields)
+        self.lbl_hex.setStyleSheet("font-size: 14pt;")
+        self.lbl_hex.setObjectName("lbl_hex")
+        self.formLayout.setWidget(
+            6, QtWidgets.QFormLayout.LabelRole, self.lbl_hex)
         self.horizontalLayout.addWidget(self.editfields)
         self.verticalLayout_3.addWidget(self.content_bar)
         self.button_bar = QtWidgets.QFrame(self.drop_shadow_frame)
@@ -308,11 +312,6 @@ class Ui_ColorPicker(object):
         sizePolicy.setHeightForWidth(
             self.button_bar.sizePolicy().hasHeightForWidth())
         self.button_bar.setSizePolicy(sizePolicy)
-        self.button_bar.setStyleSheet("QFrame{\n"
-                                      "background-color: #ccc;\n"
-                                      "padding: 5px\n"
-                                      "}\n"
-                                      "")
         self.button_bar.setFrameShape(QtWidgets.QFrame.StyledPanel)
         self.button_bar.setFrameShadow(QtWidgets.QFrame.Raised)
         self.button_bar.setObjectName("button_bar")
@@ -320,24 +319,24 @@ class Ui_ColorPicker(object):
         self.horizontalLayout_3.setContentsMargins(100, 0, 100, 0)
         self.horizontalLayout_3.setSpacing(10)
         self.horizontalLayout_3.setObjectName("horizontalLayout_3")
-        # self.buttonBox = QtWidgets.QDialogButtonBox(self.button_bar)
-        # self.buttonBox.setStandardButtons(
-        #     QtWidgets.QDialogButtonBox.Cancel | QtWidgets.QDialogButtonBox.Ok)
-        # self.buttonBox.setCenterButtons(True)
-        # self.buttonBox.setObjectName("buttonBox")
-        # self.horizontalLayout_3.addWidget(self.buttonBox)
         self.verticalLayout_3.addWidget(self.button_bar)
         self.verticalLayout.addWidget(self.drop_shadow_frame)
         self.lbl_red.setBuddy(self.red)
         self.lbl_green.setBuddy(self.green)
         self.lbl_blue.setBuddy(self.blue)
-        self.lbl_hex.setBuddy(self.blue)
-        self.lbl_alpha.setBuddy(self.blue)
+        self.lbl_alpha.setBuddy(self.alpha)
+        self.lbl_hex.setBuddy(self.hex)
 
         self.retranslateUi(ColorPicker)
         QtCore.QMetaObject.connectSlotsByName(ColorPicker)
         ColorPicker.setTabOrder(self.red, self.green)
         ColorPicker.setTabOrder(self.green, self.blue)
+        ColorPicker.setTabOrder(self.blue, self.alpha)
+        ColorPicker.setTabOrder(self.alpha, self.hex)
+
+        self.theme = None
+        self.apply_theme(True)
+        self.set_alpha_visible(True)
 
     def retranslateUi(self, ColorPicker):
         _translate = QtCore.QCoreApplication.translate
@@ -352,5 +351,29 @@ class Ui_ColorPicker(object):
         self.blue.setText(_translate("ColorPicker", "255"))
         self.hex.setText(_translate("ColorPicker", "ffffff"))
         self.lbl_hex.setText(_translate("ColorPicker", "#"))
-        self.alpha.setText(_translate("ColorPicker", "255"))
+        self.alpha.setText(_translate("ColorPicker", "100"))
         self.lbl_alpha.setText(_translate("ColorPicker", "A"))
+
+    def apply_theme(self, light):
+        """Restyles the widgets with the light or the dark theme. Does nothing if the theme is already applied."""
+        theme = THEMES["light" if light else "dark"]
+        if theme is self.theme:
+            return
+        self.theme = theme
+        self.picker.setStyleSheet(PICKER_STYLE % theme)
+        self.drop_shadow_frame.setStyleSheet(DROP_SHADOW_FRAME_STYLE % theme)
+        self.title_bar.setMinimumSize(QtCore.QSize(0, theme["title_bar_height"]))
+        self.title_bar.setStyleSheet(f"background-color: {theme['title_bar']};")
+        self.window_title.setStyleSheet(WINDOW_TITLE_STYLE % theme)
+        self.hue_selector.setStyleSheet(f"background-color: {theme['hue_selector']};\n"
+                                        "border-radius: 5px;")
+        self.editfields.setStyleSheet(EDITFIELDS_STYLE % theme)
+        self.button_bar.setStyleSheet(BUTTON_BAR_STYLE % theme)
+
+    def set_alpha_visible(self, visible):
+        """Shows or hides the alpha row. The color previews are lower with it, so the fields fit."""
+        self.alpha.setVisible(visible)
+        self.lbl_alpha.setVisible(visible)
+        height = 24 if visible else 30
+        self.color_vis.setMinimumSize(QtCore.QSize(0, height))
+        self.lastcolor_vis.setMinimumSize(QtCore.QSize(0, height))
@@ -10,17 +10,13 @@ import colorsys
 from typing import Union
 from typing import Optional
 
-from PyQt5.QtCore import (QPoint, Qt)
+from PyQt5.QtCore import (QPoint, Qt, QTimer)
 from PyQt5.QtGui import QColor
 from PyQt5.QtWidgets import (
     QWidget, QApplication, QDialog, QGraphicsDropShadowEffect)
 
-from .ui_dark import Ui_ColorPicker as Ui_Dark
-from .ui_dark_alpha import Ui_ColorPicker as Ui_Dark_Alpha
-from .ui_light import Ui_ColorPicker as Ui_Light
-from .ui_light_alpha import Ui_ColorPicker as Ui_Light_Alpha
-
-from .img import *
+from .ui_colorpicker import Ui_ColorPicker
+from .gradients import sv_image, hue_bucket
 
 
 class ColorPicker(QDialog):
@@ -41,22 +37,19 @@ class ColorPicker(QDialog):
 
         super(ColorPicker, self).__init__()
 
-        self.usingAlpha = useAlpha
-        self.usingLightTheme = lightTheme
+        # Call UI Builder function, the themes and the alpha field only restyle its widgets
+        self.ui = Ui_ColorPicker()
+        self.ui.setupUi(self)
+        self.setTheme(lightTheme)
+        self.setUseAlpha(useAlpha)
 
-        # Call UI Builder function
-        if useAlpha:
-            if lightTheme:
-                self.ui = Ui_Light_Alpha()
-            else:
-                self.ui = Ui_Dark_Alpha()
-            self.ui.setupUi(self)
-        else:
-            if lightTheme:
-                self.ui = Ui_Light()
-            else:
-                self.ui = Ui_Dark()
-            self.ui.setupUi(self)
+        # Selector drags are applied at most once per frame, the latest position wins
+        self._pendingSV = self._pendingHue = None
+        self._moveTimer = QTimer(self)
+        self._moveTimer.setSingleShot(True)
+        screen = QApplication.primaryScreen()
+        self._moveTimer.setInterval(max(int(1000 / ((screen.refreshRate() if screen else 0) or 60)), 1))
+        self._moveTimer.timeout.connect(self.applySelectorMoves)
 
         # Make Frameless
         self.setWindowFlags(Qt.FramelessWindowHint)
@@ -77,8 +70,7 @@ class ColorPicker(QDialog):
         self.ui.green.textEdited.connect(self.rgbChanged)
         self.ui.blue.textEdited.connect(self.rgbChanged)
         self.ui.hex.textEdited.connect(self.hexChanged)
-        if self.usingAlpha:
-            self.ui.alpha.textEdited.connect(self.alphaChanged)
+        self.ui.alpha.textEdited.connect(self.alphaChanged)
 
         # Connect window dragging functions
         self.ui.title_bar.mouseMoveEvent = self.moveWindow
@@ -103,6 +95,16 @@ class ColorPicker(QDialog):
     def exit_btn_clicked(self):
         pass
 
+    def setTheme(self, lightTheme: bool = True) -> None:
+        """Switch between the light and the dark theme without rebuilding the UI."""
+        self.usingLightTheme = lightTheme
+        self.ui.apply_theme(lightTheme)
+
+    def setUseAlpha(self, useAlpha: bool = True) -> None:
+        """Show or hide the alpha field without rebuilding the UI."""
+        self.usingAlpha = useAlpha
+        self.ui.set_alpha_visible(useAlpha)
+
     def getColor(self, lc: tuple = None):
         """Open the UI and get a color from the user.
 
@@ -145,8 +147,7 @@ class ColorPicker(QDialog):
         self.setRGB((r, g, b))
         self.setHex(hsv2hex(self.color))
         self.ui.color_vis.setStyleSheet(f"background-color: rgb({r},{g},{b})")
-        self.ui.color_view.setStyleSheet(
-            f"border-radius: 5px;background-color: qlineargradient(x1:1, x2:0, stop:0 hsl({h}%,100%,50%), stop:1 #fff);")
+        self.ui.color_view.set_image(sv_image(hue_bucket(h)))
 
     def rgbChanged(self):
         r, g, b = self.i(self.ui.red.text()), self.i(
@@ -202,8 +203,7 @@ class ColorPicker(QDialog):
 
     def setHSV(self, c):
         self.ui.hue_selector.move(7, int((100 - c[0]) * 1.85))
-        self.ui.color_view.setStyleSheet(
-            f"border-radius: 5px;background-color: qlineargradient(x1:1, x2:0, stop:0 hsl({c[0]}%,100%,50%), stop:1 #fff);")
+        self.ui.color_view.set_image(sv_image(hue_bucket(c[0])))
         self.ui.selector.move(int(c[1] * 2 - 6), int((200 - c[2] * 2) - 6))
 
     def setHex(self, c):
@@ -234,8 +234,8 @@ class ColorPicker(QDialog):
                 pos.setX(200)
             if pos.y() > 200:
                 pos.setY(200)
-            self.ui.selector.move(pos - QPoint(6, 6))
-            self.hsvChanged()
+            self._pendingSV = pos - QPoint(6, 6)
+            self.scheduleSelectorMoves()
 
     def moveHueSelector(self, event):
         if event.buttons() == Qt.LeftButton:
@@ -244,8 +244,24 @@ class ColorPicker(QDialog):
                 pos = 0
             if pos > 185:
                 pos = 185
-            self.ui.hue_selector.move(QPoint(7, pos))
-            self.hsvChanged()
+            self._pendingHue = QPoint(7, pos)
+            self.scheduleSelectorMoves()
+
+    def scheduleSelectorMoves(self):
+        # the first move of a drag is applied at once, the moves during the next frame are merged
+        if not self._moveTimer.isActive():
+            self.applySelectorMoves()
+
+    def applySelectorMoves(self):
+        if self._pendingSV is None and self._pendingHue is None:
+            return
+        if self._pendingSV is not None:
+            self.ui.selector.move(self._pendingSV)
+        if self._pendingHue is not None:
+            self.ui.hue_selector.move(self._pendingHue)
+        self._pendingSV = self._pendingHue = None
+        self.hsvChanged()
+        self._moveTimer.start()
 
     # Utility
 
@@ -421,8 +437,8 @@ def getColor(lc: tuple = None) -> tuple:
     if __instance is None:
         __instance = ColorPicker(useAlpha=__useAlpha, lightTheme=__lightTheme)
 
-    if __useAlpha != __instance.usingAlpha or __lightTheme != __instance.usingLightTheme:
-        del __instance
-        __instance = ColorPicker(useAlpha=__useAlpha, lightTheme=__lightTheme)
+    # the picker is reused, switching the theme or the alpha field only restyles it.
+    __instance.setTheme(__lightTheme)
+    __instance.setUseAlpha(__useAlpha)
 
     return __instance.getColor(lc)
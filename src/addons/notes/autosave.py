@@ -0,0 +1,122 @@
+"""Autosave of note tabs.
+
+AutoSave debounces the edits of a text edit and hands a snapshot of its text to a SaveWorker.
+The worker writes the snapshots on its own thread, so typing never waits for the disk.
+If a file gets a newer snapshot before the older one is written, only the newer one is written."""
+
+from __future__ import annotations
+
+import threading
+from time import monotonic
+from typing import Callable
+
+from PyQt5.QtCore import QObject, QTimer, pyqtSignal
+from PyQt5.QtWidgets import QTextEdit
+
+
+# milliseconds to wait after the last edit before saving.
+AUTOSAVE_DELAY = 500
+# milliseconds after which a note is saved even if the user keeps typing.
+AUTOSAVE_MAX_DELAY = 5000
+
+
+class SaveWorker(QObject):
+    failed = pyqtSignal(str, str)
+    """This signal is emitted from the worker thread with the file name and the error when a write fails."""
+
+    def __init__(self, save_function: Callable[[str, str], None]) -> None:
+        super().__init__()
+        self._save_function = save_function
+        self._pending: dict[str, str] = {}
+        self._writing = False
+        self._condition = threading.Condition()
+        self._thread = threading.Thread(target=self._run, name="notes-autosave", daemon=True)
+        self._thread.start()
+
+    def submit(self, file_name: str, text: str) -> None:
+        """Queues text to be written to file_name. replaces the snapshot of file_name that is not written yet."""
+        with self._condition:
+            self._pending[file_name] = text
+            self._condition.notify_all()
+
+    def discard(self, file_name: str) -> None:
+        """Drops the snapshot of file_name that is not written yet. used when a note is deleted."""
+        with self._condition:
+            self._pending.pop(file_name, None)
+
+    def wait(self, timeout: float | None = None) -> bool:
+        """Blocks until every queued snapshot is written. Returns False if timeout is reached first."""
+        with self._condition:
+            return self._condition.wait_for(lambda: not self._pending and not self._writing, timeout)
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                self._condition.wait_for(lambda: self._pending)
+                file_name, text = self._pending.popitem()
+                self._writing = True
+            try:
+                self._save_function(file_name, text)
+            except Exception as e:  # pylint: disable=broad-except
+                # the thread has to live on, flush and load wait for the pending snapshots.
+                self.failed.emit(file_name, str(e) or type(e).__name__)
+            finally:
+                with self._condition:
+                    self._writing = False
+                    self._condition.notify_all()
+
+
+class AutoSave(QObject):
+    saved = pyqtSignal(str)
+    """This signal is emitted with the text that is handed to the worker."""
+
+    def __init__(self, text_edit: QTextEdit, worker: SaveWorker, file_name: str) -> None:
+        super().__init__(text_edit)
+        self.file_name = file_name
+        self._text_edit = text_edit
+        self._worker = worker
+        # revision of the document that is last saved. used to skip saving unchanged notes.
+        self._saved_revision = -1
+        # time of the first edit that is not saved yet.
+        self._first_unsaved_edit = 0.0
+
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(AUTOSAVE_DELAY)
+        self._timer.timeout.connect(self.save)
+
+        text_edit.textChanged.connect(self.schedule)
+
+    @property
+    def pending(self) -> bool:
+        """True if there are edits waiting for the autosave."""
+        return self._timer.isActive()
+
+    def schedule(self) -> None:
+        """Saves the text after the user stops typing for AUTOSAVE_DELAY,
+        or after AUTOSAVE_MAX_DELAY if the user keeps typing."""
+        if not self._timer.isActive():
+            self._first_unsaved_edit = monotonic()
+            self._timer.start()
+        elif (monotonic() - self._first_unsaved_edit) * 1000 < AUTOSAVE_MAX_DELAY:
+            self._timer.start()
+
+    def save(self) -> None:
+        """Hands the text to the worker. Does nothing if the text is not edited since the last save."""
+        self._timer.stop()
+        if (revision := self._text_edit.document().revision()) == self._saved_revision:
+            return
+        self._saved_revision = revision
+        text = self._text_edit.toPlainText()
+        self._worker.submit(self.file_name, text)
+        self.saved.emit(text)
+
+    def flush(self) -> None:
+        """Saves the text now if it has edits waiting for the autosave."""
+        if self.pending:
+            self.save()
+
+    def mark_saved(self) -> None:
+        """Marks the current text as saved. used after the text is loaded from the file."""
+        self._timer.stop()
+        self._saved_revision = self._text_edit.document().revision()
@@ -0,0 +1,380 @@
+"""Large file mode of the notes addon.
+
+A large note is never read into memory as a whole. The file is memory mapped and the edits are kept
+in a piece table on top of it, so the text of the note is the pieces read in order. Every edit is also
+appended to a journal file next to the note (<note>.txt.delta) and replayed when the note is opened again.
+The note file itself is only rewritten when the note is closed (see LargeNote.close), read_head reads
+the start of a note with the edits of its journal.
+
+LargeNoteEdit shows a window of the note (WINDOW_SIZE bytes, cut at line ends) in a QPlainTextEdit and
+moves the window when the user scrolls, so opening and scrolling the note doesn't depend on its size.
+The edits of the window are committed to the note with the delays of the autosave of the other notes."""
+
+from __future__ import annotations
+
+import mmap
+import os
+import struct
+import tempfile
+from bisect import bisect_right
+from time import monotonic
+
+from PyQt5.QtCore import Qt, QTimer, pyqtSignal
+from PyQt5.QtWidgets import QHBoxLayout, QPlainTextEdit, QScrollBar, QWidget
+
+from .autosave import AUTOSAVE_DELAY, AUTOSAVE_MAX_DELAY
+
+
+# notes larger than this (in bytes) are opened in large file mode.
+LARGE_NOTE_SIZE = 8 << 20
+# bytes of the note shown in the editor at once.
+WINDOW_SIZE = 256 << 10
+# bytes per step of the scroll bar. the range of a scroll bar is limited to int32.
+SCROLL_STEP = 1 << 10
+# bytes that are searched for a line end when a window is cut.
+_LINE_SEARCH_SIZE = 64 << 10
+# header of a journal record: start, length of the replaced bytes, length of the new bytes.
+_RECORD = struct.Struct("<QQQ")
+
+JOURNAL_SUFFIX = ".delta"
+
+
+def _common_prefix_length(a: bytes, b: bytes) -> int:
+    # binary search over memoryview comparisons, which doesn't copy the bytes.
+    a, b = memoryview(a), memoryview(b)
+    low, high = 0, min(len(a), len(b))
+    while low < high:
+        middle = (low + high + 1) // 2
+        if a[:middle] == b[:middle]:
+            low = middle
+        else:
+            high = middle - 1
+    return low
+
+
+def read_head(path: str, size: int) -> bytes:
+    """Returns the first size bytes of the note at path, with the edits in its journal if it has one."""
+    if not os.path.exists(path + JOURNAL_SUFFIX):
+        with open(path, "rb") as file:
+            return file.read(size)
+    note = LargeNote(path)
+    try:
+        return note.read(0, size)
+    finally:
+        note.close(compact=False)
+
+
+class PieceTable:
+    """Bytes made of pieces of an original buffer and the inserted data.
+    The original buffer is never copied or modified."""
+
+    def __init__(self, original: bytes | mmap.mmap = b"") -> None:
+        # every piece is (buffer, start, length). inserted data is kept in its own bytes object.
+        self._pieces: list[tuple[bytes | mmap.mmap, int, int]] = [(original, 0, len(original))] if len(original) else []
+        # self._starts[i] is the offset of the piece i in the text.
+        self._starts: list[int] = [0] if self._pieces else []
+        self._length = len(original)
+
+    def __len__(self) -> int:
+        return self._length
+
+    @property
+    def piece_count(self) -> int:
+        return len(self._pieces)
+
+    def _piece_index(self, offset: int) -> int:
+        return max(bisect_right(self._starts, offset) - 1, 0)
+
+    def read(self, start: int, length: int) -> bytes:
+        """Returns length bytes from start. the result is shorter if the text ends before."""
+        start = max(start, 0)
+        end = min(start + length, self._length)
+        if start >= end:
+            return b""
+        chunks = []
+        index = self._piece_index(start)
+        while index < len(self._pieces) and self._starts[index] < end:
+            buffer, piece_start, piece_length = self._pieces[index]
+            offset = self._starts[index]
+            chunks.append(buffer[piece_start + max(start - offset, 0): piece_start + min(end - offset, piece_length)])
+            index += 1
+        return b"".join(chunks)
+
+    def replace(self, start: int, length: int, data: bytes) -> None:
+        """Replaces length bytes from start with data."""
+        end = start + length
+        if not 0 <= start <= end <= self._length:
+            raise ValueError(f"Range {start}:{end} is out of 0:{self._length}")
+
+        first = self._piece_index(start)
+        last = first
+        while last < len(self._pieces) and (last == first or self._starts[last] < end):
+            last += 1
+
+        new_pieces = []
+        if first < last:
+            buffer, piece_start, piece_length = self._pieces[first]
+            if (kept := start - self._starts[first]) > 0:
+                new_pieces.append((buffer, piece_start, kept))
+        if data:
+            new_pieces.append((bytes(data), 0, len(data)))
+        if first < last:
+            buffer, piece_start, piece_length = self._pieces[last - 1]
+            if (cut := end - self._starts[last - 1]) < piece_length:
+                new_pieces.append((buffer, piece_start + cut, piece_length - cut))
+
+        self._pieces[first:last] = new_pieces
+        self._length += len(data) - length
+
+        # update the offsets of the pieces after the edit.
+        del self._starts[first:]
+        offset = 0 if first == 0 else self._starts[first - 1] + self._pieces[first - 1][2]
+        for _, _, piece_length in self._pieces[first:]:
+            self._starts.append(offset)
+            offset += piece_length
+
+    def iter_chunks(self, chunk_size: int = 1 << 20):
+        """Yields the text as chunks of at most chunk_size bytes."""
+        for buffer, piece_start, piece_length in self._pieces:
+            for start in range(piece_start, piece_start + piece_length, chunk_size):
+                yield buffer[start: min(start + chunk_size, piece_start + piece_length)]
+
+
+class LargeNote:
+    """A note file opened in large file mode."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.journal_path = path + JOURNAL_SUFFIX
+        self._file = None
+        self._mmap = None
+        self._journal = None
+        self._open()
+
+    def _open(self) -> None:
+        self._file = open(self.path, "rb")
+        try:
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # empty files can't be mapped
+            self._mmap = None
+        self.table = PieceTable(self._mmap if self._mmap is not None else b"")
+        self._replay_journal()
+        self._journal = open(self.journal_path, "ab")
+
+    def _replay_journal(self) -> None:
+        if not os.path.exists(self.journal_path):
+            return
+        valid_size = 0
+        with open(self.journal_path, "rb") as journal:
+            while len(header := journal.read(_RECORD.size)) == _RECORD.size:
+                start, length, data_length = _RECORD.unpack(header)
+                if len(data := journal.read(data_length)) != data_length:
+                    break
+                try:
+                    self.table.replace(start, length, data)
+                except ValueError:
+                    break
+                valid_size = journal.tell()
+        # a record that is not completely written (the app was killed while writing) is dropped.
+        if valid_size != os.path.getsize(self.journal_path):
+            os.truncate(self.journal_path, valid_size)
+
+    def __len__(self) -> int:
+        return len(self.table)
+
+    @property
+    def modified(self) -> bool:
+        return self._journal is not None and self._journal.tell() > 0
+
+    def read(self, start: int, length: int) -> bytes:
+        return self.table.read(start, length)
+
+    def replace(self, start: int, length: int, data: bytes) -> None:
+        """Replaces length bytes from start with data and appends the edit to the journal."""
+        self.table.replace(start, length, data)
+        self._journal.write(_RECORD.pack(start, length, len(data)))
+        self._journal.write(data)
+        self._journal.flush()
+
+    def line_start(self, offset: int) -> int:
+        """Returns the offset of the start of the line that contains offset."""
+        offset = min(max(offset, 0), len(self))
+        search_start = max(offset - _LINE_SEARCH_SIZE, 0)
+        if (index := self.read(search_start, offset - search_start).rfind(b"\n")) != -1:
+            return search_start + index + 1
+        if search_start == 0:
+            return 0
+        # a very long line. the window is cut inside of the line, at a character boundary.
+        return self._char_start(offset)
+
+    def line_end(self, offset: int) -> int:
+        """Returns the offset after the end of the line that contains offset."""
+        offset = min(max(offset, 0), len(self))
+        if (index := self.read(offset, _LINE_SEARCH_SIZE).find(b"\n")) != -1:
+            return offset + index + 1
+        return min(self._char_start(offset + _LINE_SEARCH_SIZE), len(self))
+
+    def _char_start(self, offset: int) -> int:
+        # utf-8 continuation bytes start with the bits 10.
+        if offset >= len(self):
+            return len(self)
+        head = self.read(max(offset - 3, 0), min(offset, 3) + 1)
+        index = len(head) - 1
+        while index > 0 and head[index] & 0xC0 == 0x80:
+            index -= 1
+        return offset - (len(head) - 1 - index)
+
+    def close(self, compact: bool = True) -> None:
+        """Closes the note. if compact is True and the note has edits, the note file is rewritten
+        with the edits and the journal is removed."""
+        if self._journal is None:
+            return
+        modified = self.modified
+        self._journal.close()
+        self._journal = None
+        if compact and modified:
+            directory = os.path.dirname(self.path)
+            fd, temp_file = tempfile.mkstemp(dir=directory, prefix=".", suffix=".tmp")
+            try:
+                with open(fd, "wb") as file:
+                    for chunk in self.table.iter_chunks():
+                        file.write(chunk)
+            except BaseException:
+                os.remove(temp_file)
+                raise
+            self._close_file()
+            os.replace(temp_file, self.path)
+            os.remove(self.journal_path)
+        else:
+            self._close_file()
+            if not modified and os.path.exists(self.journal_path):
+                os.remove(self.journal_path)
+
+    def _close_file(self) -> None:
+        self.table = PieceTable()
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+        self._file.close()
+
+
+class LargeNoteEdit(QWidget):
+    """Editor of a LargeNote. Only a window of the note is loaded in the text edit."""
+
+    committed = pyqtSignal(int)
+    """This signal is emitted with the offset of the first changed byte when edits are written to the note."""
+
+    def __init__(self, note: LargeNote, parent: QWidget | None = None) -> None:
+        super().__init__(parent)
+        self.note = note
+        self._window_start = 0
+        self._window_length = 0
+        # True while the window is replaced. the scroll events of the text edit are ignored meanwhile.
+        self._moving_window = False
+
+        self.setLayout(layout := QHBoxLayout())
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.setSpacing(0)
+
+        self.text_edit = QPlainTextEdit(self)
+        self.text_edit.verticalScrollBar().valueChanged.connect(self._on_text_scrolled)
+        layout.addWidget(self.text_edit)
+        self.setFocusProxy(self.text_edit)
+
+        # the scroll bar of the whole note. the scroll bar of the text edit scrolls in the window.
+        self.scroll_bar = QScrollBar(Qt.Orientation.Vertical, self)
+        self.scroll_bar.setPageStep(WINDOW_SIZE // SCROLL_STEP)
+        self.scroll_bar.valueChanged.connect(lambda: self._scroll_timer.start())
+        layout.addWidget(self.scroll_bar)
+
+        # moving the window is delayed while the scroll bar is dragged.
+        self._scroll_timer = QTimer(self)
+        self._scroll_timer.setSingleShot(True)
+        self._scroll_timer.setInterval(30)
+        self._scroll_timer.timeout.connect(lambda: self.show_window(self.scroll_bar.value() * SCROLL_STEP))
+
+        # time of the first edit that is not committed yet.
+        self._first_uncommitted_edit = 0.0
+        self._commit_timer = QTimer(self)
+        self._commit_timer.setSingleShot(True)
+        self._commit_timer.setInterval(AUTOSAVE_DELAY)
+        self._commit_timer.timeout.connect(self.commit)
+        self.text_edit.textChanged.connect(self._schedule_commit)
+
+        self._update_scroll_range()
+        self.show_window(0)
+
+    def _update_scroll_range(self) -> None:
+        self.scroll_bar.setMaximum(max(len(self.note) - WINDOW_SIZE, 0) // SCROLL_STEP)
+
+    def show_window(self, offset: int) -> None:
+        """Shows the lines of the note from the line that contains offset."""
+        self.commit()
+        start = self.note.line_start(offset)
+        end = self.note.line_end(start + WINDOW_SIZE) if start + WINDOW_SIZE < len(self.note) else len(self.note)
+        self._set_window(start, end, 0)
+
+    def _set_window(self, start: int, end: int, text_scroll: int) -> None:
+        self._moving_window = True
+        self._window_start, self._window_length = start, end - start
+        self.text_edit.setPlainText(self.note.read(start, end - start).decode("utf-8", errors="replace"))
+        self.text_edit.document().setModified(False)
+        self.text_edit.verticalScrollBar().setValue(text_scroll)
+        self._moving_window = False
+
+        self.scroll_bar.blockSignals(True)
+        self.scroll_bar.setValue(start // SCROLL_STEP)
+        self.scroll_bar.blockSignals(False)
+
+    def _on_text_scrolled(self, value: int) -> None:
+        # the window is moved by half when the text edit is scrolled to its end,
+        # and the text edit is scrolled back so the same lines stay on the screen.
+        if self._moving_window:
+            return
+        scroll_bar = self.text_edit.verticalScrollBar()
+        window_end = self._window_start + self._window_length
+        if value == scroll_bar.maximum() and window_end < len(self.note) and value > 0:
+            self.commit()
+            start = self.note.line_start(self._window_start + self._window_length // 2)
+            removed = self.note.read(self._window_start, start - self._window_start).count(b"\n")
+            self._set_window(start, self.note.line_end(start + WINDOW_SIZE), value - removed)
+        elif value == 0 and self._window_start > 0:
+            self.commit()
+            start = self.note.line_start(self._window_start - WINDOW_SIZE // 2)
+            added = self.note.read(start, self._window_start - start).count(b"\n")
+            self._set_window(start, self.note.line_end(start + WINDOW_SIZE), added)
+
+    def _schedule_commit(self) -> None:
+        """Commits the edits after the user stops typing for AUTOSAVE_DELAY,
+        or after AUTOSAVE_MAX_DELAY if the user keeps typing."""
+        if self._moving_window:
+            return
+        if not self._commit_timer.isActive():
+            self._first_uncommitted_edit = monotonic()
+            self._commit_timer.start()
+        elif (monotonic() - self._first_uncommitted_edit) * 1000 < AUTOSAVE_MAX_DELAY:
+            self._commit_timer.start()
+
+    def commit(self) -> None:
+        """Writes the edits of the shown window to the note."""
+        self._commit_timer.stop()
+        document = self.text_edit.document()
+        if not document.isModified():
+            return
+        data = self.text_edit.toPlainText().encode("utf-8")
+        old_data = self.note.read(self._window_start, self._window_length)
+        # only the changed part of the window is written to the note, so the journal stays small.
+        prefix = _common_prefix_length(old_data, data)
+        suffix = _common_prefix_length(old_data[prefix:][::-1], data[prefix:][::-1])
+        self.note.replace(self._window_start + prefix, len(old_data) - prefix - suffix,
+                          data[prefix:len(data) - suffix])
+        self._window_length = len(data)
+        document.setModified(False)
+        self._update_scroll_range()
+        self.committed.emit(self._window_start + prefix)
+
+    def close_note(self, save: bool = True) -> None:
+        """Closes the note. the edits are written to the note file if save is True."""
+        if save:
+            self.commit()
+        self.note.close(compact=save)
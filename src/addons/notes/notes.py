@@ -1,9 +1,15 @@
+from __future__ import annotations
+
+from time import monotonic
+
 from PyQt5.QtCore import pyqtSignal
 from PyQt5.QtWidgets import (
+    QApplication,
     QTextEdit,
     QVBoxLayout,
     QWidget,
     QInputDialog,
+    QSystemTrayIcon,
 )
 from PyQt5.QtGui import (
     QTextCursor,
@@ -13,25 +19,62 @@ from PyQt5.QtGui import (
 from addon import AddOnBase
 
 from ui import ConfirmationDialog
-from settings import UI_SCALE
+from settings import ui_scale, apply_ui_scale as scaled
 from ui.utils import get_font
 from ui.base_window import TabsWindow
+from search_index import index as search_index, NOTE, CONTENT_LIMIT
 from .notes_save import (
     get_file_data,
     save_file_data,
     write_config,
     get_config,
     delete_file_data,
+    get_file_path,
+    get_file_size,
 )
+from .autosave import AutoSave, SaveWorker
+from .large_note import LargeNote, LargeNoteEdit, LARGE_NOTE_SIZE, read_head
+from .tab_unloader import TabUnloader
+
+
+save_worker = SaveWorker(save_file_data)
 
 
 class NoteTab(QWidget):
+    """A tab of a note. The tab is created empty and the note is loaded from the file when the tab is
+    first selected (see load). unload releases the document of the note until it is selected again."""
+
     def __init__(self, file_name):
         super().__init__()
         self.file_name = file_name
+        self.text_edit: QTextEdit | None = None
+        self.autosave: AutoSave | None = None
+        # the editor of the note if it is opened in large file mode. text_edit and autosave are not used then.
+        self.large_note_edit: LargeNoteEdit | None = None
+        # the last time this tab was selected or left.
+        self.last_used = monotonic()
+        layout = QVBoxLayout()
+        self.setLayout(layout)
+        self._apply_scale()
+        ui_scale.changed.connect(self._apply_scale)
+
+    @property
+    def loaded(self) -> bool:
+        return self.text_edit is not None or self.large_note_edit is not None
+
+    def load(self) -> None:
+        """Creates the text edit and loads the note into it. Does nothing if it is already loaded."""
+        if self.loaded:
+            return
+        # the last edits of the note may still be waiting for the worker.
+        save_worker.wait()
+        if get_file_size(self.file_name) >= LARGE_NOTE_SIZE:
+            self._load_large_note()
+            return
         self.text_edit = QTextEdit()
         self.text_edit.setFont(get_font(size=16))
-        self.text_edit.textChanged.connect(self.save_text_to_file)
+        self.autosave = AutoSave(self.text_edit, save_worker, self.file_name)
+        self.autosave.saved.connect(lambda text: search_index.update_text(self.search_key, text))
         self.text_edit.setAcceptRichText(False)
         self.text_edit.setStyleSheet(
             """QTextEdit{ 
@@ -39,25 +82,86 @@ class NoteTab(QWidget):
                                             border-radius: 10;
                                         } """
         )
-        layout = QVBoxLayout()
-        layout.addWidget(self.text_edit)
+        self.layout().addWidget(self.text_edit)
+        self.setFocusProxy(self.text_edit)
+        self.load_text_from_file()
+
+    def _load_large_note(self) -> None:
+        self.large_note_edit = LargeNoteEdit(LargeNote(get_file_path(self.file_name)))
+        self.large_note_edit.committed.connect(self._on_large_note_committed)
+        self.large_note_edit.setFont(get_font(size=16))
+        self.large_note_edit.text_edit.setStyleSheet(
+            """QPlainTextEdit{ 
+                                            background-color:lightgrey;
+                                            border-radius: 10;
+                                        } """
+        )
+        self.layout().addWidget(self.large_note_edit)
+        self.setFocusProxy(self.large_note_edit)
+
+    def _on_large_note_committed(self, offset: int) -> None:
+        # only the head of the note is indexed.
+        if offset < CONTENT_LIMIT:
+            search_index.update_text(self.search_key, self.contents())
+
+    def unload(self, save: bool = True) -> None:
+        """Releases the text edit and its document. the edits are saved first if save is True."""
+        if self.large_note_edit is not None:
+            self.setFocusProxy(None)
+            self.large_note_edit.close_note(save)
+            self.layout().removeWidget(self.large_note_edit)
+            self.large_note_edit.deleteLater()
+            self.large_note_edit = None
+        if self.text_edit is None:
+            return
+        if save:
+            self.autosave.flush()
+        self.setFocusProxy(None)
+        self.layout().removeWidget(self.text_edit)
+        self.text_edit.deleteLater()  # the autosave is a child of the text edit
+        self.text_edit = self.autosave = None
+
+    def flush(self) -> None:
+        if self.large_note_edit is not None:
+            self.large_note_edit.commit()
+        elif self.text_edit is not None:
+            self.autosave.flush()
+
+    def _apply_scale(self) -> None:
         #  Set the margins
-        layout.setContentsMargins(
-            int(24 * UI_SCALE),
-            int(24 * UI_SCALE),
-            int(22 * UI_SCALE),
-            int(22 * UI_SCALE),
+        self.layout().setContentsMargins(
+            scaled(24),
+            scaled(24),
+            scaled(22),
+            scaled(22),
         )
-        self.setLayout(layout)
-        self.load_text_from_file()
+
+    @property
+    def search_key(self) -> str:
+        return f"{NOTE}:{self.file_name}"
+
+    def contents(self) -> str:
+        """Returns the head of the note for the search index, with the edits that are not in the note file yet.
+        Raises OSError if the note can't be read."""
+        if self.text_edit is not None:
+            return self.text_edit.toPlainText()
+        if self.large_note_edit is not None:
+            head = self.large_note_edit.note.read(0, CONTENT_LIMIT)
+        else:
+            head = read_head(get_file_path(self.file_name), CONTENT_LIMIT)
+        return head.decode("utf-8", errors="replace")
 
     def load_text_from_file(self):
         file_data = get_file_data(self.file_name)
         self.text_edit.setPlainText(file_data)
         self.text_edit.moveCursor(QTextCursor.End)
+        self.autosave.mark_saved()
 
     def save_text_to_file(self):
-        save_file_data(self.file_name, self.text_edit.toPlainText())
+        if self.large_note_edit is not None:
+            self.large_note_edit.commit()
+        elif self.autosave is not None:
+            self.autosave.save()
 
 
 class JottingDownWindow(TabsWindow):
@@ -66,6 +170,11 @@ class JottingDownWindow(TabsWindow):
     def __init__(self):
         super().__init__()
 
+        self._tab_unloader = TabUnloader(self)
+        # the contents of the notes are read for the search index when it's first searched.
+        search_index.add_content_loader(self._index_note_contents)
+        save_worker.failed.connect(self._on_save_failed)
+
         self.window_toggle_signal.connect(self.toggle_window)
 
         self.load_tabs()
@@ -74,17 +183,44 @@ class JottingDownWindow(TabsWindow):
         self.add_button.clicked.connect(self.add_new_tab)
         self.setFixedSize(840, 400)
 
+        QApplication.instance().aboutToQuit.connect(self.flush)
+
     def create_tab(self, file_name):
         note_tab = NoteTab(file_name)
         self.tab = self.addTab(note_tab, file_name)
         self.tab.red_button.clicked.connect(lambda: window.remove_tab(file_name))
+        search_index.add(note_tab.search_key, file_name, NOTE, lambda: self.show_tab(note_tab))
+        return note_tab
+
+    def show_tab(self, note_tab: NoteTab) -> None:
+        if self.isHidden():
+            self.toggle_window()
+        self.setCurrentIndex(self.indexOf(note_tab))
+        note_tab.load()
+        note_tab.setFocus()
 
     def load_tabs(self):
-        for file_name in get_config()["files"]:
+        file_names = get_config()["files"]
+        for file_name in file_names:
             self.create_tab(file_name)
         if self.count() == 0:
             self.create_tab("notes")
 
+    def _index_note_contents(self) -> None:
+        for i in range(self.count()):
+            note_tab = self.widget(i)
+            try:
+                contents = note_tab.contents()
+            except OSError:
+                continue
+            if contents:
+                search_index.update_text(note_tab.search_key, contents)
+
+    def _on_save_failed(self, file_name: str, error: str) -> None:
+        if AddOnBase.system_tray_icon is not None:
+            AddOnBase.system_tray_icon.showMessage(
+                "Notes", f"Couldn't save note '{file_name}': {error}", QSystemTrayIcon.Warning)
+
     def save_tabs(self):
         config = {
             "files": [self.tabText(i) for i in range(self.count())],
@@ -99,6 +235,11 @@ class JottingDownWindow(TabsWindow):
         res = dialog.exec()
         if not res:
             return
+        note_tab = self.widget(tabid)
+        note_tab.unload(save=False)
+        save_worker.discard(file_name)
+        save_worker.wait()
+        search_index.remove(note_tab.search_key)
         self.removeTab(tabid)
         delete_file_data(file_name)
         self.save_tabs()
@@ -130,7 +271,14 @@ class JottingDownWindow(TabsWindow):
         else:
             window.hide()
 
+    def flush(self) -> None:
+        """Writes every note that has unsaved edits and waits for the writes to finish."""
+        for i in range(self.count()):
+            self.widget(i).flush()
+        save_worker.wait()
+
     def closeEvent(self, event):
+        self.flush()
         self.save_tabs()
         self.hide()
 
@@ -2,6 +2,10 @@ from __future__ import annotations
 import os
 import sys
 import json
+import stat
+import tempfile
+
+import FileSystem  # pylint: disable=import-error
 
 
 FILE_PATH = os.path.join(os.path.dirname(__file__))
@@ -9,13 +13,29 @@ DATA_NAME = "data"
 DATA_FOLDER = os.path.join(FILE_PATH, DATA_NAME)
 PLATFORM = sys.platform
 CONFIG_FILE = os.path.join(DATA_FOLDER, "config.json")
+# mkstemp creates files readable only by the owner, new notes get the mode open() would give them.
+_UMASK = os.umask(0)
+os.umask(_UMASK)
 
 
 def save_file_data(file_name: str, file_data: str = "") -> None:
     file_name+=".txt"
     SAVE_FILE = os.path.join(DATA_FOLDER, file_name)
-    with open(SAVE_FILE, "w") as f:
-        f.write(file_data)
+    # the data is written to a temporary file first and then replaced with the save file,
+    # so the note is never left half written.
+    fd, temp_file = tempfile.mkstemp(dir=DATA_FOLDER, prefix=".", suffix=".tmp")
+    try:
+        with open(fd, "w", encoding="utf-8") as f:
+            f.write(file_data)
+        try:
+            mode = stat.S_IMODE(os.stat(SAVE_FILE).st_mode)
+        except FileNotFoundError:
+            mode = 0o666 & ~_UMASK
+        os.chmod(temp_file, mode)
+        os.replace(temp_file, SAVE_FILE)
+    except BaseException:
+        os.remove(temp_file)
+        raise
 
 
 def delete_file_data(file_name: str) -> None:
@@ -23,6 +43,19 @@ def delete_file_data(file_name: str) -> None:
     SAVE_FILE = os.path.join(DATA_FOLDER, file_name)
     if exists(SAVE_FILE):
         os.remove(SAVE_FILE)
+    # journal of the edits of a note opened in large file mode.
+    if exists(SAVE_FILE + ".delta"):
+        os.remove(SAVE_FILE + ".delta")
+
+
+def get_file_path(file_name: str) -> str:
+    return os.path.join(DATA_FOLDER, file_name + ".txt")
+
+
+def get_file_size(file_name: str) -> int:
+    """Returns the size of the note in bytes. Returns 0 if the note doesn't exist."""
+    SAVE_FILE = get_file_path(file_name)
+    return os.path.getsize(SAVE_FILE) if exists(SAVE_FILE) else 0
 
 
 def exists(file_name: str):
@@ -31,12 +64,18 @@ def exists(file_name: str):
     return os.path.exists(SAVE_FILE)
 
 
-def get_file_data(file_name):
+def get_file_data(file_name, size: int = -1):
+    """Returns the text of the note. if size is given, at most size characters are read."""
     file_name+=".txt"
     SAVE_FILE = os.path.join(DATA_FOLDER, file_name)
     if exists(SAVE_FILE):
-        with open(SAVE_FILE, "r") as file:
-            return file.read()
+        try:
+            with open(SAVE_FILE, "r", encoding="utf-8") as file:
+                return file.read(size)
+        except UnicodeDecodeError:
+            # notes saved before they were written as utf-8 are in the encoding of the locale.
+            with open(SAVE_FILE, "r") as file:
+                return file.read(size)
 
 
 if not exists(DATA_FOLDER):
@@ -44,11 +83,7 @@ if not exists(DATA_FOLDER):
 
 
 def open_file(file_path: str | None) -> None:
-    if file_path is not None:
-        if PLATFORM in ("win32",):
-            os.startfile(file_path)
-        elif PLATFORM in ("linux", "darwin"):
-            os.system(f"xdg-open {file_path}")
+    FileSystem.open_file(file_path)
 
 
 def get_config():
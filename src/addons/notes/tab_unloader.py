@@ -0,0 +1,50 @@
+"""Loading and unloading of the tabs of a tab widget.
+
+A tab is loaded when it's selected, and unloaded once it hasn't been selected for UNLOAD_AFTER seconds,
+so only the tabs in use keep their documents in memory. The tabs have a loaded property, load and unload
+methods and a last_used time, which TabUnloader sets when a tab is selected or left."""
+
+from __future__ import annotations
+
+from time import monotonic
+
+from PyQt5.QtCore import QObject, QTimer
+from PyQt5.QtWidgets import QTabWidget
+
+
+# milliseconds between the checks for inactive tabs.
+UNLOAD_CHECK_INTERVAL = 60_000
+# seconds after which a tab that is not selected gets its document unloaded.
+UNLOAD_AFTER = 300
+
+
+class TabUnloader(QObject):
+    def __init__(self, tab_widget: QTabWidget, unload_after: float = UNLOAD_AFTER,
+                 check_interval: int = UNLOAD_CHECK_INTERVAL) -> None:
+        super().__init__(tab_widget)
+        self._tab_widget = tab_widget
+        self._unload_after = unload_after
+        self._current_tab = None
+        tab_widget.currentChanged.connect(self._on_current_changed)
+
+        self._timer = QTimer(self)
+        self._timer.setInterval(check_interval)
+        self._timer.timeout.connect(self.unload_inactive_tabs)
+        self._timer.start()
+
+    def _on_current_changed(self, index: int) -> None:
+        now = monotonic()
+        if self._current_tab is not None:
+            self._current_tab.last_used = now
+        self._current_tab = self._tab_widget.widget(index)
+        if self._current_tab is not None:
+            self._current_tab.last_used = now
+            self._current_tab.load()
+
+    def unload_inactive_tabs(self) -> None:
+        """Unloads the loaded tabs that are not selected and were last used more than unload_after ago."""
+        now = monotonic()
+        for i in range(self._tab_widget.count()):
+            tab = self._tab_widget.widget(i)
+            if tab is not self._current_tab and tab.loaded and now - tab.last_used > self._unload_after:
+                tab.unload()
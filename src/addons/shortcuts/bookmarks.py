@@ -0,0 +1,252 @@
+"""Imports browser bookmarks as groups and tasks, and exports the tasks as bookmarks.
+
+Netscape bookmark files (what every browser exports as HTML) are parsed in chunks as they are read,
+Chromium "Bookmarks" files and Firefox JSON backups are walked once after loading them. A folder becomes
+a group named after its path, and a bookmark a task with its url. The urls are taken as they are, they are
+not checked over the network like urls typed in the task dialog. Reading a file doesn't touch the save file,
+so it can run on a thread, and the result is saved with a single write by save_import."""
+
+from __future__ import annotations
+
+import html
+import json
+import os
+import time
+from html.parser import HTMLParser
+from typing import IO, Iterable, Iterator
+
+from . import shortcuts_save as Data
+from .task_launcher import is_url
+
+
+CHUNK_SIZE = 1 << 16
+DEFAULT_GROUP = "Imported Bookmarks"
+BUTTON_TEXT = "Open"
+FOLDER_SEPARATOR = " / "
+
+# names of the root folders of Firefox, by guid.
+FIREFOX_ROOTS = {
+    "menu________": "Bookmarks Menu",
+    "toolbar_____": "Bookmarks Toolbar",
+    "unfiled_____": "Other Bookmarks",
+    "mobile______": "Mobile Bookmarks",
+}
+FIREFOX_FOLDER = "text/x-moz-place-container"
+FIREFOX_BOOKMARK = "text/x-moz-place"
+
+# (folder path, title, url)
+Bookmark = tuple[tuple[str, ...], str, str]
+
+
+class _NetscapeParser(HTMLParser):
+    """Collects the bookmarks of a Netscape bookmark file. A folder is an H3 followed by a DL of its items."""
+
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=True)
+        self.bookmarks: list[Bookmark] = []
+        self._folders: list[str | None] = []
+        self._folder: str | None = None  # an H3 whose DL hasn't started yet
+        self._text: list[str] | None = None
+        self._href: str | None = None
+
+    def _path(self) -> tuple[str, ...]:
+        return tuple(folder for folder in self._folders if folder)
+
+    def handle_starttag(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
+        if tag == "dl":
+            self._folders.append(self._folder)
+            self._folder = None
+        elif tag == "h3":
+            self._text = []
+        elif tag == "a":
+            self._href = dict(attrs).get("href")
+            self._text = []
+
+    def handle_endtag(self, tag: str) -> None:
+        if tag == "dl":
+            if self._folders:
+                self._folders.pop()
+        elif tag == "h3" and self._text is not None:
+            self._folder = "".join(self._text).strip()
+            self._text = None
+        elif tag == "a" and self._text is not None:
+            if self._href:
+                self.bookmarks.append((self._path(), "".join(self._text).strip(), self._href))
+            self._text = self._href = None
+
+    def handle_data(self, data: str) -> None:
+        if self._text is not None:
+            self._text.append(data)
+
+
+def netscape_bookmarks(file: IO[str], head: str = "") -> Iterator[Bookmark]:
+    """The bookmarks of a Netscape bookmark file, read and parsed CHUNK_SIZE characters at a time.
+    head is the start of the file if it was already read."""
+    parser = _NetscapeParser()
+    chunk = head or file.read(CHUNK_SIZE)
+    while chunk:
+        parser.feed(chunk)
+        yield from parser.bookmarks
+        parser.bookmarks.clear()
+        chunk = file.read(CHUNK_SIZE)
+    parser.close()
+    yield from parser.bookmarks
+
+
+def _text(value) -> str:
+    """A name or url of a JSON bookmark file, "" if it's missing or not a string."""
+    return value if isinstance(value, str) else ""
+
+
+def _children(node: dict) -> list:
+    children = node.get("children")
+    return children if isinstance(children, list) else []
+
+
+def chromium_bookmarks(data: dict) -> Iterator[Bookmark]:
+    """The bookmarks of a Chromium "Bookmarks" file, the roots are the top folders."""
+    stack = [((), root) for root in reversed(list(data["roots"].values()))]
+    while stack:
+        path, node = stack.pop()
+        if not isinstance(node, dict):
+            continue  # a broken file, the nodes that can be read are imported
+        if node.get("type") == "url":
+            yield path, _text(node.get("name")), _text(node.get("url"))
+        elif "children" in node:
+            path = (*path, _text(node.get("name")))
+            stack.extend((path, child) for child in reversed(_children(node)))
+
+
+def firefox_bookmarks(data: dict) -> Iterator[Bookmark]:
+    """The bookmarks of a Firefox JSON backup. The root holds the menu, toolbar, other and mobile folders."""
+    stack = [((), child, True) for child in reversed(_children(data))]
+    while stack:
+        path, node, is_root = stack.pop()
+        if not isinstance(node, dict):
+            continue
+        if node.get("type") == FIREFOX_BOOKMARK:
+            yield path, _text(node.get("title")), _text(node.get("uri"))
+        elif node.get("type") == FIREFOX_FOLDER:
+            name = _text(node.get("title"))
+            if is_root:
+                name = FIREFOX_ROOTS.get(_text(node.get("guid")), name)
+            path = (*path, name)
+            stack.extend((path, child, False) for child in reversed(_children(node)))
+
+
+def read_bookmarks(file: IO[str]) -> Iterator[Bookmark]:
+    """The bookmarks of an HTML or JSON bookmark file, the format is told by the contents.
+    Raises ValueError if the file is JSON of another format."""
+    head = file.read(CHUNK_SIZE)
+    if not head.lstrip().startswith("{"):
+        return netscape_bookmarks(file, head)
+    data = json.loads(head + file.read())
+    if isinstance(data.get("roots"), dict):
+        return chromium_bookmarks(data)
+    if data.get("type") == FIREFOX_FOLDER:
+        return firefox_bookmarks(data)
+    raise ValueError("not a Chromium or Firefox bookmark file")
+
+
+class ImportResult:
+    def __init__(self, groups: list[tuple[Data.GroupClass, list[Data.TaskClass]]],
+                 skipped: int, seconds: float) -> None:
+        self.groups = groups
+        self.skipped = skipped
+        self.seconds = seconds
+
+    @property
+    def task_count(self) -> int:
+        return sum(len(tasks) for _, tasks in self.groups)
+
+    @property
+    def rate(self) -> float:
+        """Imported bookmarks per second."""
+        return self.task_count / self.seconds if self.seconds else float("inf")
+
+    def __str__(self) -> str:
+        text = (f"Imported {self.task_count} bookmarks into {len(self.groups)} groups "
+                f"in {self.seconds:.2f} s ({self.rate:,.0f} per second).")
+        if self.skipped:
+            text += f"\n{self.skipped} bookmarks without a url that can be opened were skipped."
+        return text
+
+
+def _new_ids(prefix: str, used: set[str]) -> Iterator[str]:
+    number = time.time_ns()
+    while True:
+        if (new_id := f"{prefix}{number}") not in used:
+            used.add(new_id)
+            yield new_id
+        number += 1
+
+
+def collect_bookmarks(bookmarks: Iterable[Bookmark], used: set[str]) -> ImportResult:
+    """Makes a group for every folder with bookmarks and a task for every bookmark that is a url.
+    used are the ids in use, the new ids are added to it. Nothing is saved, see save_import."""
+    start = time.perf_counter()
+    group_ids = _new_ids("G_", used)
+    task_ids = _new_ids("T_", used)
+    groups: dict[tuple[str, ...], tuple[Data.GroupClass, list[Data.TaskClass]]] = {}
+    skipped = 0
+    for path, title, url in bookmarks:
+        url = url.strip()
+        if not is_url(url):
+            skipped += 1  # javascript: bookmarklets, Firefox place: queries
+            continue
+        if (group := groups.get(path)) is None:
+            name = FOLDER_SEPARATOR.join(path) or DEFAULT_GROUP
+            group = groups[path] = (Data.GroupClass.from_data(next(group_ids), {"group_name": name, "group_tasks": []}), [])
+        group_class, tasks = group
+        task = Data.TaskClass.from_data(group_class.group_id, next(task_ids), {
+            "task_name": title or url, "button_text": BUTTON_TEXT, "url": [url],
+            "file_path": None, "directory_path": None})
+        group_class.group_tasks.append(task.task_id)
+        tasks.append(task)
+    return ImportResult(list(groups.values()), skipped, time.perf_counter() - start)
+
+
+def read_bookmark_file(file_path: str, used: set[str]) -> ImportResult:
+    """Reads the bookmarks of an HTML or JSON bookmark file, see collect_bookmarks. Nothing is saved.
+    Raises OSError if the file can't be read and ValueError if it's not a bookmark file."""
+    start = time.perf_counter()
+    with open(file_path, "r", encoding="utf-8", errors="replace") as file:
+        result = collect_bookmarks(read_bookmarks(file), used)
+    result.seconds = time.perf_counter() - start  # with the loading of JSON files
+    return result
+
+
+def save_import(result: ImportResult) -> None:
+    """Saves the groups and tasks of an import after the groups in the save file, with a single write."""
+    start = time.perf_counter()
+    if result.groups:
+        Data.save_groups([group for group, _ in result.groups], [task for _, tasks in result.groups for task in tasks])
+    result.seconds += time.perf_counter() - start
+
+
+def import_bookmarks(file_path: str) -> ImportResult:
+    """Reads and saves the bookmarks of an HTML or JSON bookmark file.
+    Raises OSError if the file can't be read and ValueError if it's not a bookmark file."""
+    result = read_bookmark_file(file_path, Data.used_ids())
+    save_import(result)
+    return result
+
+
+def export_bookmarks(file_path: str, groups: Iterable[tuple[Data.GroupClass, Iterable[Data.TaskClass]]]) -> int:
+    """Writes the urls of the tasks as a Netscape bookmark file, a folder per group.
+    Returns the number of bookmarks written."""
+    count = 0
+    with open(temporary_path := f"{file_path}.tmp", "w", encoding="utf-8") as file:
+        file.write("<!DOCTYPE NETSCAPE-Bookmark-file-1>\n"
+                   '<META HTTP-EQUIV="Content-Type" CONTENT="text/html; charset=UTF-8">\n'
+                   "<TITLE>Bookmarks</TITLE>\n<H1>Bookmarks</H1>\n<DL><p>\n")
+        for group, tasks in groups:
+            file.write(f"    <DT><H3>{html.escape(group.group_name)}</H3>\n    <DL><p>\n")
+            for task in tasks:
+                for url in task.url:
+                    file.write(f'        <DT><A HREF="{html.escape(url)}">{html.escape(task.task_name)}</A>\n')
+                    count += 1
+            file.write("    </DL><p>\n")
+        file.write("</DL><p>\n")
+    os.replace(temporary_path, file_path)
+    return count
@@ -1,8 +1,8 @@
 from __future__ import annotations
-from typing import NewType
+from typing import Iterable, NewType
 
-from PyQt5.QtCore import pyqtSignal, QEvent, QTimer
-from PyQt5.QtGui import QMouseEvent
+from PyQt5.QtCore import pyqtSignal, QEvent, QTimer, QPoint, QPropertyAnimation, QEasingCurve, Qt
+from PyQt5.QtGui import QMouseEvent, QPaintEvent, QPainter, QColor
 from PyQt5.QtWidgets import (
     QHBoxLayout,
     QLabel,
@@ -14,6 +14,9 @@ from PyQt5.QtWidgets import (
 from utils import Signal
 
 from . import shortcuts_save as Data
+from .reorder import DropTargets
+from .task_launcher import task_launcher, launch_settings
+from .usage import usage_log
 
 from ui import (
     RedButton,
@@ -27,8 +30,9 @@ from ui import (
 
 from .dialog import TaskDialog, GroupDialog, ACCEPTED, REJECTED
 
-from settings import apply_ui_scale as scaled
+from settings import ui_scale, apply_ui_scale as scaled
 from ui.utils import get_font
+from search_index import index as search_index, TASK
 
 
 NodeChangeEventType = NewType("NodeChangeEventType", int)
@@ -60,23 +64,40 @@ class SubNodeManager:
         self._nodes_container: QVBoxLayout = layout
         self._parent = parent
         
-        self.departed_signal = Signal(GroupNode | TaskNode)
-        
-        self._current_changes = None
+        self.departed_signal = Signal(GroupNode | TaskNode, QPoint)
+        """Emitted with the node and the global mouse position on every move while a node is dragged outside."""
+        self.returned_signal = Signal(GroupNode | TaskNode)
+        """Emitted when a node that was dragged outside is back inside."""
+        self.dropped_outside_signal = Signal(GroupNode | TaskNode)
+        """Emitted when a node is released outside."""
+        
+        # drop targets of the node being dragged, read from the geometry of the nodes when the drag starts.
+        # a node of another manager has the targets of a preview.
+        self._drop_targets: DropTargets | None = None
+        self._drop_index: int | None = None
+        self._departed = False
+        self._placeholder = DropPlaceholder(parent)
+        # the parent is resized once after any number of nodes were added or removed.
+        self._adjust_timer = QTimer(parent)
+        self._adjust_timer.setSingleShot(True)
+        self._adjust_timer.setInterval(0)
+        self._adjust_timer.timeout.connect(parent.adjustSize)
         
         
     def add_node(self, node: GroupNode | TaskNode) -> None:
         self._nodes_container.addWidget(node)
         node.changed.connect(self._on_node_change)
+        self._drop_targets = None
         self._update_nodes_contents_margins()
-        QTimer.singleShot(0, self._parent.adjustSize)
+        self._adjust_timer.start()
         
     def remove_node(self, node: GroupNode | TaskNode) -> None:
         self._nodes_container.removeWidget(node)
         node.hide()
         node.deleteLater()
+        self._drop_targets = None
         self._update_nodes_contents_margins()
-        QTimer.singleShot(0, self._parent.adjustSize)
+        self._adjust_timer.start()
         
     def _on_node_change(self, event: NodeChangeEvent) -> None:
         if event.event == NODE_DELETED:
@@ -84,67 +105,115 @@ class SubNodeManager:
         elif event.event == NODE_MOVING:
             self._on_node_moving(event)
         elif event.event == NODE_MOVED:
-            self._on_node_moved()
+            self._on_node_moved(event.node)
+
+    def slot_spans(self) -> list[tuple[int, int]]:
+        """(top, bottom) of the slots of the layout. A dragged node has left its slot, the slot is still there."""
+        spans = []
+        for i in range(self._nodes_container.count()):
+            geometry = self._nodes_container.itemAt(i).geometry()
+            spans.append((geometry.top(), geometry.bottom() + 1))
+        return spans
+
+    def _start_drag(self, node: GroupNode | TaskNode) -> None:
+        self._drop_targets = DropTargets(self.slot_spans(), self._nodes_container.indexOf(node))
+        self._drop_index = self._drop_targets.source
         
     def _on_node_moving(self, event: NodeChangeEvent) -> None:
-        # check if the mouse hovering over any other GroupNode.
-        # if so, check if the mouse is hovering top half or bottom half of the GroupNode.
+        # the drop index is looked up in the geometry read when the drag started, the nodes aren't walked.
+        if self._drop_targets is None:
+            self._start_drag(event.node)
         mouse_position = event.node.mapTo(self._parent, event.mouse_event.pos())  # mapped to parent widget.
         mouse_position.setX(1)  # x canceled
 
-        for i in range(self._nodes_container.count()):
-            node = self._nodes_container.itemAt(i).widget()
-            if node is event.node:
-                continue
-
-            node_rect = node.geometry().adjusted(-node.geometry().x(), 0, 2, 0)  # x is set to 0 (canceled).
-            top_half_rect = node_rect.adjusted(0, 0, 0, -(node.height() // 2))
-            bottom_half_rect = node_rect.adjusted(0, (node.height() // 2), 0, 0)
-
-            if top_half_rect.contains(mouse_position):
-                self._current_changes: list = [event.node, i]
-                break
-            elif bottom_half_rect.contains(mouse_position):
-                self._current_changes: list = [event.node, i +1]
-                break
-            
         if not self._nodes_container.geometry().contains(mouse_position):
-            self.departed_signal.emit(event.node)
+            if not self._departed:
+                self._departed = True
+                self._drop_index = None
+                self._placeholder.clear()
+            self.departed_signal.emit(event.node, event.mouse_event.globalPos())
+            return
+        if self._departed:
+            self._departed = False
+            self.returned_signal.emit(event.node)
+
+        self._preview(mouse_position.y())
+
+    def _preview(self, y: int) -> int:
+        index = self._drop_targets.index_at(y)
+        if index != self._drop_index:
+            self._drop_index = index
+            self._show_placeholder(index)
+        return index
+
+    def _on_node_moved(self, node: GroupNode | TaskNode) -> None:
+        if self._departed:
+            self.dropped_outside_signal.emit(node)
+        elif self._drop_targets is not None and self._drop_targets.is_move(self._drop_index):
+            self.change_node_index(node, self._drop_index)
+        self.clear_preview()
+        self._departed = False
+        self._nodes_container.invalidate()  # puts the dragged node back in its slot.
+
+    def preview_drop(self, y: int) -> int:
+        """Shows where a node dragged in from another manager would be dropped at y of the parent.
+        Returns the index it would be dropped at."""
+        if self._drop_targets is None:
+            self._drop_targets = DropTargets(self.slot_spans(), -1)
+        return self._preview(y)
+
+    def clear_preview(self) -> None:
+        self._drop_targets = self._drop_index = None
+        self._placeholder.clear()
+
+    def _show_placeholder(self, index: int) -> None:
+        """Slides a line to the gap the node would be dropped in. Only the line moves, the nodes keep their place."""
+        geometry = self._nodes_container.geometry()
+        y = self._drop_targets.boundary(index) if len(self._drop_targets) else geometry.y()
+        self._placeholder.slide_to(QPoint(geometry.x(), y), geometry.width())
 
-    def _on_node_moved(self):
-        if self._current_changes is not None:
-            self.change_node_index(self._current_changes[0], self._current_changes[1])
-            self._current_changes = None
-        self._nodes_container.update()
-        
     def _update_nodes_contents_margins(self):
         # currently GroupNode contents margins are only updated.
+        if isinstance(self._parent, GroupNode):
+            return  # its nodes are TaskNodes
         for i in range(self._nodes_container.count()):
             node: GroupNode | TaskNode = self._nodes_container.itemAt(i).widget()
             if isinstance(node, GroupNode):
                 node.update_content_margins()
 
+    def arrange(self, nodes: list[GroupNode | TaskNode]) -> None:
+        """Lays out nodes in the given order. Only the view changes, nothing is saved."""
+        for index, node in enumerate(nodes):
+            if (current := self._nodes_container.indexOf(node)) != index:
+                self._nodes_container.insertItem(index, self._nodes_container.takeAt(current))
+        self._drop_targets = None
+        self._update_nodes_contents_margins()
+
+    def take_node(self, node: GroupNode | TaskNode) -> None:
+        """Removes node from this manager without deleting it, so it can be inserted into another one."""
+        self._nodes_container.removeWidget(node)
+        node.changed.disconnect(self._on_node_change)
+        self._update_nodes_contents_margins()
+        self._adjust_timer.start()
+
+    def insert_node(self, node: GroupNode | TaskNode, index: int) -> None:
+        """Inserts a node taken from another manager at index. The widget is moved, not rebuilt."""
+        node.setParent(self._parent)
+        node._parent = self._parent
+        self._nodes_container.insertWidget(index, node)
+        node.changed.connect(self._on_node_change)
+        node.show()
+        self._update_nodes_contents_margins()
+        self._adjust_timer.start()
+
     def change_node_index(self, node: GroupNode | TaskNode, index: int) -> None:
-        for i in range(self._nodes_container.count()):
-            _node: GroupNode | TaskNode = self._nodes_container.itemAt(i).widget()
-            if node is _node:
-                index -= (1 if i < index else 0)  # for avoid index shifting when removing the widget.
-                self._nodes_container.insertItem(index, self._nodes_container.takeAt(i))
-                break
+        """Moves node to index, counted without the node, and saves only that move."""
+        self._nodes_container.insertItem(index, self._nodes_container.takeAt(self._nodes_container.indexOf(node)))
 
         if isinstance(node, GroupNode):
-            group_ids = [
-                self._nodes_container.itemAt(i).widget().group_class.group_id
-                for i in range(self._nodes_container.count())
-            ]
-            Data.reorder_groups(group_ids)
-            
+            Data.move_group(node.group_class.group_id, index)
         else:
-            task_ids = [
-                self._nodes_container.itemAt(i).widget().task_class.task_id
-                for i in range(self._nodes_container.count())
-            ]
-            Data.get_group_by_id(node.task_class.group_id).reorder_tasks(task_ids)
+            GroupNode.nodes[node.task_class.group_id].group_class.move_task(node.task_class.task_id, index)
 
         self._update_nodes_contents_margins()
 
@@ -154,14 +223,55 @@ class SubNodeManager:
             node.set_edit_mode(on)
         
 
+class DropPlaceholder(QWidget):
+    """The line that shows where a dragged node will be dropped.
+
+    It stays shown and only paints while a node is dragged. Showing a widget or changing its size hint
+    activates the layout of its parent, which would snap the dragged node back to its slot."""
+
+    def __init__(self, parent: QWidget) -> None:
+        super().__init__(parent)
+        self.setAttribute(Qt.WA_TransparentForMouseEvents)
+        self._active = False
+        self._animation = QPropertyAnimation(self, b"pos", self)
+        self._animation.setDuration(120)
+        self._animation.setEasingCurve(QEasingCurve.OutCubic)
+        self.resize(0, 0)
+        self.show()
+
+    def slide_to(self, position: QPoint, width: int) -> None:
+        self.resize(width, max(scaled(3), 1))
+        position -= QPoint(0, self.height() // 2)
+        self.raise_()
+        if not self._active:
+            self._active = True
+            self.move(position)
+            self.update()
+            return
+        self._animation.stop()
+        self._animation.setStartValue(self.pos())
+        self._animation.setEndValue(position)
+        self._animation.start()
+
+    def clear(self) -> None:
+        self._animation.stop()
+        self._active = False
+        self.update()
+
+    def paintEvent(self, a0: QPaintEvent) -> None:
+        if self._active:
+            painter = QPainter(self)
+            painter.fillRect(self.rect(), QColor("#ABABAB"))
+
+
 class BaseNode(QWidget):
     class Buttons(QWidget):
         def __init__(self, add_grn_button: bool, parent: QWidget | None = None) -> None:
             super().__init__(parent)
             
             self.setLayout(layout := QHBoxLayout(self))
-            layout.setContentsMargins(scaled(10), 0, 0, 0)
-            layout.setSpacing(scaled(7))
+            self._apply_scale()
+            ui_scale.changed.connect(self._apply_scale)
             
             if add_grn_button:
                 self.grn_button = GrnButton(self, "radial")
@@ -172,12 +282,17 @@ class BaseNode(QWidget):
 
             layout.addWidget(self.yel_button)
             layout.addWidget(self.red_button)
+
+        def _apply_scale(self) -> None:
+            self.layout().setContentsMargins(scaled(10), 0, 0, 0)
+            self.layout().setSpacing(scaled(7))
     
     task_class: Data.TaskClass
     group_class: Data.GroupClass
     buttons: BaseNode.Buttons
     changed = pyqtSignal(NodeChangeEvent)
     """This signal is emitted with an event when any changes are made to this node."""
+    draggable: bool = True
 
     def __init__(self, parent: QWidget | None = None) -> None:
         super().__init__(parent)
@@ -208,6 +323,8 @@ class BaseNode(QWidget):
     
     
     def mousePressEvent(self, a0: QMouseEvent) -> None:
+        if not self.draggable:
+            return
         self._mouse_click_offset = a0.pos()
         self.raise_()
 
@@ -232,8 +349,6 @@ class TaskNode(BaseNode):
         self.task_class: Data.TaskClass = task_class
         
         self.setLayout(layout := QHBoxLayout())
-        layout.setContentsMargins(0, 0, 0, 0)
-        layout.setSpacing(scaled(10))
         
         layout.addWidget(buttons := BaseNode.Buttons(False, self))
         
@@ -244,7 +359,6 @@ class TaskNode(BaseNode):
         self.buttons = buttons
 
         self.label = QLabel(self)
-        self.label.setFont(get_font(size=scaled(16)))
         self.label.hide()
         
         self.button = TextButton(self)
@@ -254,17 +368,29 @@ class TaskNode(BaseNode):
         layout: QHBoxLayout = self.layout()
         layout.insertWidget(0, self.label)
         layout.insertWidget(1, self.button)
-        layout.setContentsMargins(0, scaled(15), 0, 0)
         
-        self.setFixedHeight(self.button.sizeHint().height())
+        self._apply_scale()
+        ui_scale.changed.connect(self._apply_scale)
         
         self.update_contents()
         
         self.yel_button.clicked.connect(self._edit_task)
         self.red_button.clicked.connect(self._delete_task)
+        self.destroyed.connect(lambda *_, key=self._search_key: search_index.remove(key))
         
     def __repr__(self):
         return f"TaskNode: {self.task_class.task_name}"
+
+    def _apply_scale(self) -> None:
+        self.layout().setSpacing(scaled(10))
+        self.layout().setContentsMargins(0, scaled(15), 0, 0)
+        self.label.setFont(get_font(size=scaled(16)))
+        self.setFixedHeight(self.button.sizeHint().height())
+        self.adjustSize()
+
+    @property
+    def _search_key(self) -> str:
+        return f"{TASK}:{self.task_class.task_id}"
         
         
     def _set_label(self, label: str) -> None:
@@ -284,8 +410,11 @@ class TaskNode(BaseNode):
         self.adjustSize()
 
     def _text_button_action(self) -> None:
-        print("Button action")
-        # XXX: button action should be implemented.
+        self.launch()
+
+    def launch(self) -> None:
+        usage_log.record([self.task_class.task_id])
+        task_launcher.launch_task(self.task_class)
         
     def _edit_task(self) -> None:
         dialog = TaskDialog(self)
@@ -298,22 +427,46 @@ class TaskNode(BaseNode):
         dialog = ConfirmationDialog(f"Delete '{self.task_class.task_name}' from\
                 '{Data.get_group_by_id(self.task_class.group_id).group_name}'?")
         if dialog.exec() == ACCEPTED:
-            self.task_class.delete_task()
+            # through the group of the GroupNode, its task list stays the one in the save file.
+            GroupNode.nodes[self.task_class.group_id].group_class.delete_task(self.task_class.task_id)
+            usage_log.forget(self.task_class.task_id)
             self.changed.emit(NodeChangeEvent(NODE_DELETED, self))
 
     def update_contents(self) -> None:
         self._set_label(self.task_class.task_name)
         self._set_button(text if (text := self.task_class.button_text) is not None else "")
+        self._update_search_entry()
+
+    def _update_search_entry(self) -> None:
+        task = self.task_class
+        targets = [*task.url, task.file_path, task.directory_path]
+        search_index.add(self._search_key, task.task_name, TASK, self._show_in_window,
+                         subtitle=" ".join(target for target in targets if target))
+
+    def _show_in_window(self) -> None:
+        window = self.window()
+        window.show()
+        window.activateWindow()
         
 
 class GroupNode(BaseNode):
-    task_node_departed_signal = pyqtSignal(TaskNode)
-    """This signal will be emitted when a TaskNode is departed from the GroupNode."""
+    task_node_departed_signal = pyqtSignal(TaskNode, QPoint)
+    """This signal will be emitted with the global mouse position while a TaskNode is dragged out of the GroupNode."""
+    task_node_returned_signal = pyqtSignal(TaskNode)
+    """This signal will be emitted when a departed TaskNode is dragged back into the GroupNode."""
+    task_node_dropped_signal = pyqtSignal(TaskNode)
+    """This signal will be emitted when a departed TaskNode is released."""
     nodes: dict[str, GroupNode] = {}
     
-    def __init__(self, group_class: Data.GroupClass, parent: QWidget | None = None) -> None:
+    def __init__(self, group_class: Data.GroupClass, parent: QWidget | None = None,
+                 tasks: Iterable[Data.TaskClass] | None = None) -> None:
+        """tasks are the tasks of group_class if they are already loaded, they are read from the save file if not."""
         super().__init__(parent)
         GroupNode.nodes[group_class.group_id] = self
+        self._parent_adjust_timer = QTimer(self)
+        self._parent_adjust_timer.setSingleShot(True)
+        self._parent_adjust_timer.setInterval(0)
+        self._parent_adjust_timer.timeout.connect(lambda: self._parent.adjustSize())
         
         self.group_class: Data.GroupClass = group_class
         self._id = group_class.group_id
@@ -343,10 +496,21 @@ class GroupNode(BaseNode):
         self.label.setFont(get_font(size=scaled(24), weight="semibold"))
         self.label.hide()
         
+        ui_scale.changed.connect(self._apply_scale)
+        
         layout.insertWidget(0, self.label)
         
+        self.open_button = TextButton(self, "Open All")
+        self.open_button.setToolTip("Open every task of the group")
+        self.open_button.clicked.connect(self.launch_tasks)
+        layout.insertSpacing(1, scaled(13))
+        layout.insertWidget(2, self.open_button)
+        self._header_layout = layout
+        
         self._task_nodes_manager = SubNodeManager(nodes_layout, self)
         self._task_nodes_manager.departed_signal.connect(self.task_node_departed_signal.emit)
+        self._task_nodes_manager.returned_signal.connect(self.task_node_returned_signal.emit)
+        self._task_nodes_manager.dropped_outside_signal.connect(self.task_node_dropped_signal.emit)
 
         self._update_contents()
 
@@ -355,13 +519,19 @@ class GroupNode(BaseNode):
         self.red_button.clicked.connect(self._delete_group)
         
         # spawn TaskNodes
-        for task_class in self.group_class.get_tasks():
+        for task_class in self.group_class.get_tasks() if tasks is None else tasks:
             self._add_task_node(task_class)
 
     def __repr__(self):
         return f"GroupNode: {self.group_class.group_name}"
 
 
+    def _apply_scale(self) -> None:
+        self.label.setFont(get_font(size=scaled(24), weight="semibold"))
+        self._header_layout.itemAt(1).spacerItem().changeSize(scaled(13), 0)
+        self.update_content_margins()
+        self.adjustSize()
+
     def _update_contents(self) -> None:
         self._set_label(self.group_class.group_name)
 
@@ -392,6 +562,7 @@ class GroupNode(BaseNode):
         if dialog.exec() == ACCEPTED:
             while self._nodes_layout.count():
                 node = self._nodes_layout.takeAt(0).widget()
+                usage_log.forget(node.task_class.task_id)
                 node.hide()
                 node.deleteLater()
             self.group_class.delete_group()
@@ -401,6 +572,14 @@ class GroupNode(BaseNode):
         task_node = TaskNode(task_class, self)
         self._task_nodes_manager.add_node(task_node)
 
+    def task_count(self) -> int:
+        return self._nodes_layout.count()
+
+    def add_task_nodes(self, tasks: Iterable[Data.TaskClass]) -> None:
+        """Adds a TaskNode for every task, the tasks are already saved in the group."""
+        for task_class in tasks:
+            self._add_task_node(task_class)
+
     def update_content_margins(self):
         if self.is_first_node():
             self.layout().setContentsMargins(0, 0, 0, 0)
@@ -409,30 +588,57 @@ class GroupNode(BaseNode):
 
     def set_edit_mode(self, on: bool) -> None:
         self._task_nodes_manager.set_edit_mode(on)
+        self.open_button.setHidden(on)
         return super().set_edit_mode(on)
 
-    def method_to_add_task(self, task_node: TaskNode) -> int:
-        """Adds task_node to this group and set it's order according to the position of task_node.
-        returns new id of task."""
-        position = task_node.pos()
-        # add the task of task_node to group of this group.
-        task_node.task_class.change_group(self.group_class.group_id)
-        # check if task_node position is hovering over top half or bottom half of any task_nodes.
-        middle_of_task_node = position + task_node.height() // 2
+    def _task_nodes(self) -> dict[str, TaskNode]:
+        """The TaskNodes by task id, in their saved order. Nodes missing from group_tasks come last."""
+        task_nodes = {}
         for i in range(self._nodes_layout.count()):
-            _node = self._nodes_layout.itemAt(i).widget()
-            if _node.rect().adjusted(0, 0, 0, -_node.height()//2).contains(middle_of_task_node):
-                # task_node in top half of _node
-                print("task_node in top half of node")
-            elif _node.rect().adjusted(0, _node.height()//2, 0, 0).contains(middle_of_task_node):
-                # task_node in bottom half of _node
-                print("task_node in bottom half of node")
-        # XXX: delete task_node and add new task_node with new task data.
-        # if yes, put the 
+            node: TaskNode = self._nodes_layout.itemAt(i).widget()
+            task_nodes[node.task_class.task_id] = node
+        order = {task_id: task_nodes[task_id] for task_id in self.group_class.group_tasks if task_id in task_nodes}
+        order.update(task_nodes)
+        return order
+
+    def task_classes(self) -> list[Data.TaskClass]:
+        """The tasks of the group in their saved order, whatever order they are shown in, as held by the
+        TaskNodes. Doesn't read the save file."""
+        return [node.task_class for node in self._task_nodes().values()]
+
+    def launch_tasks(self) -> None:
+        """Opens the targets of every task of the group, in the order and with the delay of the settings."""
+        order, delay = launch_settings()
+        tasks = self.task_classes()
+        usage_log.record(task.task_id for task in tasks)
+        task_launcher.launch_tasks(tasks, order, delay)
+
+    def show_tasks_by_use(self, on: bool) -> None:
+        """Shows the tasks most used first, or in their saved order. A drag changes the saved order,
+        so the tasks can't be dragged while they are sorted by use."""
+        task_nodes = self._task_nodes()
+        for node in task_nodes.values():
+            node.draggable = not on
+        order = usage_log.ranked(task_nodes) if on else list(task_nodes)
+        self._task_nodes_manager.arrange([task_nodes[task_id] for task_id in order])
+
+    def preview_task_drop(self, global_position: QPoint) -> int:
+        """Shows where a TaskNode of another group would be dropped. Returns the index."""
+        return self._task_nodes_manager.preview_drop(self.mapFromGlobal(global_position).y())
+
+    def clear_task_preview(self) -> None:
+        self._task_nodes_manager.clear_preview()
+
+    def move_task_node_to(self, task_node: TaskNode, group_node: GroupNode, index: int) -> None:
+        """Moves task_node and its task to index of group_node. The move is saved in one write
+        and the TaskNode itself is moved to group_node."""
+        self.group_class.transfer_task(task_node.task_class, group_node.group_class, index)
+        self._task_nodes_manager.take_node(task_node)
+        group_node._task_nodes_manager.insert_node(task_node, index)
 
     def adjustSize(self) -> None:
         super().adjustSize()
-        QTimer.singleShot(0, self._parent.adjustSize)
+        self._parent_adjust_timer.start()
 
 
     # uncomment this to show every individual groups.
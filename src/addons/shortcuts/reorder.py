@@ -0,0 +1,42 @@
+"""Drop targets of a node that is dragged among its siblings.
+
+The spans of the nodes are read once when the drag starts. The drop index of a mouse position is then a
+binary search over the middles of the siblings, so a mouse move costs O(log n) and doesn't touch the
+widgets. The index is the final position of the node among its siblings, the node itself not counted,
+which is what a single move (remove, then insert) needs."""
+
+from __future__ import annotations
+
+from bisect import bisect_right
+
+
+class DropTargets:
+    def __init__(self, spans: list[tuple[int, int]], source: int) -> None:
+        """spans are the (top, bottom) of every node in layout order, source is the index of the dragged node,
+        -1 if it's dragged in from another layout."""
+        self.source = source
+        self._spans = [span for i, span in enumerate(spans) if i != source]
+        self._middles = [(top + bottom) / 2 for top, bottom in self._spans]
+        self._tops = [top for top, _ in self._spans]
+        self._top = min((top for top, _ in spans), default=0)
+
+    def __len__(self) -> int:
+        return len(self._spans)
+
+    def index_at(self, y: float) -> int:
+        """The index the dragged node would be dropped at. Above the middle of a sibling is before it."""
+        return bisect_right(self._middles, y)
+
+    def nearest(self, y: float) -> int:
+        """The index of the sibling at y, or of the closest one if y is above or below all of them."""
+        return min(max(bisect_right(self._tops, y) - 1, 0), len(self._spans) - 1)
+
+    def boundary(self, index: int) -> int:
+        """y of the gap the node would be dropped in, where the placeholder is shown."""
+        if index == 0:
+            return self._top
+        return self._spans[index - 1][1]
+
+    def is_move(self, index: int) -> bool:
+        """Whether dropping at index changes the order."""
+        return index != self.source
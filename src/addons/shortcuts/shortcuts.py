@@ -1,16 +1,27 @@
 from __future__ import annotations
 
-from PyQt5.QtWidgets import QVBoxLayout, QHBoxLayout, QLabel
+import os
+import threading
+
+from PyQt5.QtCore import QPoint, QTimer, pyqtSignal
+from PyQt5.QtGui import QShowEvent
+from PyQt5.QtWidgets import QApplication, QVBoxLayout, QHBoxLayout, QLabel, QSystemTrayIcon, QFileDialog
 
 from addon import AddOnBase
 from addons.shortcuts.dialog import GroupDialog, REJECTED
 from ui.utils import get_font
+from search_index import index as search_index, SearchEntry
 
 from . import shortcuts_save as Data
+from .bookmarks import read_bookmark_file, save_import, export_bookmarks, ImportResult
+from .reorder import DropTargets
+from .task_launcher import task_launcher, host_prewarmer, prewarm_enabled
+from .usage import usage_log
 
 from ui import (
     BaseWindow,
     GrnButton,
+    TextButton,
     REJECTED,
 )
 
@@ -20,24 +31,35 @@ from .nodes import (
     TaskNode
 )
 
-from settings import apply_ui_scale as scaled
+from settings import ui_scale, apply_ui_scale as scaled
 
 
 add_on_base = AddOnBase()
 add_on_base.set_icon_path("icon.png")
 add_on_base.set_name("Shortcuts")
 
+# shortcuts setting, whether the tasks are shown most used first outside the edit mode.
+SORT_BY_USE_SETTING = "sort_by_use"
+QUICK_LAUNCH_KIND = "open task"
+# TaskNodes of imported bookmarks added per turn of the event loop.
+IMPORT_BATCH_SIZE = 25
+
 
 class MainWindow(BaseWindow):
+    _bookmarks_imported = pyqtSignal(str, object)
+    """Emitted from the import thread with the file path and the ImportResult to be saved or the error."""
+
     def __init__(self) -> None:
         super().__init__(hide_title_bar = False)
         
         self._edit_mode: bool = False
+        try:
+            self._sort_by_use: bool = bool(Data.get_setting(SORT_BY_USE_SETTING))
+        except Data.NotFound:
+            self._sort_by_use = False
         
         self.toggle_window = lambda: window.show() if window.isHidden() else window.hide()
 
-        self.setContentsMargins(x := scaled(15), x, x, x)
-        self.setMinimumSize(scaled(110), scaled(76))
         
         self.setLayout(layout := QVBoxLayout())
         layout.addLayout(nodes_layout := QVBoxLayout())
@@ -49,16 +71,37 @@ class MainWindow(BaseWindow):
 
         self._group_nodes_manager = SubNodeManager(nodes_layout, self)
         
+        # a TaskNode dragged out of its group: the spans of the groups, read when it departs,
+        # and the group and index it would be dropped at.
+        self._group_targets: DropTargets | None = None
+        self._task_drop: tuple[GroupNode, int] | None = None
+        
+        # the imported groups whose nodes are still to be built, the last one first, and the nodes built.
+        self._import_result: ImportResult | None = None
+        self._pending_imports: list[tuple[Data.GroupClass, list[Data.TaskClass]]] = []
+        self._imported_groups: list[GroupNode] = []
+        self._bookmarks_imported.connect(self._on_bookmarks_imported)
+        
         layout.addLayout(add_new_group_layout := QHBoxLayout())
         self._setup_add_new_group_button(add_new_group_layout)
         
         
-        for group_id in Data.load_groups():
-            group_class = Data.get_group_by_id(group_id)
-            self._add_group_node(group_class)
+        for group_class, tasks in Data.load_all():
+            self._add_group_node(group_class, tasks)
                 
         self.yel_button.clicked.connect(self._toggle_edit_mode)
         self.red_button.clicked.connect(self.hide)
+        task_launcher.failed.connect(self._on_launch_failed)
+        
+        self._apply_scale()
+        ui_scale.changed.connect(self._apply_scale)
+
+    def _apply_scale(self) -> None:
+        self.setContentsMargins(x := scaled(15), x, x, x)
+        self.setMinimumSize(scaled(110), scaled(76))
+        self._add_new_group_label.setFont(get_font(size=scaled(24), weight="semibold"))
+        self._add_new_group_layout.itemAt(1).spacerItem().changeSize(scaled(13), 0)
+        self._update_edit_mode()
         
 
     def _setup_add_new_group_button(self, add_new_group_layout: QHBoxLayout):
@@ -79,17 +122,38 @@ class MainWindow(BaseWindow):
         add_new_group_layout.addWidget(add_group_button)
         add_new_group_layout.addStretch()
         
+        import_button = TextButton(self, "Import Bookmarks")
+        import_button.clicked.connect(self._import_bookmarks)
+        import_button.setToolTip("Add the bookmarks of an HTML, Chromium or Firefox bookmark file")
+        add_new_group_layout.addWidget(import_button)
+        
+        export_button = TextButton(self, "Export Bookmarks")
+        export_button.clicked.connect(self._export_bookmarks)
+        export_button.setToolTip("Save the urls of the tasks as an HTML bookmark file")
+        add_new_group_layout.addWidget(export_button)
+        
+        sort_button = TextButton(self)
+        sort_button.clicked.connect(self._toggle_sort_by_use)
+        sort_button.setToolTip("Order of the tasks outside the edit mode")
+        add_new_group_layout.addWidget(sort_button)
+        
         self._add_new_group_label = add_group_label
         self._add_new_group_button = add_group_button
+        self._sort_button = sort_button
+        self._bookmark_buttons = (import_button, export_button)
         self._add_new_group_layout = add_new_group_layout
         
         self._update_edit_mode()
 
-    def _add_group_node(self, group_class: Data.GroupClass) -> None:
-        group_node = GroupNode(group_class, self)
-        self._group_nodes_manager.add_node(group_node)
+    def _add_group_node(self, group_class: Data.GroupClass, tasks: list[Data.TaskClass] | None = None) -> None:
+        self._insert_group_node(GroupNode(group_class, self, tasks))
         self._update_edit_mode()
+
+    def _insert_group_node(self, group_node: GroupNode) -> None:
+        self._group_nodes_manager.add_node(group_node)
         group_node.task_node_departed_signal.connect(self._on_task_node_departed)
+        group_node.task_node_returned_signal.connect(self._on_task_node_returned)
+        group_node.task_node_dropped_signal.connect(self._on_task_node_dropped)
         
     def _on_add_group_button(self) -> None:
         dialog = GroupDialog(self)
@@ -101,17 +165,155 @@ class MainWindow(BaseWindow):
         self._group_nodes_manager.set_edit_mode(self._edit_mode)
         self._add_new_group_label.setHidden(not self._edit_mode)
         self._add_new_group_button.setHidden(not self._edit_mode)
+        self._sort_button.setHidden(not self._edit_mode)
+        for button in self._bookmark_buttons:
+            button.setHidden(not self._edit_mode)
+        self._sort_button.setText("Order: Most Used" if self._sort_by_use else "Order: Saved")
+        self._update_task_order()
         self._add_new_group_layout.setContentsMargins(0, scaled(25) if self._edit_mode else 0, 0, 0)
         self.adjustSize()
         
     def _toggle_edit_mode(self) -> None:
         self._edit_mode = not self._edit_mode
         self._update_edit_mode()
+
+    def _toggle_sort_by_use(self) -> None:
+        self._sort_by_use = not self._sort_by_use
+        Data.apply_settings(SORT_BY_USE_SETTING, self._sort_by_use)
+        self._update_edit_mode()
+
+    def _update_task_order(self) -> None:
+        """Sorts the tasks by use outside the edit mode if it's on. The edit mode shows the saved order,
+        which is what dragging changes."""
+        for group_node in GroupNode.nodes.values():
+            if self._nodes_layout.indexOf(group_node) >= 0:
+                group_node.show_tasks_by_use(self._sort_by_use and not self._edit_mode)
+        
+    def _on_task_node_departed(self, task_node: TaskNode, global_position: QPoint) -> None:
+        """Previews the drop of task_node in the group under the mouse."""
+        if self._group_targets is None:
+            self._group_targets = DropTargets(self._group_nodes_manager.slot_spans(), -1)
+        if not len(self._group_targets):
+            return
+        y = self.mapFromGlobal(global_position).y()
+        group_node: GroupNode = self._nodes_layout.itemAt(self._group_targets.nearest(y)).widget()
+        if group_node.group_class.group_id == task_node.task_class.group_id:
+            self._clear_task_drop()
+            return
+        if self._task_drop is not None and self._task_drop[0] is not group_node:
+            self._task_drop[0].clear_task_preview()
+        self._task_drop = (group_node, group_node.preview_task_drop(global_position))
+
+    def _on_task_node_returned(self, task_node: TaskNode) -> None:
+        self._group_targets = None
+        self._clear_task_drop()
+
+    def _clear_task_drop(self) -> None:
+        if self._task_drop is not None:
+            self._task_drop[0].clear_task_preview()
+        self._task_drop = None
+
+    def _on_task_node_dropped(self, task_node: TaskNode) -> None:
+        drop, self._group_targets = self._task_drop, None
+        self._clear_task_drop()
+        if drop is not None:
+            # moved after the release event of task_node is done, it gets a new parent.
+            source = GroupNode.nodes[task_node.task_class.group_id]
+            QTimer.singleShot(0, lambda: source.move_task_node_to(task_node, *drop))
         
-    def _on_task_node_departed(self, task_node: TaskNode) -> None:
-        print(f"{self._nodes[task_node.task_class.task_id]} is departed from {self._nodes[Data.get_group_id_of_task(task_node.task_class.task_id)]}.")
-        # XXX: Should be implemented
         
+    def showEvent(self, a0: QShowEvent) -> None:
+        # sorted when shown, the tasks don't move under the mouse while the window is open.
+        self._update_task_order()
+        self._prewarm_hosts()
+        return super().showEvent(a0)
+
+    def _prewarm_hosts(self) -> None:
+        """Resolves the hosts of all tasks in the background, so opening a group doesn't wait for DNS."""
+        if prewarm_enabled():
+            host_prewarmer.prewarm(url for task_node in TaskNode.nodes.values() for url in task_node.task_class.url)
+
+    def _import_bookmarks(self) -> None:
+        file_path, _ = QFileDialog.getOpenFileName(self, "Import Bookmarks", os.path.expanduser("~"),
+                                                   "Bookmark files (*.html *.htm *.json Bookmarks);;All files (*)")
+        if not file_path:
+            return
+        self._bookmark_buttons[0].setEnabled(False)  # until the nodes of this import are added
+        # the save file is only read and written on this thread, the import thread gets the ids in use.
+        threading.Thread(target=self._read_bookmarks, args=(file_path, Data.used_ids()), daemon=True).start()
+
+    def _read_bookmarks(self, file_path: str, used: set[str]) -> None:
+        """Parses the bookmarks on the import thread."""
+        try:
+            result = read_bookmark_file(file_path, used)
+        except Exception as error:  # pylint: disable=broad-except
+            # the result is always handed back, the import button stays disabled until then.
+            result = error
+        self._bookmarks_imported.emit(file_path, result)
+
+    def _on_bookmarks_imported(self, file_path: str, result: ImportResult | Exception) -> None:
+        if isinstance(result, Exception):
+            self._bookmark_buttons[0].setEnabled(True)
+            self._notify(f"Couldn't import {os.path.basename(file_path)}\n{result}", QSystemTrayIcon.Warning)
+            return
+        try:
+            save_import(result)
+        except OSError as error:
+            self._bookmark_buttons[0].setEnabled(True)
+            self._notify(f"Couldn't save the bookmarks of {os.path.basename(file_path)}\n{error}",
+                         QSystemTrayIcon.Warning)
+            return
+        self._import_result = result
+        self._pending_imports = list(reversed(result.groups))
+        self._add_imported_nodes()
+
+    def _add_imported_nodes(self) -> None:
+        """Builds the nodes of the next IMPORT_BATCH_SIZE imported tasks, the window stays responsive between
+        the batches. The groups are built hidden and added to the window together at the end, adding a group
+        lays out the whole window again."""
+        count = IMPORT_BATCH_SIZE
+        while count and self._pending_imports:
+            group_class, tasks = self._pending_imports[-1]
+            if not self._imported_groups or self._imported_groups[-1].group_class is not group_class:
+                self._imported_groups.append(GroupNode(group_class, self, []))
+            group_node = self._imported_groups[-1]
+            added = group_node.task_count()
+            batch = tasks[added:added + count]
+            group_node.add_task_nodes(batch)
+            count -= len(batch)
+            if added + len(batch) == len(tasks):
+                self._pending_imports.pop()
+        if self._pending_imports:
+            QTimer.singleShot(0, self._add_imported_nodes)
+            return
+        for group_node in self._imported_groups:
+            self._insert_group_node(group_node)
+        self._imported_groups = []
+        self._update_edit_mode()
+        self._bookmark_buttons[0].setEnabled(True)
+        self._notify(str(self._import_result))
+        self._import_result = None
+
+    def _export_bookmarks(self) -> None:
+        file_path, _ = QFileDialog.getSaveFileName(self, "Export Bookmarks", os.path.expanduser("~/bookmarks.html"),
+                                                   "Bookmark files (*.html)")
+        if not file_path:
+            return
+        groups = [(group_node.group_class, group_node.task_classes())
+                  for group_node in (self._nodes_layout.itemAt(i).widget() for i in range(self._nodes_layout.count()))]
+        try:
+            count = export_bookmarks(file_path, groups)
+        except OSError as error:
+            self._notify(f"Couldn't export the bookmarks\n{error}", QSystemTrayIcon.Warning)
+            return
+        self._notify(f"Exported {count} bookmarks to {file_path}")
+
+    def _notify(self, message: str, icon: QSystemTrayIcon.MessageIcon = QSystemTrayIcon.Information) -> None:
+        if AddOnBase.system_tray_icon is not None:
+            AddOnBase.system_tray_icon.showMessage("Shortcuts", message, icon)
+
+    def _on_launch_failed(self, target: str, error: str) -> None:
+        self._notify(f"Couldn't open {target}\n{error}", QSystemTrayIcon.Warning)
         
     def get_first_node(self) -> GroupNode:
         return self.layout().itemAt(0).layout().itemAt(0).widget()
@@ -122,5 +324,18 @@ class MainWindow(BaseWindow):
         return {**GroupNode.nodes, **TaskNode.nodes}
 
 
+def most_used_tasks(limit: int) -> list[SearchEntry]:
+    """Quick launch entries of the command palette, the most used tasks."""
+    entries = []
+    for task_id in usage_log.top(limit, TaskNode.nodes):
+        task_node = TaskNode.nodes[task_id]
+        entries.append(SearchEntry(f"{QUICK_LAUNCH_KIND}:{task_id}", task_node.task_class.task_name,
+                                   QUICK_LAUNCH_KIND, task_node.launch))
+    return entries
+
+
 window = MainWindow()
-add_on_base.activate = window.toggle_window
\ No newline at end of file
+add_on_base.activate = window.toggle_window
+search_index.add_suggestions(most_used_tasks)
+QApplication.instance().aboutToQuit.connect(task_launcher.shutdown)
+QApplication.instance().aboutToQuit.connect(host_prewarmer.shutdown)
\ No newline at end of file
@@ -94,6 +94,26 @@ class TaskClass:
 
         self.save_task()
 
+    @classmethod
+    def from_data(cls, group_id: str, task_id: str, task_data: dict) -> TaskClass:
+        """
+        Creates a TaskClass from its data in the SaveFile without saving it or checking its urls.
+
+        :param group_id: id of the group of the task
+        :param task_id: id of the task
+        :param task_data: dictionary in the format of get_task_data
+        :return: TaskClass object
+        """
+        task = cls.__new__(cls)
+        task.task_id = task_id
+        task.group_id = group_id
+        task.task_name = task_data["task_name"]
+        task.button_text = task_data["button_text"]
+        task.url = list(task_data["url"] or [])
+        task.file_path = task_data["file_path"]
+        task.directory_path = task_data["directory_path"]
+        return task
+
     def __str__(self):
         return self.task_name
 
@@ -253,6 +273,24 @@ class GroupClass:
 
         self.save_group()
 
+    @classmethod
+    def from_data(cls, group_id: str, group_data: dict) -> GroupClass:
+        """
+        Creates a GroupClass from its data in the SaveFile without saving it.
+
+        :param group_id: id of the group
+        :param group_data: dictionary with the group_name and group_tasks keys
+        :return: GroupClass object
+        """
+        group = cls.__new__(cls)
+        group.group_id = group_id
+        group._group_name = group_data["group_name"]
+        group.group_tasks = list(group_data["group_tasks"])
+        return group
+
+    def get_group_data(self) -> dict:
+        return {"group_name": self.group_name, "group_tasks": self.group_tasks}
+
     def __iter__(self):
         self.i = 0
         return self
@@ -419,6 +457,32 @@ class GroupClass:
         self.group_tasks = new_task_id_list
         self.save_group()
 
+    def transfer_task(self, task: TaskClass, new_group: GroupClass, index: int | None = None) -> None:
+        """
+        Moves a task of this group to new_group. Only the task lists of the two groups change,
+        and they are saved in one atomic write. The task itself is not saved again.
+        The task lists of both groups are read from the SaveFile again.
+        Will raise TaskNotFoundInGroup if the task is not in this group.
+
+        :param task: the task to be moved
+        :param new_group: the group that receives the task
+        :param index: index of the task in new_group, it is appended if not given
+        """
+        self.group_tasks, new_group.group_tasks = move_task_to_group(task.task_id, self.group_id,
+                                                                     new_group.group_id, index)
+        task.group_id = new_group.group_id
+
+    def move_task(self, task_id: str, index: int) -> None:
+        """
+        Moves a task of the group to index and saves only the task list of this group.
+        The task list is read from the SaveFile again, tasks deleted through another copy of the group stay deleted.
+        Will raise TaskNotFoundInGroup if the task is not in the group.
+
+        :param task_id: id of the task to be moved
+        :param index: new index of the task, counted without the task itself
+        """
+        self.group_tasks = move_task_in_group(task_id, self.group_id, index)
+
 
 def get_task_by_id(task_id: str) -> TaskClass:
     """
@@ -539,6 +603,131 @@ def reorder_groups(new_order: list) -> None:
         json.dump(json_data, save_file, indent=4)
 
 
+def move_group(group_id: str, index: int) -> None:
+    """
+    Moves a group to index in the save file, the other groups keep their order.
+    :param group_id: id of the group to be moved
+    :param index: new index of the group, counted without the group itself
+    """
+    with open(FILE_PATH, "r") as save_file:
+        json_data = json.load(save_file)
+
+    groups = json_data["groups"]
+    if group_id not in groups:
+        raise NotFoundInFile(group_id)
+    order = [_id for _id in groups if _id != group_id]
+    order.insert(index, group_id)
+    json_data["groups"] = {_id: groups[_id] for _id in order}
+
+    with open(FILE_PATH, "w") as save_file:
+        json.dump(json_data, save_file, indent=4)
+
+
+def move_task_in_group(task_id: str, group_id: str, index: int) -> list[str]:
+    """
+    Moves a task to index of its group in the save file, the other tasks keep their order.
+    :param task_id: id of the task to be moved
+    :param group_id: id of the group the task is in
+    :param index: new index of the task, counted without the task itself
+    :return: the saved task list of the group
+    """
+    with open(FILE_PATH, "r") as save_file:
+        json_data = json.load(save_file)
+
+    groups = json_data["groups"]
+    if group_id not in groups:
+        raise NotFoundInFile(group_id)
+    tasks = groups[group_id]["group_tasks"]
+    if task_id not in tasks:
+        raise TaskNotFoundInGroup(groups[group_id]["group_name"], task_id)
+    tasks.remove(task_id)
+    tasks.insert(index, task_id)
+
+    with open(temporary_path := f"{FILE_PATH}.tmp", "w") as save_file:
+        json.dump(json_data, save_file, indent=4)
+    os.replace(temporary_path, FILE_PATH)
+    return tasks
+
+
+def move_task_to_group(task_id: str, group_id: str, new_group_id: str,
+                       index: int | None = None) -> tuple[list[str], list[str]]:
+    """
+    Moves a task from group_id to index of new_group_id with a single write of the save file.
+    The file is written next to the save file and replaced, so the task is never in both groups or in none.
+    :param task_id: id of the task to be moved
+    :param group_id: id of the group the task is in
+    :param new_group_id: id of the group that receives the task
+    :param index: index of the task in the new group, it is appended if not given
+    :return: the saved task lists of the two groups
+    """
+    with open(FILE_PATH, "r") as save_file:
+        json_data = json.load(save_file)
+
+    groups = json_data["groups"]
+    if group_id not in groups:
+        raise NotFoundInFile(group_id)
+    if new_group_id not in groups:
+        raise NotFoundInFile(new_group_id)
+    if task_id not in groups[group_id]["group_tasks"]:
+        raise TaskNotFoundInGroup(groups[group_id]["group_name"], task_id)
+    groups[group_id]["group_tasks"].remove(task_id)
+    new_tasks = groups[new_group_id]["group_tasks"]
+    new_tasks.insert(len(new_tasks) if index is None else index, task_id)
+
+    with open(temporary_path := f"{FILE_PATH}.tmp", "w") as save_file:
+        json.dump(json_data, save_file, indent=4)
+    os.replace(temporary_path, FILE_PATH)
+    return groups[group_id]["group_tasks"], new_tasks
+
+
+def load_all() -> list[tuple[GroupClass, list[TaskClass]]]:
+    """
+    Loads every group with its tasks, in order, with a single read of the SaveFile.
+    Will raise NotFoundInFile if a group has a task that is not in the SaveFile.
+    :return: list of the groups and their tasks
+    """
+    with open(FILE_PATH, "r") as save_file:
+        json_data = json.load(save_file)
+
+    tasks = json_data["tasks"]
+    groups = []
+    for group_id, group_data in json_data["groups"].items():
+        group = GroupClass.from_data(group_id, group_data)
+        for task_id in group.group_tasks:
+            if task_id not in tasks:
+                raise NotFoundInFile(task_id)
+        groups.append((group, [TaskClass.from_data(group_id, task_id, tasks[task_id]) for task_id in group.group_tasks]))
+    return groups
+
+
+def used_ids() -> set[str]:
+    """
+    Reads the ids of all groups and tasks in the SaveFile at once, to check many new ids.
+    :return: set of the ids in use
+    """
+    with open(FILE_PATH, "r") as save_file:
+        json_data = json.load(save_file)
+    return {*json_data["groups"], *json_data["tasks"]}
+
+
+def save_groups(groups: list[GroupClass], tasks: list[TaskClass]) -> None:
+    """
+    Saves new groups and tasks with a single write of the SaveFile.
+    The file is written next to the SaveFile and replaced, so it's never saved half way.
+    :param groups: groups to be saved, after the groups in the SaveFile
+    :param tasks: tasks of the groups
+    """
+    with open(FILE_PATH, "r") as save_file:
+        json_data = json.load(save_file)
+
+    json_data["groups"].update({group.group_id: group.get_group_data() for group in groups})
+    json_data["tasks"].update({task.task_id: task.get_task_data() for task in tasks})
+
+    with open(temporary_path := f"{FILE_PATH}.tmp", "w") as save_file:
+        json.dump(json_data, save_file, indent=4)
+    os.replace(temporary_path, FILE_PATH)
+
+
 def reorder_items(new_order: list) -> None:
     """
     Will reorder the items in the save file to the new order list.
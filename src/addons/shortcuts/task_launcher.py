@@ -0,0 +1,250 @@
+"""Opens the targets of tasks (urls, files and folders) without blocking the GUI.
+
+Every target is opened on a small pool of workers, so the targets of a task open concurrently and
+launching returns at once. A target is passed to the platform opener (xdg-open, open, startfile) as one
+argument, never through a shell, so spaces and quotes in paths need no escaping. The worker waits a
+little for the opener to report an error, failures are emitted with TaskLauncher.failed.
+
+A whole group is launched from the tasks its nodes already hold: the targets are collected in one pass,
+without reading the save file, and dispatched in the configured order, optionally some time apart. The
+later targets wait on a single scheduler thread until they are due, not on the workers of the pool.
+HostPrewarmer resolves the hosts of the urls ahead of time, so the browser finds them in the resolver cache."""
+
+from __future__ import annotations
+
+import heapq
+import itertools
+import os
+import re
+import socket
+import subprocess
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Iterable
+from urllib.parse import urlsplit
+
+from PyQt5.QtCore import QObject, pyqtSignal
+
+from FileSystem import PLATFORM, open_command  # pylint: disable=import-error
+
+from . import shortcuts_save as Data
+
+
+LAUNCH_WORKERS = 4
+# seconds the opener gets to report an error. openers return once the application is started.
+LAUNCH_TIMEOUT = 10
+
+# orders of the targets of a group launch.
+TASK_ORDER = "tasks"  # the targets of each task together, the tasks in their order
+URLS_FIRST = "urls_first"
+FILES_FIRST = "files_first"
+LAUNCH_ORDERS = (TASK_ORDER, URLS_FIRST, FILES_FIRST)
+
+# settings of the shortcuts save file and their defaults.
+LAUNCH_ORDER_SETTING = "group_launch_order"
+LAUNCH_DELAY_SETTING = "group_launch_delay"  # milliseconds between two targets of a group
+PREWARM_SETTING = "prewarm_hosts"
+DEFAULT_LAUNCH_DELAY = 0
+
+PREWARM_WORKERS = 2
+# seconds a resolved host is left alone, about the time resolvers cache a record.
+PREWARM_TTL = 300
+
+_URL = re.compile(r"^[a-zA-Z][a-zA-Z0-9+.-]+://")
+
+
+def is_url(target: str) -> bool:
+    return _URL.match(target) is not None
+
+
+def task_targets(task: Data.TaskClass) -> list[str]:
+    """The urls, the file and the folder of task, in that order."""
+    return [target for target in (*task.url, task.file_path, task.directory_path) if target]
+
+
+def group_targets(tasks: Iterable[Data.TaskClass], order: str = TASK_ORDER) -> list[str]:
+    """The targets of every task in one pass, each target once. Raises ValueError for an unknown order."""
+    if order not in LAUNCH_ORDERS:
+        raise ValueError(f"unknown launch order {order!r}")
+    targets: dict[str, None] = {}
+    urls: dict[str, None] = {}
+    paths: dict[str, None] = {}
+    for task in tasks:
+        for target in task_targets(task):
+            targets[target] = None
+            (urls if is_url(target) else paths)[target] = None
+    if order == URLS_FIRST:
+        return [*urls, *paths]
+    if order == FILES_FIRST:
+        return [*paths, *urls]
+    return list(targets)
+
+
+def launch_settings() -> tuple[str, float]:
+    """The order and the delay in seconds of group launches, from the settings of the save file."""
+    try:
+        order = Data.get_setting(LAUNCH_ORDER_SETTING)
+    except Data.NotFound:
+        order = TASK_ORDER
+    try:
+        delay = Data.get_setting(LAUNCH_DELAY_SETTING)
+    except Data.NotFound:
+        delay = DEFAULT_LAUNCH_DELAY
+    try:
+        delay = max(float(delay), 0)
+    except (TypeError, ValueError):
+        delay = DEFAULT_LAUNCH_DELAY
+    return (order if order in LAUNCH_ORDERS else TASK_ORDER), delay / 1000
+
+
+def prewarm_enabled() -> bool:
+    try:
+        return bool(Data.get_setting(PREWARM_SETTING))
+    except Data.NotFound:
+        return True
+
+
+def url_host(target: str) -> str | None:
+    """The host of an http(s) url, None for anything else."""
+    if not is_url(target):
+        return None
+    url = urlsplit(target)
+    if url.scheme not in ("http", "https"):
+        return None
+    return url.hostname
+
+
+def launch_target(target: str) -> None:
+    """Opens target with its default application. Raises OSError if it can't be opened.
+    Waits for the opener, run it on a worker."""
+    if not is_url(target) and not os.path.exists(target):
+        raise FileNotFoundError(f"{target} does not exist")
+    if PLATFORM == "win32":
+        os.startfile(target)
+        return
+    process = subprocess.Popen(open_command(target), stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL,
+                               stderr=subprocess.PIPE, start_new_session=True)
+    try:
+        _, error = process.communicate(timeout=LAUNCH_TIMEOUT)
+    except subprocess.TimeoutExpired:
+        return  # the opener runs the application itself, it was started.
+    if process.returncode != 0:
+        raise OSError(error.decode(errors="replace").strip() or f"{open_command(target)[0]} exited with {process.returncode}")
+
+
+class TaskLauncher(QObject):
+    failed = pyqtSignal(str, str)
+    """Emitted with the target and the error when a target couldn't be opened."""
+
+    def __init__(self, workers: int = LAUNCH_WORKERS) -> None:
+        super().__init__()
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="task-launcher")
+        # (due time, sequence number, target, future) of the launches that are not due yet.
+        self._scheduled: list[tuple[float, int, str, Future]] = []
+        self._sequence = itertools.count()
+        self._condition = threading.Condition()
+        self._scheduler: threading.Thread | None = None
+        self._stopped = False
+
+    def launch(self, targets: Iterable[str], delay: float = 0) -> list[Future]:
+        """Opens every target concurrently and returns at once. With a delay the targets are started
+        delay seconds apart in their order, for browsers that drop tabs opened all at once."""
+        start = time.monotonic()
+        futures = []
+        for i, target in enumerate(targets):
+            if i * delay > 0:
+                futures.append(self._schedule(target, start + i * delay))
+            else:
+                futures.append(self._executor.submit(self._launch, target))
+        return futures
+
+    def launch_task(self, task: Data.TaskClass) -> list[Future]:
+        return self.launch(task_targets(task))
+
+    def launch_tasks(self, tasks: Iterable[Data.TaskClass], order: str = TASK_ORDER, delay: float = 0) -> list[Future]:
+        """Opens the targets of all tasks, see group_targets."""
+        return self.launch(group_targets(tasks, order), delay)
+
+    def _schedule(self, target: str, due: float) -> Future:
+        future = Future()
+        with self._condition:
+            if self._stopped:
+                future.cancel()
+                return future
+            heapq.heappush(self._scheduled, (due, next(self._sequence), target, future))
+            if self._scheduler is None:
+                self._scheduler = threading.Thread(target=self._run_scheduler, name="task-launch-scheduler",
+                                                   daemon=True)
+                self._scheduler.start()
+            self._condition.notify()
+        return future
+
+    def _run_scheduler(self) -> None:
+        """Submits the scheduled launches to the pool as they become due."""
+        with self._condition:
+            while not self._stopped:
+                if not self._scheduled:
+                    self._condition.wait()
+                elif (wait := self._scheduled[0][0] - time.monotonic()) > 0:
+                    self._condition.wait(wait)
+                else:
+                    _, _, target, future = heapq.heappop(self._scheduled)
+                    self._executor.submit(self._run_scheduled, target, future)
+
+    def _run_scheduled(self, target: str, future: Future) -> None:
+        if not future.set_running_or_notify_cancel():
+            return
+        try:
+            self._launch(target)
+        except BaseException as error:  # pylint: disable=broad-except
+            future.set_exception(error)
+        else:
+            future.set_result(None)
+
+    def _launch(self, target: str) -> None:
+        try:
+            launch_target(target)
+        except OSError as error:
+            self.failed.emit(target, str(error) or type(error).__name__)
+
+    def shutdown(self) -> None:
+        with self._condition:
+            self._stopped = True
+            for *_, future in self._scheduled:
+                future.cancel()
+            self._scheduled.clear()
+            self._condition.notify()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+class HostPrewarmer:
+    """Resolves the hosts of urls on a worker, so their records are in the resolver cache of the system
+    when the urls are opened. A host is resolved again only after PREWARM_TTL seconds. Only used from the
+    GUI thread."""
+
+    def __init__(self, workers: int = PREWARM_WORKERS) -> None:
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="host-prewarmer")
+        self._resolved: dict[str, float] = {}
+
+    def prewarm(self, targets: Iterable[str]) -> list[Future]:
+        now = time.monotonic()
+        hosts = {host for target in targets if (host := url_host(target))}
+        due = [host for host in hosts if now - self._resolved.get(host, -PREWARM_TTL) >= PREWARM_TTL]
+        for host in due:
+            self._resolved[host] = now
+        return [self._executor.submit(self._resolve, host) for host in due]
+
+    @staticmethod
+    def _resolve(host: str) -> None:
+        try:
+            socket.getaddrinfo(host, 443, type=socket.SOCK_STREAM)
+        except OSError:
+            pass  # the browser reports it when the url is opened.
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+task_launcher = TaskLauncher()
+host_prewarmer = HostPrewarmer()
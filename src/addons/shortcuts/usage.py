@@ -0,0 +1,126 @@
+"""Launches of tasks and their frecency.
+
+Every launch is appended to a log as a line of its timestamp and the task id, the file is never rewritten
+on a launch. The frecency of a task is the sum of its launches, each worth half as much every HALF_LIFE
+seconds. It's kept as the logarithm of that sum at time 0: a launch adds its weight once and the scores
+of the other tasks don't change, since they all decay at the same rate. A launch is O(1) and the tasks
+are ranked by the stored values as they are.
+
+Once the log is much longer than the number of tasks it is compacted to a line per task. The line has the
+time a single launch would have to be at to give the same score, and the number of launches."""
+
+from __future__ import annotations
+
+import heapq
+import math
+import os
+import time
+from typing import Container, Iterable
+
+
+LOG_PATH = os.path.join(os.path.dirname(__file__), "usage.log")
+
+HALF_LIFE = 3 * 24 * 60 * 60  # seconds
+# the log is compacted when it has more lines than this and more than twice the lines of a compacted log.
+COMPACT_LINES = 5000
+# scores decayed below this, ten half lives after a single launch, are dropped by compaction.
+MIN_SCORE = 2 ** -10
+
+
+def _log_add(a: float, b: float) -> float:
+    """log(exp(a) + exp(b)) without leaving the log domain."""
+    if a < b:
+        a, b = b, a
+    return a + math.log1p(math.exp(b - a))
+
+
+class UsageLog:
+    def __init__(self, path: str = LOG_PATH, half_life: float = HALF_LIFE,
+                 compact_lines: int = COMPACT_LINES) -> None:
+        self.path = path
+        self._rate = math.log(2) / half_life
+        self._compact_lines = compact_lines
+        # task id: log of the score at time 0
+        self._scores: dict[str, float] = {}
+        self._counts: dict[str, int] = {}
+        self._lines = 0
+        self._load()
+        if self._needs_compaction():
+            self.compact()
+
+    def _load(self) -> None:
+        try:
+            with open(self.path) as log:
+                for line in log:
+                    try:
+                        timestamp, task_id, *count = line.rstrip("\n").split("\t")
+                        self._add(task_id, float(timestamp), int(count[0]) if count else 1)
+                    except ValueError:
+                        continue  # a line cut off by a crash
+                    self._lines += 1
+        except FileNotFoundError:
+            pass
+
+    def _add(self, task_id: str, timestamp: float, count: int) -> None:
+        weight = timestamp * self._rate
+        score = self._scores.get(task_id)
+        self._scores[task_id] = weight if score is None else _log_add(score, weight)
+        self._counts[task_id] = self._counts.get(task_id, 0) + count
+
+    def record(self, task_ids: Iterable[str], timestamp: float | None = None) -> None:
+        """Records a launch of every task in task_ids, with a single append to the log."""
+        timestamp = time.time() if timestamp is None else timestamp
+        lines = []
+        for task_id in task_ids:
+            self._add(task_id, timestamp, 1)
+            lines.append(f"{timestamp:.3f}\t{task_id}\n")
+        if not lines:
+            return
+        with open(self.path, "a") as log:
+            log.writelines(lines)
+        self._lines += len(lines)
+        if self._needs_compaction():
+            self.compact()
+
+    def forget(self, task_id: str) -> None:
+        """Drops the launches of a deleted task. They leave the log with the next compaction."""
+        self._scores.pop(task_id, None)
+        self._counts.pop(task_id, None)
+
+    def score(self, task_id: str, now: float | None = None) -> float:
+        """The launches of task_id, each weighted by its age. 0 if it was never launched."""
+        if (score := self._scores.get(task_id)) is None:
+            return 0.0
+        now = time.time() if now is None else now
+        return math.exp(score - now * self._rate)
+
+    def count(self, task_id: str) -> int:
+        return self._counts.get(task_id, 0)
+
+    def ranked(self, task_ids: Iterable[str]) -> list[str]:
+        """task_ids by frecency, most used first. Tasks that were never launched keep their order at the end."""
+        scores = self._scores
+        return sorted(task_ids, key=lambda task_id: -scores.get(task_id, -math.inf))
+
+    def top(self, n: int, among: Container[str] | None = None) -> list[str]:
+        """The n tasks with the highest frecency, only those in among if it's given."""
+        candidates = self._scores if among is None else (task_id for task_id in self._scores if task_id in among)
+        return heapq.nlargest(n, candidates, key=self._scores.__getitem__)
+
+    def _needs_compaction(self) -> bool:
+        return self._lines > max(self._compact_lines, 2 * len(self._scores))
+
+    def compact(self, now: float | None = None) -> None:
+        """Rewrites the log with one line per task, without the tasks whose score has decayed away."""
+        now = time.time() if now is None else now
+        threshold = now * self._rate + math.log(MIN_SCORE)
+        for task_id in [task_id for task_id, score in self._scores.items() if score < threshold]:
+            self.forget(task_id)
+        with open(temporary_path := f"{self.path}.tmp", "w") as log:
+            log.writelines(f"{score / self._rate:.3f}\t{task_id}\t{self._counts[task_id]}\n"
+                           for task_id, score in self._scores.items())
+        os.replace(temporary_path, self.path)
+        self._lines = len(self._scores)
+
+
+usage_log = UsageLog()
@@ -0,0 +1,308 @@
+"""Download manager of the youtube downloader addon.
+
+Downloads are queued as DownloadJobs and run on a pool of worker threads, so the UI never waits for them.
+The download function reports its progress through DownloadJob.checkpoint, which is also where
+a job is paused (the worker waits there) and cancelled (DownloadCancelled is raised there).
+Before it requests the file, the download function calls DownloadJob.wait_for_host with its url, so the
+starts of the downloads from the same host are spaced out. That's the host of the stream, the watch urls
+of the jobs are all on the same host.
+checkpoint only stores the byte counts. The manager samples the running jobs PROGRESS_RATE times
+per second on the UI thread, smooths their speed and emits progress for the jobs that changed.
+State changes are emitted from the worker threads, Qt delivers them to the UI thread as queued signals."""
+
+from __future__ import annotations
+
+import itertools
+import queue
+import threading
+from time import monotonic, sleep
+from traceback import format_exc
+from typing import Callable
+from urllib.parse import urlparse
+
+from PyQt5.QtCore import QObject, QTimer, pyqtSignal
+
+
+QUEUED = "queued"
+DOWNLOADING = "downloading"
+PAUSED = "paused"
+FINISHED = "finished"
+FAILED = "failed"
+CANCELLED = "cancelled"
+
+# number of downloads that run at the same time.
+MAX_WORKERS = 3
+# progress signals per second per job.
+PROGRESS_RATE = 4
+# weight of the last sample in the smoothed speed.
+SPEED_SMOOTHING = 0.3
+# minimum seconds between the starts of two downloads from the same host.
+HOST_INTERVAL = 1.0
+
+
+class DownloadCancelled(Exception):
+    """Raised in the download function when its job is cancelled.
+    discard is False if the download is only interrupted (the app is closing) and can be resumed later."""
+
+    def __init__(self, discard: bool = True) -> None:
+        super().__init__()
+        self.discard = discard
+
+
+class HostRateLimiter:
+    """Spaces out the starts of the downloads from the same host by interval seconds."""
+
+    def __init__(self, interval: float = HOST_INTERVAL) -> None:
+        self.interval = interval
+        self._next_start: dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def wait(self, url: str) -> None:
+        """Blocks until a download from the host of url can start."""
+        host = urlparse(url).hostname or ""
+        with self._lock:
+            now = monotonic()
+            start = max(now, self._next_start.get(host, now))
+            self._next_start[host] = start + self.interval
+        if start > now:
+            sleep(start - now)
+
+
+class DownloadJob:
+    _ids = itertools.count(1)
+
+    def __init__(self, manager: DownloadManager, url: str, download_path: str,
+                 video_type: str, resolution: str) -> None:
+        self.id = next(DownloadJob._ids)
+        self.url = url
+        # the title of the video is set by the download function when it is known.
+        self.title = ""
+        self.download_path = download_path
+        self.video_type = video_type
+        self.resolution = resolution
+
+        self.state = QUEUED
+        self.downloaded = 0
+        self.total = 0
+        self.error = ""
+        # smoothed bytes per second and estimated seconds left. updated by the manager on the UI thread.
+        self.speed = 0.0
+        self.eta = -1.0
+
+        self._manager = manager
+        self._cancelled = False
+        self._discard = True
+        self._resumed = threading.Event()
+        self._resumed.set()
+        # the last sample of the manager: time, downloaded bytes.
+        self._sample = (0.0, 0)
+
+    def __repr__(self) -> str:
+        return f"DownloadJob({self.id}, {self.url}, {self.state})"
+
+    @property
+    def active(self) -> bool:
+        return self.state in (QUEUED, DOWNLOADING, PAUSED)
+
+    @property
+    def paused(self) -> bool:
+        """True if the job is paused or will be paused at its next checkpoint."""
+        return not self._resumed.is_set()
+
+    def wait_for_host(self, url: str) -> None:
+        """Called by the download function from the worker thread with the url it's about to download.
+        Blocks until a download from the host of url can start."""
+        self._manager._rate_limiter.wait(url)
+
+    def checkpoint(self, downloaded: int, total: int) -> None:
+        """Called by the download function from the worker thread with the downloaded and total bytes.
+        Raises DownloadCancelled if the job is cancelled, blocks while the job is paused."""
+        self.downloaded, self.total = downloaded, total
+        if not self._resumed.is_set():
+            self._manager._set_state(self, PAUSED)
+            self._resumed.wait()
+            if not self._cancelled:
+                self._manager._set_state(self, DOWNLOADING)
+        if self._cancelled:
+            raise DownloadCancelled(self._discard)
+
+
+class DownloadManager(QObject):
+    progress = pyqtSignal(int, int, int)
+    """This signal is emitted with the job id, downloaded bytes and total bytes, at most PROGRESS_RATE times
+    per second per job. the speed and the eta are in job.speed and job.eta."""
+
+    state_changed = pyqtSignal(int, str)
+    """This signal is emitted with the job id and the new state of the job."""
+
+    def __init__(self, download_function: Callable[[DownloadJob], None], max_workers: int = MAX_WORKERS,
+                 rate_limiter: HostRateLimiter | None = None, progress_rate: float = PROGRESS_RATE) -> None:
+        """download_function downloads the given job and calls job.checkpoint while downloading.
+        It raises an exception if the download fails."""
+        super().__init__()
+        # jobs that are downloading or paused. sampled by the progress timer.
+        self._running_jobs: dict[int, DownloadJob] = {}
+        self._progress_timer = QTimer(self)
+        self._progress_timer.setInterval(int(1000 / progress_rate))
+        self._progress_timer.timeout.connect(self._sample_progress)
+        self.state_changed.connect(self._on_state_changed)
+        self._download_function = download_function
+        self._rate_limiter = rate_limiter or HostRateLimiter()
+        self._jobs: dict[int, DownloadJob] = {}
+        self._queue: queue.Queue[DownloadJob | None] = queue.Queue()
+        self._lock = threading.Lock()
+        # a worker takes a job from the queue and waits here until less than max_workers jobs are running.
+        self._slots = threading.Condition()
+        self._running = 0
+        self._max_workers = 0
+        self._workers: list[threading.Thread] = []
+        self.set_max_workers(max_workers)
+
+    @property
+    def max_workers(self) -> int:
+        return self._max_workers
+
+    def set_max_workers(self, max_workers: int) -> None:
+        """Changes the number of downloads that run at the same time. running downloads are not stopped."""
+        with self._slots:
+            self._max_workers = max(max_workers, 1)
+            while len(self._workers) < self._max_workers:
+                worker = threading.Thread(target=self._run, name=f"youtube-downloader-{len(self._workers)}", daemon=True)
+                self._workers.append(worker)
+                worker.start()
+            self._slots.notify_all()
+
+    def add(self, url: str, download_path: str, video_type: str, resolution: str) -> DownloadJob:
+        """Queues a new download and returns its job."""
+        job = DownloadJob(self, url, download_path, video_type, resolution)
+        self._jobs[job.id] = job
+        self._queue.put(job)
+        self.state_changed.emit(job.id, QUEUED)
+        return job
+
+    def add_failed(self, url: str, error: str) -> DownloadJob:
+        """Adds a job that failed before it could be queued, like a playlist that couldn't be fetched,
+        so the error is shown with the other failed downloads."""
+        job = DownloadJob(self, url, "", "", "")
+        job.error = error
+        self._jobs[job.id] = job
+        self._set_state(job, FAILED)
+        return job
+
+    def job(self, job_id: int) -> DownloadJob | None:
+        return self._jobs.get(job_id)
+
+    def remove(self, job_id: int) -> None:
+        """Forgets a job that is not active anymore."""
+        if (job := self._jobs.get(job_id)) is not None and not job.active:
+            del self._jobs[job_id]
+
+    def cancel(self, job_id: int, discard: bool = True) -> None:
+        """Cancels the job. the partially downloaded file is kept for resuming if discard is False."""
+        if (job := self._jobs.get(job_id)) is None or not job.active:
+            return
+        job._cancelled = True
+        job._discard = discard
+        job._resumed.set()
+        with self._lock:
+            # a queued job is dropped by the worker that takes it.
+            if job.state == QUEUED:
+                self._set_state(job, CANCELLED)
+
+    def pause(self, job_id: int) -> None:
+        """Pauses the job at its next checkpoint. a queued job is paused as soon as it starts."""
+        if (job := self._jobs.get(job_id)) is not None and job.active:
+            job._resumed.clear()
+
+    def resume(self, job_id: int) -> None:
+        if (job := self._jobs.get(job_id)) is not None:
+            job._resumed.set()
+
+    def shutdown(self) -> None:
+        """Interrupts every download and stops the workers. the interrupted downloads can be resumed later."""
+        for job_id in list(self._jobs):
+            self.cancel(job_id, discard=False)
+        for _ in self._workers:
+            self._queue.put(None)
+
+    def _on_state_changed(self, job_id: int, state: str) -> None:
+        # called on the UI thread, the timer can only be started here.
+        # the signals are handled in order, the state of the job may be newer than state.
+        if (job := self._jobs.get(job_id)) is None:
+            return
+        if state in (DOWNLOADING, PAUSED):
+            if job_id not in self._running_jobs:
+                job._sample = (monotonic(), job.downloaded)
+                self._running_jobs[job_id] = job
+                self._progress_timer.start()
+        elif state != QUEUED:
+            self._running_jobs.pop(job_id, None)
+            # the last progress of the job
+            self.progress.emit(job.id, job.downloaded, job.total)
+            if not self._running_jobs:
+                self._progress_timer.stop()
+
+    def _sample_progress(self) -> None:
+        now = monotonic()
+        for job in self._running_jobs.values():
+            last_time, last_downloaded = job._sample
+            downloaded = job.downloaded
+            if now <= last_time:
+                continue
+            job._sample = (now, downloaded)
+            current_speed = max(downloaded - last_downloaded, 0) / (now - last_time)
+            job.speed = current_speed if job.speed == 0 else \
+                SPEED_SMOOTHING * current_speed + (1 - SPEED_SMOOTHING) * job.speed
+            job.eta = (job.total - downloaded) / job.speed if job.speed > 0 and job.total else -1.0
+            if downloaded != last_downloaded:
+                self.progress.emit(job.id, downloaded, job.total)
+
+    def _set_state(self, job: DownloadJob, state: str) -> None:
+        job.state = state
+        self.state_changed.emit(job.id, state)
+
+    def _run(self) -> None:
+        while (job := self._queue.get()) is not None:
+            with self._slots:
+                self._slots.wait_for(lambda: self._running < self._max_workers)
+                self._running += 1
+            try:
+                self._run_job(job)
+            finally:
+                with self._slots:
+                    self._running -= 1
+                    self._slots.notify_all()
+
+    def _run_job(self, job: DownloadJob) -> None:
+        if job._cancelled:
+            return
+        with self._lock:
+            if job._cancelled:
+                return
+            self._set_state(job, DOWNLOADING)
+        try:
+            self._download_function(job)
+        except DownloadCancelled:
+            self._set_state(job, CANCELLED)
+        except Exception as err:  # pylint: disable=broad-except
+            print(f"Error downloading video: {err}\n{format_exc()}")
+            job.error = str(err)
+            self._set_state(job, FAILED)
+        else:
+            self._set_state(job, FINISHED)
+
+
+def format_speed(speed: float) -> str:
+    for unit in ("B/s", "KB/s", "MB/s"):
+        if speed < 1024:
+            return f"{speed:.0f} {unit}" if unit == "B/s" else f"{speed:.1f} {unit}"
+        speed /= 1024
+    return f"{speed:.1f} GB/s"
+
+
+def format_eta(eta: float) -> str:
+    if eta < 0:
+        return "--:--"
+    minutes, seconds = divmod(int(eta), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}:{minutes:02}:{seconds:02}" if hours else f"{minutes}:{seconds:02}"
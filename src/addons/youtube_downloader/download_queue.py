@@ -0,0 +1,181 @@
+"""Batch queue of the youtube downloader addon.
+
+URLs pasted as a list, playlists and text files of URLs are added to the download manager as jobs.
+DownloadQueueModel shows the jobs in a QListView, which only creates the rows on the screen,
+so hundreds of queued videos cost one row of data each instead of a widget each.
+The unfinished jobs are saved to a json file and queued again when the addon starts."""
+
+from __future__ import annotations
+
+import json
+import os
+import re
+from typing import Any
+
+from PyQt5.QtCore import QAbstractListModel, QModelIndex, QTimer, Qt
+
+from addons.youtube_downloader.download_manager import (  # pylint: disable=import-error
+    DownloadManager,
+    DownloadJob,
+    QUEUED,
+    DOWNLOADING,
+    PAUSED,
+    FAILED,
+    format_speed,
+    format_eta,
+)
+
+
+QUEUE_FILE = os.path.join(os.path.dirname(__file__), "queue.json")
+# milliseconds to wait before saving the queue after a change.
+SAVE_DELAY = 1000
+
+_URL_PATTERN = re.compile(r"https?://\S+")
+
+
+def parse_urls(text: str) -> list[str]:
+    """Returns the urls in text in order, without duplicates. urls can be separated by any whitespace or commas."""
+    return list(dict.fromkeys(url.rstrip(",;") for url in _URL_PATTERN.findall(text)))
+
+
+def is_playlist_url(url: str) -> bool:
+    return "list=" in url and "watch?v=" not in url
+
+
+def expand_playlist(url: str) -> list[str]:
+    """Returns the video urls of a playlist. This function fetches the playlist, don't call it on the UI thread."""
+    from pytube import Playlist  # pylint: disable=import-outside-toplevel
+    return list(Playlist(url).video_urls)
+
+
+def load_queue(path: str = QUEUE_FILE) -> dict[str, Any]:
+    """Returns the saved queue: {"concurrency": int | None, "jobs": [job dicts]}."""
+    try:
+        with open(path, "r") as file:
+            data = json.load(file)
+        return {"concurrency": data.get("concurrency"), "jobs": list(data.get("jobs", []))}
+    except (OSError, ValueError, AttributeError):
+        return {"concurrency": None, "jobs": []}
+
+
+def save_queue(jobs: list[DownloadJob], concurrency: int, path: str = QUEUE_FILE) -> None:
+    data = {
+        "concurrency": concurrency,
+        "jobs": [
+            {
+                "url": job.url,
+                "title": job.title,
+                "download_path": job.download_path,
+                "video_type": job.video_type,
+                "resolution": job.resolution,
+            }
+            # a playlist that couldn't be fetched is only reported, it's not queued again.
+            for job in jobs if job.active or (job.state == FAILED and not is_playlist_url(job.url))
+        ],
+    }
+    temp_path = path + ".tmp"
+    with open(temp_path, "w") as file:
+        json.dump(data, file)
+    os.replace(temp_path, path)
+
+
+class DownloadQueueModel(QAbstractListModel):
+    JobIdRole = Qt.ItemDataRole.UserRole
+
+    def __init__(self, manager: DownloadManager, path: str = QUEUE_FILE) -> None:
+        super().__init__()
+        self._manager = manager
+        self._path = path
+        self._job_ids: list[int] = []
+        self._rows: dict[int, int] = {}
+
+        manager.state_changed.connect(self._on_job_changed)
+        manager.progress.connect(self._on_job_changed)
+
+        self._save_timer = QTimer(self)
+        self._save_timer.setSingleShot(True)
+        self._save_timer.setInterval(SAVE_DELAY)
+        self._save_timer.timeout.connect(self.save)
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:  # pylint: disable=invalid-name
+        return 0 if parent.isValid() else len(self._job_ids)
+
+    def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole) -> Any:
+        if not index.isValid() or (job := self._manager.job(self._job_ids[index.row()])) is None:
+            return None
+        if role == Qt.ItemDataRole.DisplayRole:
+            return f"{job.title or job.url}  —  {self._status(job)}"
+        if role == Qt.ItemDataRole.ToolTipRole:
+            return job.error or job.url
+        if role == self.JobIdRole:
+            return job.id
+        return None
+
+    @staticmethod
+    def _status(job: DownloadJob) -> str:
+        if job.state == DOWNLOADING and job.total:
+            return (f"{job.downloaded * 100 // job.total}%  {format_speed(job.speed)}"
+                    f"  {format_eta(job.eta)} left")
+        if job.state == PAUSED and job.total:
+            return f"{job.state} {job.downloaded * 100 // job.total}%"
+        return job.state
+
+    def jobs(self) -> list[DownloadJob]:
+        return [job for job_id in self._job_ids if (job := self._manager.job(job_id)) is not None]
+
+    def add_urls(self, urls: list[str], download_path: str, video_type: str, resolution: str) -> None:
+        self.add_jobs([{"url": url, "download_path": download_path, "video_type": video_type,
+                        "resolution": resolution} for url in urls])
+
+    def add_jobs(self, jobs: list[dict[str, str]]) -> None:
+        """Queues jobs given as the dicts of the queue file. the rows are inserted at once."""
+        if not jobs:
+            return
+        first = len(self._job_ids)
+        self.beginInsertRows(QModelIndex(), first, first + len(jobs) - 1)
+        for job_data in jobs:
+            job = self._manager.add(job_data["url"], job_data["download_path"],
+                                    job_data["video_type"], job_data["resolution"])
+            job.title = job_data.get("title", "")
+            self._rows[job.id] = len(self._job_ids)
+            self._job_ids.append(job.id)
+        self.endInsertRows()
+        self._save_timer.start()
+
+    def add_failed(self, url: str, error: str) -> None:
+        """Adds a row for url that failed before it could be queued, with its error."""
+        row = len(self._job_ids)
+        self.beginInsertRows(QModelIndex(), row, row)
+        job = self._manager.add_failed(url, error)
+        self._rows[job.id] = row
+        self._job_ids.append(job.id)
+        self.endInsertRows()
+
+    def load(self) -> int | None:
+        """Queues the jobs of the queue file again. Returns the saved concurrency."""
+        data = load_queue(self._path)
+        self.add_jobs(data["jobs"])
+        return data["concurrency"]
+
+    def clear_inactive(self) -> None:
+        """Removes the finished, failed and cancelled jobs."""
+        self.beginResetModel()
+        for job in self.jobs():
+            if not job.active:
+                self._manager.remove(job.id)
+        self._job_ids = [job_id for job_id in self._job_ids if self._manager.job(job_id) is not None]
+        self._rows = {job_id: row for row, job_id in enumerate(self._job_ids)}
+        self.endResetModel()
+        self._save_timer.start()
+
+    def save(self) -> None:
+        self._save_timer.stop()
+        save_queue(self.jobs(), self._manager.max_workers, self._path)
+
+    def _on_job_changed(self, job_id: int, *args) -> None:
+        if (row := self._rows.get(job_id)) is None:
+            return
+        index = self.index(row)
+        self.dataChanged.emit(index, index, [Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.ToolTipRole])
+        if args and isinstance(args[0], str) and args[0] != QUEUED:  # state changes are saved
+            self._save_timer.start()
@@ -0,0 +1,164 @@
+"""Muxing of adaptive youtube streams with ffmpeg.
+
+Youtube serves the high resolutions as adaptive streams: a video only stream and an audio only stream.
+mux_streams downloads both at the same time and writes them straight into the pipes of a local ffmpeg,
+which copies them into the target container without encoding. Nothing but the muxed file is written to the disk.
+The video goes to the stdin of ffmpeg. On POSIX the audio goes through a second pipe that ffmpeg reads
+as pipe:<fd>. Windows can't pass a second pipe to ffmpeg, so there the audio, which is a small part
+of the download, is downloaded to a temporary file first."""
+
+from __future__ import annotations
+
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+from typing import IO, Callable
+
+import requests
+
+from addons.youtube_downloader.ranged_download import HEADERS, READ_SIZE, TIMEOUT  # pylint: disable=import-error
+
+
+PART_SUFFIX = ".part"
+# ffmpeg output formats of the video types.
+CONTAINERS = {"mp4": "mp4", "webm": "webm"}
+
+
+class FFmpegError(Exception):
+    """Raised when ffmpeg is not installed or fails to mux the streams."""
+
+
+def find_ffmpeg() -> str | None:
+    """Returns the path of the ffmpeg executable, or None if ffmpeg is not installed."""
+    return shutil.which("ffmpeg")
+
+
+def mux_streams(video_url: str, audio_url: str, path: str, container: str = "mp4",
+                progress: Callable[[int, int], None] | None = None, ffmpeg: str | None = None) -> None:
+    """Downloads a video stream and an audio stream and muxes them into path.
+
+    Args:
+        video_url (str): URL of the video only stream
+        audio_url (str): URL of the audio only stream
+        path (str): Path to save the muxed file
+        container (str): Video type of the file (mp4, webm)
+        progress (Callable): Called with the downloaded bytes of both streams and their total size.
+            an exception raised by it stops the download and is raised again, the partial file is removed.
+        ffmpeg (str): Path of the ffmpeg executable, found on PATH if it is None
+
+    Raises:
+        FFmpegError: if ffmpeg is not installed or fails.
+    """
+    if (ffmpeg := ffmpeg or find_ffmpeg()) is None or shutil.which(ffmpeg) is None:
+        raise FFmpegError("ffmpeg is needed to download this resolution, install it and add it to PATH")
+    part_path = path + PART_SUFFIX
+    audio_file = None
+    try:
+        if sys.platform == "win32":
+            audio_file = _download_to_temp(audio_url)
+            _mux(ffmpeg, [video_url], audio_file, part_path, container, progress)
+        else:
+            _mux(ffmpeg, [video_url, audio_url], None, part_path, container, progress)
+        os.replace(part_path, path)
+    except BaseException:
+        if os.path.exists(part_path):
+            os.remove(part_path)
+        raise
+    finally:
+        if audio_file is not None:
+            os.remove(audio_file)
+
+
+def _mux(ffmpeg: str, urls: list[str], audio_file: str | None, part_path: str, container: str,
+         progress: Callable[[int, int], None] | None) -> None:
+    """Streams urls into ffmpeg. the first url is written to stdin, the others to extra pipes."""
+    responses = [requests.get(url, headers=HEADERS, stream=True, timeout=TIMEOUT) for url in urls]
+    extra_pipes = [os.pipe() for _ in urls[1:]]
+    try:
+        for response in responses:
+            response.raise_for_status()
+        total = sum(int(response.headers.get("Content-Length", 0)) for response in responses)
+
+        inputs = ["pipe:0"] + [f"pipe:{read_fd}" for read_fd, _ in extra_pipes]
+        if audio_file is not None:
+            inputs.append(audio_file)
+        command = [ffmpeg, "-hide_banner", "-loglevel", "error", "-y"]
+        for source in inputs:
+            command += ["-i", source]
+        command += ["-map", "0:v:0", "-map", "1:a:0", "-c", "copy", "-f", CONTAINERS.get(container, container),
+                    part_path]
+        process = subprocess.Popen(command, stdin=subprocess.PIPE, stdout=subprocess.DEVNULL,
+                                   stderr=subprocess.PIPE, pass_fds=[read_fd for read_fd, _ in extra_pipes])
+    except BaseException:
+        for response in responses:
+            response.close()
+        for read_fd, write_fd in extra_pipes:
+            os.close(read_fd)
+            os.close(write_fd)
+        raise
+
+    # the read ends belong to ffmpeg now.
+    for read_fd, _ in extra_pipes:
+        os.close(read_fd)
+    pipes: list[IO[bytes]] = [process.stdin] + [os.fdopen(write_fd, "wb") for _, write_fd in extra_pipes]
+
+    lock = threading.Lock()
+    stop = threading.Event()
+    errors: list[BaseException] = []
+    downloaded = 0
+
+    def report(byte_count: int) -> None:
+        nonlocal downloaded
+        # called under the lock, so a progress that blocks (paused download) blocks both streams.
+        with lock:
+            downloaded += byte_count
+            if progress is not None:
+                progress(downloaded, total)
+
+    def feed(response: requests.Response, pipe: IO[bytes]) -> None:
+        try:
+            with response, pipe:
+                for chunk in response.iter_content(READ_SIZE):
+                    if stop.is_set():
+                        return
+                    pipe.write(chunk)
+                    report(len(chunk))
+        except BrokenPipeError:
+            pass  # ffmpeg exited, its error is raised below.
+        except BaseException as err:  # pylint: disable=broad-except
+            errors.append(err)
+            stop.set()
+            process.kill()
+
+    threads = [threading.Thread(target=feed, args=(response, pipe), name=f"youtube-mux-{i}", daemon=True)
+               for i, (response, pipe) in enumerate(zip(responses, pipes))]
+    for thread in threads:
+        thread.start()
+    # ffmpeg only writes errors, reading them until it exits can't fill the pipe.
+    stderr = process.stderr.read()
+    process.wait()
+    process.stderr.close()
+    stop.set()
+    for thread in threads:
+        thread.join()
+    if errors:
+        raise errors[0]
+    if process.returncode != 0:
+        raise FFmpegError(f"ffmpeg failed: {stderr.decode(errors='replace').strip()}")
+
+
+def _download_to_temp(url: str) -> str:
+    file_descriptor, temp_path = tempfile.mkstemp(prefix="youtube-audio-")
+    try:
+        with requests.get(url, headers=HEADERS, stream=True, timeout=TIMEOUT) as response, \
+                os.fdopen(file_descriptor, "wb") as file:
+            response.raise_for_status()
+            for chunk in response.iter_content(READ_SIZE):
+                file.write(chunk)
+    except BaseException:
+        os.remove(temp_path)
+        raise
+    return temp_path
@@ -0,0 +1,182 @@
+"""Resumable, multi connection downloads over HTTP range requests.
+
+The file is split into segments of SEGMENT_SIZE bytes. Segments are requested in parallel with
+Range headers and written at their offsets into a preallocated <file>.part. A sidecar <file>.part.json
+keeps the finished segments, so an interrupted download continues from where it stopped.
+When every segment is downloaded, the .part file is renamed to the file and the sidecar is removed."""
+
+from __future__ import annotations
+
+import json
+import os
+import queue
+import threading
+from typing import Callable
+
+import requests
+
+
+# bytes of a segment. at most one segment per connection is downloaded again after an interruption.
+SEGMENT_SIZE = 2 << 20
+CONNECTIONS = 4
+READ_SIZE = 64 << 10
+# seconds
+TIMEOUT = 30
+
+PART_SUFFIX = ".part"
+STATE_SUFFIX = ".part.json"
+
+HEADERS = {"User-Agent": "Mozilla/5.0", "accept-language": "en-US,en"}
+
+
+def download_file(url: str, path: str, key: str | None = None, connections: int = CONNECTIONS,
+                  progress: Callable[[int, int], None] | None = None) -> None:
+    """Downloads url to path. Resumes the download if it was interrupted before.
+
+    Args:
+        url (str): URL of the file
+        path (str): Path to save the file
+        key (str): Identifies the file to resume. the url is used if it is None.
+            useful when the url changes between the tries (youtube stream urls expire).
+        connections (int): Maximum number of parallel requests
+        progress (Callable): Called with the downloaded bytes and the size of the file.
+            an exception raised by it stops the download, the downloaded segments are kept.
+    """
+    part_path, state_path = path + PART_SUFFIX, path + STATE_SUFFIX
+    key = key or url
+
+    with requests.get(url, headers={**HEADERS, "Range": "bytes=0-0"}, stream=True, timeout=TIMEOUT) as response:
+        response.raise_for_status()
+        if response.status_code != 206 or "Content-Range" not in response.headers:
+            size = int(response.headers.get("Content-Length", 0))
+            ranges = False
+        else:
+            size = int(response.headers["Content-Range"].rsplit("/", 1)[1])
+            ranges = True
+
+    if not ranges:
+        # the server doesn't support ranges, the file is downloaded with a single request.
+        discard_partial(path)
+        _download_whole(url, part_path, progress)
+        os.replace(part_path, path)
+        return
+
+    done = _load_state(state_path, key, size) if os.path.exists(part_path) else set()
+    # preallocate the file, so every segment can be written at its offset.
+    with open(part_path, "r+b" if os.path.exists(part_path) else "w+b") as file:
+        if os.fstat(file.fileno()).st_size != size:
+            file.truncate(size)
+
+    segment_count = (size + SEGMENT_SIZE - 1) // SEGMENT_SIZE
+    segments: queue.Queue[int] = queue.Queue()
+    for segment in range(segment_count):
+        if segment not in done:
+            segments.put(segment)
+
+    lock = threading.Lock()
+    stop = threading.Event()
+    errors: list[BaseException] = []
+    downloaded = sum(min(SEGMENT_SIZE, size - segment * SEGMENT_SIZE) for segment in done)
+    if progress is not None:
+        progress(downloaded, size)
+
+    def report(byte_count: int) -> None:
+        nonlocal downloaded
+        # progress is called under the lock, so a progress that blocks (paused download) blocks every connection.
+        with lock:
+            downloaded += byte_count
+            if progress is not None:
+                progress(downloaded, size)
+
+    def finish_segment(segment: int) -> None:
+        with lock:
+            done.add(segment)
+            _save_state(state_path, key, size, done)
+
+    def worker() -> None:
+        try:
+            with requests.Session() as session, open(part_path, "r+b") as file:
+                while not stop.is_set():
+                    try:
+                        segment = segments.get_nowait()
+                    except queue.Empty:
+                        return
+                    _download_segment(session, url, file, segment, size, report, stop)
+                    if not stop.is_set():
+                        finish_segment(segment)
+        except BaseException as err:  # pylint: disable=broad-except
+            errors.append(err)
+            stop.set()
+
+    threads = [threading.Thread(target=worker, name=f"ranged-download-{i}", daemon=True)
+               for i in range(min(connections, segments.qsize()))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    if errors:
+        raise errors[0]
+
+    os.replace(part_path, path)
+    if os.path.exists(state_path):
+        os.remove(state_path)
+
+
+def discard_partial(path: str) -> None:
+    """Removes the partially downloaded file and the state of the download of path."""
+    for partial_path in (path + PART_SUFFIX, path + STATE_SUFFIX):
+        if os.path.exists(partial_path):
+            os.remove(partial_path)
+
+
+def _download_segment(session: requests.Session, url: str, file, segment: int, size: int,
+                      report: Callable[[int], None], stop: threading.Event) -> None:
+    start = segment * SEGMENT_SIZE
+    end = min(start + SEGMENT_SIZE, size) - 1
+    headers = {**HEADERS, "Range": f"bytes={start}-{end}"}
+    with session.get(url, headers=headers, stream=True, timeout=TIMEOUT) as response:
+        response.raise_for_status()
+        if response.status_code != 206:
+            raise IOError(f"Server ignored the range of segment {segment}")
+        file.seek(start)
+        received = 0
+        for chunk in response.iter_content(READ_SIZE):
+            if stop.is_set():
+                return
+            file.write(chunk)
+            received += len(chunk)
+            report(len(chunk))
+        file.flush()
+    if received != end - start + 1:
+        raise IOError(f"Segment {segment} is incomplete: {received} of {end - start + 1} bytes")
+
+
+def _download_whole(url: str, path: str, progress: Callable[[int, int], None] | None) -> None:
+    with requests.get(url, headers=HEADERS, stream=True, timeout=TIMEOUT) as response, open(path, "wb") as file:
+        response.raise_for_status()
+        size = int(response.headers.get("Content-Length", 0))
+        downloaded = 0
+        for chunk in response.iter_content(READ_SIZE):
+            file.write(chunk)
+            downloaded += len(chunk)
+            if progress is not None:
+                progress(downloaded, size)
+
+
+def _load_state(state_path: str, key: str, size: int) -> set[int]:
+    """Returns the finished segments of the download. Returns an empty set if the state is of another file."""
+    try:
+        with open(state_path, "r") as file:
+            state = json.load(file)
+        if state["key"] == key and state["size"] == size and state["segment_size"] == SEGMENT_SIZE:
+            return set(state["done"])
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+    return set()
+
+
+def _save_state(state_path: str, key: str, size: int, done: set[int]) -> None:
+    temp_path = state_path + ".tmp"
+    with open(temp_path, "w") as file:
+        json.dump({"key": key, "size": size, "segment_size": SEGMENT_SIZE, "done": sorted(done)}, file)
+    os.replace(temp_path, state_path)
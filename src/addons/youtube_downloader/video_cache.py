@@ -0,0 +1,104 @@
+"""Cache of youtube video metadata and stream manifests.
+
+Fetching the manifest of a video is the slow part of showing the settings dialog and of starting a download.
+VideoCache keeps the fetched YouTube objects by video id for TTL seconds, so one fetch serves the
+settings dialog, the file name, the file size and the download. A video that is being fetched is not fetched
+again, the callers wait for the running fetch. prefetch starts the fetch in the background, for example
+as soon as a URL is pasted, and fetch returns the future of it for callers that can't block, like the UI."""
+
+from __future__ import annotations
+
+import ssl
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from time import monotonic
+from typing import Callable
+
+from pytube import YouTube
+from pytube.exceptions import RegexMatchError
+from pytube.extract import video_id as extract_video_id
+
+
+# seconds. stream urls of youtube expire after a few hours.
+TTL = 30 * 60
+MAX_ENTRIES = 64
+
+
+def _fetch(video_id: str) -> YouTube:
+    ssl._create_default_https_context = ssl._create_stdlib_context  # pylint: disable=protected-access
+    yt_downloader = YouTube(f"https://www.youtube.com/watch?v={video_id}")
+    yt_downloader.streams  # fetches the manifest, pytube keeps the streams in the object
+    return yt_downloader
+
+
+def get_video_id(url: str) -> str | None:
+    """Returns the video id of a youtube url. Returns None if url is not a youtube video url."""
+    try:
+        return extract_video_id(url.strip())
+    except RegexMatchError:
+        return None
+
+
+class VideoCache:
+    def __init__(self, fetch: Callable[[str], YouTube] = _fetch, ttl: float = TTL,
+                 max_entries: int = MAX_ENTRIES) -> None:
+        self._fetch = fetch
+        self._ttl = ttl
+        self._max_entries = max_entries
+        # video id: (fetch time, future of the YouTube object). the most recently used is the last.
+        self._entries: OrderedDict[str, tuple[float, Future]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="youtube-prefetch")
+
+    def get(self, url: str) -> YouTube:
+        """Returns the YouTube object of the video with its streams fetched.
+        Raises ValueError if url is not a youtube video url, or the error of the fetch."""
+        return self._future(url).result()
+
+    def fetch(self, url: str) -> Future:
+        """Returns the future of the YouTube object, fetched in the background if it's not cached.
+        Raises ValueError if url is not a youtube video url."""
+        return self._future(url, background=True)
+
+    def prefetch(self, url: str) -> None:
+        """Fetches the video in the background. Does nothing if url is not a youtube video url."""
+        if get_video_id(url) is not None:
+            self._future(url, background=True)
+
+    def invalidate(self, url: str) -> None:
+        if (video_id := get_video_id(url)) is not None:
+            with self._lock:
+                self._entries.pop(video_id, None)
+
+    def _future(self, url: str, background: bool = False) -> Future:
+        if (video_id := get_video_id(url)) is None:
+            raise ValueError(f"Not a youtube video url: {url}")
+
+        with self._lock:
+            if (entry := self._entries.get(video_id)) is not None:
+                fetch_time, future = entry
+                failed = future.done() and future.exception() is not None
+                if not failed and monotonic() - fetch_time < self._ttl:
+                    self._entries.move_to_end(video_id)
+                    return future
+
+            if background:
+                future = self._executor.submit(self._fetch, video_id)
+            else:
+                future = Future()
+            self._entries[video_id] = (monotonic(), future)
+            self._entries.move_to_end(video_id)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+        if not background:
+            # fetched on the calling thread, other callers wait for this future.
+            try:
+                future.set_result(self._fetch(video_id))
+            except Exception as err:  # pylint: disable=broad-except
+                future.set_exception(err)
+        return future
+
+
+video_cache = VideoCache()
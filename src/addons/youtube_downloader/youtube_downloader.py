@@ -4,15 +4,12 @@ import os
 import sys
 
 import json
+import threading
 from pynput import keyboard
 
 from traceback import format_exc
 
-from typing import Optional
-
-import ssl
-
-from pytube import YouTube
+from typing import Callable, Optional
 
 from PyQt5.QtWidgets import (
     QProgressBar,
@@ -25,13 +22,16 @@ from PyQt5.QtWidgets import (
     QComboBox,
     QWidget,
     QLabel,
+    QListView,
+    QPlainTextEdit,
+    QSpinBox,
 )
 
-from PyQt5.QtCore import Qt, QPointF, pyqtSignal
-from PyQt5.QtGui import QPainter, QLinearGradient, QKeySequence
+from PyQt5.QtCore import Qt, QPointF, QRect, QTimer, pyqtSignal
+from PyQt5.QtGui import QPainter, QLinearGradient, QKeySequence, QPixmap
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
-from settings import UI_SCALE  # pylint: disable=import-error
+from settings import ui_scale, apply_ui_scale as scaled  # pylint: disable=import-error
 from ui.utils import get_font  # pylint: disable=import-error
 from ui.entry_box import Entry  # pylint: disable=import-error
 from ui.base_window import BaseWindow  # pylint: disable=import-error
@@ -39,6 +39,30 @@ from ui.dialog import ConfirmationDialog, BaseDialog  # pylint: disable=import-e
 from ui.custom_button import RedButton, GrnButton, YelButton, TextButton  # pylint: disable=import-error
 
 from addon import AddOnBase
+from addons.youtube_downloader.download_manager import (  # pylint: disable=import-error
+    DownloadManager,
+    DownloadCancelled,
+    DownloadJob,
+    DOWNLOADING,
+    FINISHED,
+    FAILED,
+    CANCELLED,
+    format_speed,
+    format_eta,
+)
+from addons.youtube_downloader.ranged_download import download_file, discard_partial  # pylint: disable=import-error
+from addons.youtube_downloader.video_cache import video_cache  # pylint: disable=import-error
+from addons.youtube_downloader.mux import mux_streams, find_ffmpeg  # pylint: disable=import-error
+from addons.youtube_downloader.download_queue import (  # pylint: disable=import-error
+    DownloadQueueModel,
+    parse_urls,
+    is_playlist_url,
+    expand_playlist,
+)
+
+DEFAULT_DOWNLOAD_PATH = os.path.join(os.path.expanduser("~"), "Downloads")
+# resolution of the batch downloads: the highest resolution that can be downloaded with audio.
+HIGHEST = "highest"
 
 class RoundedProgressBar(QProgressBar):
     def __init__(self, parent=None):
@@ -60,19 +84,37 @@ class RoundedProgressBar(QProgressBar):
 
         """)
 
-    def paintEvent(self, event):
-        painter = QPainter(self)
-        painter.setRenderHint(QPainter.Antialiasing)
+        # the rendered bar is cached until the size or the filled width changes.
+        self._cache: QPixmap | None = None
+        self._cache_key: tuple | None = None
 
+    def paintEvent(self, event):
         # Draw the background
         bg_rect = self.rect().adjusted(1, 1, -1, -1)
 
-        # remove border
-        painter.setPen(Qt.NoPen)
-
         # Draw the progress bar
         progress_rect = bg_rect.adjusted(0, 0, -int(bg_rect.width() * (1 - self.value() / self.maximum())), 0)
 
+        key = (self.width(), self.height(), progress_rect.width(), self.devicePixelRatioF())
+        if key != self._cache_key:
+            self._cache = self._render(progress_rect)
+            self._cache_key = key
+
+        painter = QPainter(self)
+        painter.drawPixmap(0, 0, self._cache)
+
+    def _render(self, progress_rect: QRect) -> QPixmap:
+        ratio = self.devicePixelRatioF()
+        pixmap = QPixmap(self.size() * ratio)
+        pixmap.setDevicePixelRatio(ratio)
+        pixmap.fill(Qt.transparent)
+
+        painter = QPainter(pixmap)
+        painter.setRenderHint(QPainter.Antialiasing)
+
+        # remove border
+        painter.setPen(Qt.NoPen)
+
         # Create the gradient
         gradient = QLinearGradient(QPointF(progress_rect.left(), progress_rect.top()), QPointF(progress_rect.right(), progress_rect.top()))
         gradient.setColorAt(0, Qt.red)
@@ -81,6 +123,8 @@ class RoundedProgressBar(QProgressBar):
 
         painter.setBrush(gradient)
         painter.drawRoundedRect(progress_rect, 10, 10)
+        painter.end()
+        return pixmap
 
     def minimumSizeHint(self):
         return self.sizeHint()
@@ -101,74 +145,118 @@ def get_available_videos(url: str, progress: pyqtSignal = None) -> dict:
     """
 
     try:
-        ssl._create_default_https_context = ssl._create_stdlib_context  # pylint: disable=protected-access
-        yt_downloader = YouTube(url)
-
-        available_videos = {}
-        for stream in yt_downloader.streams:
-            video_type = stream.mime_type.split('/')[1]
-            if video_type not in available_videos:
-                available_videos[video_type] = []
-            available_videos[video_type].append(stream.resolution)
-
-        # remove duplicatesfrom the list of resolutions
-        for video_type in available_videos:
-            available_videos[video_type] = list(set(available_videos[video_type]))
-            available_videos[video_type].sort(key=lambda x: int(x[:-1]) if x else 0)
-        return available_videos
+        return _available_videos(video_cache.get(url))
     except Exception as err:
         print(f"Error getting available videos: {err}\n{format_exc()}")
         return {}
 
+def _available_videos(yt_downloader) -> dict:
+    # video only streams have no audio without ffmpeg to mux them.
+    can_mux = find_ffmpeg() is not None
+
+    available_videos = {}
+    for stream in yt_downloader.streams:
+        if stream.is_adaptive and stream.includes_video_track and not can_mux:
+            continue
+        video_type = stream.mime_type.split('/')[1]
+        if video_type not in available_videos:
+            available_videos[video_type] = []
+        available_videos[video_type].append(stream.resolution)
+
+    # remove duplicatesfrom the list of resolutions
+    for video_type in available_videos:
+        available_videos[video_type] = list(set(available_videos[video_type]))
+        available_videos[video_type].sort(key=lambda x: int(x[:-1]) if x else 0)
+    return available_videos
+
 def download_youtube_video(
         url: str,
-        download_path: str = os.path.join(os.path.expanduser("~"), "Downloads"),
+        download_path: str = DEFAULT_DOWNLOAD_PATH,
         video_type: str = "mp4",
         resolution: str = "720p",
-        progress: pyqtSignal = None,
-        filesize: pyqtSignal = None) -> int:
+        progress: Callable[[int, int], None] | None = None,
+        before_download: Callable[[str], None] | None = None) -> None:
     """Download a youtube video given its url, download_path, video_type and resolution.
+    This function blocks until the download ends, use download_manager to download in the background.
+    An interrupted download continues from where it stopped when it is downloaded again,
+    except the resolutions that are muxed with ffmpeg, they are downloaded again from the start.
 
     Args:
         url (str): URL of the video
         download_path (str): Path to save the video
         video_type (str): Video type (mp4, webm, ...)
-        resolution (str): Video resolution (720p, 480p, ...)
-        progress (pyqtSignal): Signal to emit progress
+        resolution (str): Video resolution (720p, 480p, ...) or HIGHEST
+        progress (Callable): Called with the downloaded bytes and the size of the video
+        before_download (Callable): Called with the url of the stream before it is downloaded
 
-    Returns:
-        int: 0 if the video is downloaded successfully, 1 otherwise.
+    Raises:
+        ValueError: if the video is not available in the specified resolution.
     """
 
+    yt_downloader = video_cache.get(url)
+    stream = _select_stream(yt_downloader.streams, video_type, resolution)
+    resolution = stream.resolution
+
+    # add _resolution to the filename
+    video_name = stream.default_filename.replace(f".{video_type}", f"_{resolution}.{video_type}")
+    os.makedirs(download_path, exist_ok=True)
+    video_path = os.path.join(download_path, video_name)
+    if before_download is not None:
+        before_download(stream.url)
+
+    if stream.is_adaptive:
+        # the video only stream is muxed with the best audio stream of the same type.
+        audio = yt_downloader.streams.filter(only_audio=True, file_extension=video_type).order_by("abr").last()
+        if audio is None:
+            raise ValueError(f"No {video_type} audio available for {resolution} resolution")
+        mux_streams(stream.url, audio.url, video_path, video_type, progress=progress)
+        return
+
     try:
-        progress.emit(1, 1, 1)
-        ssl._create_default_https_context = ssl._create_stdlib_context  # pylint: disable=protected-access
-        yt_downloader1 = YouTube(url)
-
-        # check if the video is available in the specified resolution
-        if not yt_downloader1.streams.filter(file_extension=video_type, resolution=resolution):
-            print(f"Video not available in {resolution} resolution")
-            return 1
-        progress.emit(2, 2, 2)
-        # add _resolution to the filename
-        video_name = yt_downloader1.streams.filter(
-            file_extension=video_type, resolution=resolution
-        ).first().default_filename
-        video_name = video_name.replace(f".{video_type}", f"_{resolution}.{video_type}")
-        yt_downloader2 = YouTube(url, on_progress_callback=progress.emit)
-        progress.emit(3, 3, 3)
-        filesize.emit(yt_downloader2.streams.filter(
-            file_extension=video_type,
-            resolution=resolution
-        ).first().filesize)
-        yt_downloader2.streams.filter(
-            file_extension=video_type,
-            resolution=resolution
-        ).first().download(download_path, filename=video_name)
-        return 0
-    except Exception as err:
-        print(f"Error downloading video: {err}\n{format_exc()}")
-        return 1
+        # stream urls expire, the download is resumed by the video id and the itag of the stream.
+        download_file(stream.url, video_path, key=f"{yt_downloader.video_id}:{stream.itag}", progress=progress)
+    except DownloadCancelled as cancelled:
+        if cancelled.discard:
+            discard_partial(video_path)
+        raise
+
+
+def _select_stream(streams, video_type: str, resolution: str):
+    """Returns the stream of the video in resolution. A progressive stream (video and audio) is preferred,
+    an adaptive video only stream is returned if it is the only one and ffmpeg can mux it.
+
+    Raises:
+        ValueError: if the video is not available in the specified resolution.
+    """
+    can_mux = find_ffmpeg() is not None
+    videos = streams.filter(file_extension=video_type, type="video")
+    if resolution == HIGHEST:
+        progressive = videos.filter(progressive=True).order_by("resolution").last()
+        adaptive = videos.filter(adaptive=True).order_by("resolution").last() if can_mux else None
+        if adaptive is not None and (progressive is None or
+                                     int(adaptive.resolution[:-1]) > int(progressive.resolution[:-1])):
+            return adaptive
+        if progressive is None:
+            raise ValueError(f"No {video_type} video available")
+        return progressive
+
+    if (stream := videos.filter(progressive=True, resolution=resolution).first()) is not None:
+        return stream
+    if (stream := videos.filter(adaptive=True, resolution=resolution).first()) is None:
+        raise ValueError(f"Video not available in {resolution} resolution")
+    if not can_mux:
+        raise ValueError(f"ffmpeg is needed to download {resolution} videos with audio")
+    return stream
+
+
+def _download_job(job: DownloadJob) -> None:
+    if not job.title:
+        job.title = video_cache.get(job.url).title
+    download_youtube_video(job.url, job.download_path, job.video_type, job.resolution,
+                           progress=job.checkpoint, before_download=job.wait_for_host)
+
+
+download_manager = DownloadManager(_download_job)
 
 class YoutubeDownloader(BaseWindow):
     ytd_toggle_signal = pyqtSignal()
@@ -187,6 +275,8 @@ class YoutubeDownloader(BaseWindow):
         self.layout.setContentsMargins(0, 0, 0, 0)
         self.layout.setAlignment(Qt.AlignTop)
 
+        self.queue_widget = BatchQueueWidget(self)
+        self.layout.addWidget(self.queue_widget)
         self.layout.addStretch()
 
         self.toggle_edit_mode(False)
@@ -208,6 +298,9 @@ class YoutubeDownloader(BaseWindow):
     def toggle_edit_mode(self, mode: Optional[bool] = None) -> None:
         self._edit_mode = not self._edit_mode if mode is None else mode
         for ind, widget in enumerate(self.layout.parentWidget().findChildren(QWidget)):
+            # the queue is always shown
+            if widget is self.queue_widget or self.queue_widget.isAncestorOf(widget):
+                continue
             try:
                 widget.setHidden(not self._edit_mode)
             except Exception:
@@ -227,7 +320,8 @@ class YoutubeDownloader(BaseWindow):
             ind = len(self.workers) + 1
             worker = DownloaderWorker(parent=self, ind=ind)
             self.workers[ind] = worker
-            self.layout.insertWidget(self.layout.count() - 1, worker)
+            # the workers are placed above the queue
+            self.layout.insertWidget(self.layout.indexOf(self.queue_widget), worker)
         else:
             # Display a message box
             warning = BaseDialog(
@@ -241,6 +335,115 @@ class YoutubeDownloader(BaseWindow):
 
             warning.exec_()
 
+class BatchQueueWidget(QWidget):
+    """Queues lists of URLs, playlists and text files of URLs, and shows the queue in a list view."""
+
+    # emitted from the playlist thread with the urls of the videos.
+    urls_ready = pyqtSignal(list)
+    # emitted from the playlist thread with the url of the playlist and the error.
+    playlist_failed = pyqtSignal(str, str)
+
+    def __init__(self, parent: QWidget | None = None) -> None:
+        super().__init__(parent)
+        self.model = DownloadQueueModel(download_manager)
+        self.urls_ready.connect(self._queue_urls)
+        self.playlist_failed.connect(self.model.add_failed)
+
+        self.setLayout(layout := QVBoxLayout())
+
+        self.label = QLabel("Download Queue")
+        self.label.setStyleSheet("color: #282828")
+        layout.addWidget(self.label)
+
+        self.urls_edit = QPlainTextEdit(self)
+        self.urls_edit.setPlaceholderText("Paste video or playlist URLs, one per line")
+        layout.addWidget(self.urls_edit)
+
+        layout.addLayout(input_layout := QHBoxLayout())
+        self.add_button = TextButton(self, "Add")
+        self.add_button.clicked.connect(self.add_pasted_urls)
+        self.file_button = TextButton(self, "Add File")
+        self.file_button.clicked.connect(self.add_urls_from_file)
+        self.concurrency_label = QLabel("Parallel")
+        self.concurrency_box = QSpinBox(self)
+        self.concurrency_box.setRange(1, 8)
+        input_layout.addWidget(self.add_button)
+        input_layout.addWidget(self.file_button)
+        input_layout.addStretch()
+        input_layout.addWidget(self.concurrency_label)
+        input_layout.addWidget(self.concurrency_box)
+
+        # only the visible rows of the list view are laid out and painted
+        self.list_view = QListView(self)
+        self.list_view.setModel(self.model)
+        self.list_view.setUniformItemSizes(True)
+        self.list_view.setSelectionMode(QListView.SelectionMode.ExtendedSelection)
+        layout.addWidget(self.list_view)
+
+        layout.addLayout(control_layout := QHBoxLayout())
+        for text, action in (("Pause", download_manager.pause), ("Resume", download_manager.resume),
+                             ("Cancel", download_manager.cancel)):
+            button = TextButton(self, text)
+            button.clicked.connect(lambda _, action=action: self._apply_to_selection(action))
+            control_layout.addWidget(button)
+        control_layout.addStretch()
+        control_layout.addWidget(clear_button := TextButton(self, "Clear"))
+        clear_button.setToolTip("Remove finished, failed and cancelled downloads")
+        clear_button.clicked.connect(self.model.clear_inactive)
+
+        if (concurrency := self.model.load()) is not None:
+            download_manager.set_max_workers(concurrency)
+        self.concurrency_box.setValue(download_manager.max_workers)
+        self.concurrency_box.valueChanged.connect(self._set_concurrency)
+        # the queue is saved before the download manager interrupts the downloads.
+        QApplication.instance().aboutToQuit.connect(self.model.save)
+
+        self._apply_scale()
+        ui_scale.changed.connect(self._apply_scale)
+
+    def _apply_scale(self) -> None:
+        self.label.setFont(get_font(size=scaled(16)))
+        self.urls_edit.setFont(get_font(size=scaled(11)))
+        self.urls_edit.setFixedHeight(scaled(60))
+        self.list_view.setFont(get_font(size=scaled(11)))
+        self.list_view.setFixedHeight(scaled(200))
+        self.setMinimumWidth(scaled(580))
+
+    def add_pasted_urls(self) -> None:
+        self._add_urls(parse_urls(self.urls_edit.toPlainText()))
+        self.urls_edit.clear()
+
+    def add_urls_from_file(self) -> None:
+        file_path, _ = QFileDialog.getOpenFileName(self, "Select a file of URLs", os.path.expanduser("~"),
+                                                   "Text files (*.txt);;All files (*)")
+        if file_path:
+            with open(file_path, "r", errors="replace") as file:
+                self._add_urls(parse_urls(file.read()))
+
+    def _add_urls(self, urls: list[str]) -> None:
+        videos = [url for url in urls if not is_playlist_url(url)]
+        self._queue_urls(videos)
+        for playlist in (url for url in urls if is_playlist_url(url)):
+            threading.Thread(target=self._expand_playlist, args=(playlist,), daemon=True).start()
+
+    def _expand_playlist(self, url: str) -> None:
+        try:
+            self.urls_ready.emit(expand_playlist(url))
+        except Exception as err:  # pylint: disable=broad-except
+            self.playlist_failed.emit(url, f"Error getting the videos of the playlist: {err}")
+
+    def _queue_urls(self, urls: list[str]) -> None:
+        self.model.add_urls(urls, DEFAULT_DOWNLOAD_PATH, "mp4", HIGHEST)
+
+    def _apply_to_selection(self, action) -> None:
+        for index in self.list_view.selectionModel().selectedIndexes():
+            action(index.data(DownloadQueueModel.JobIdRole))
+
+    def _set_concurrency(self, value: int) -> None:
+        download_manager.set_max_workers(value)
+        self.model.save()
+
+
 class SettingsDialog(BaseDialog):
     def __init__(self, title: str = "Title", parent: QWidget | None = None,
                  available_videos: list = None) -> None:
@@ -322,8 +525,8 @@ class DownloaderWorker(QWidget):
         QWidget (QWidget): QWidget
     """
 
-    download_progress_signal = pyqtSignal(int, int, int)
-    video_size_signal = pyqtSignal(int)
+    # emitted from the fetch thread with the url and the future of its video.
+    _video_fetched = pyqtSignal(str, object)
 
     def __init__(self, parent: QWidget | None = None, ind: int = 0):
         super().__init__()
@@ -335,17 +538,17 @@ class DownloaderWorker(QWidget):
         self.video_url = ""
         self.video_location = ""
         self.video_name = ""
+        # the job of the current download of this widget.
+        self.job: DownloadJob | None = None
 
-        # set minimum width
-        self.setMinimumWidth(int(580 * UI_SCALE))
 
         self.layout = QVBoxLayout()
         self.setLayout(self.layout)
         self.layout.setAlignment(Qt.AlignTop)
-        self.video_size = 0
 
-        self.download_progress_signal.connect(self.update_progress_bar)
-        self.video_size_signal.connect(self.update_video_size)
+        download_manager.progress.connect(self.update_progress_bar)
+        download_manager.state_changed.connect(self.update_state)
+        self._video_fetched.connect(self._on_video_fetched)
 
         self.add_yt_widget = QWidget(self)
         self.layout.addWidget(self.add_yt_widget)
@@ -361,15 +564,12 @@ class DownloaderWorker(QWidget):
         self.add_yt_layout.addLayout(self.bottom_layout)
         self.add_yt_layout.addLayout(self.progress_layout)
 
-        yt_label = QLabel(f"Youtube Downloader {ind if ind > 0 else ''}")
-        yt_label.setFont(get_font(size=int(16 * UI_SCALE)))
+        self.yt_label = yt_label = QLabel(f"Youtube Downloader {ind if ind > 0 else ''}")
         yt_label.setStyleSheet("color: #282828")
 
         self.add_url_entry = Entry(self, place_holder="URL")
-        # set minimum width
-        self.add_url_entry.setMinimumWidth(int(430 * UI_SCALE))
-        # set font size
-        self.add_url_entry.setFont(get_font(size=int(11 * UI_SCALE)))
+        # the video is fetched while the user chooses the settings.
+        self.add_url_entry.textChanged.connect(video_cache.prefetch)
 
         self.add_download_button = GrnButton(self, "radial")
         self.add_settings_button = YelButton(self, "radial")
@@ -378,20 +578,20 @@ class DownloaderWorker(QWidget):
         self.add_settings_button.setToolTip("Settings")
         self.add_delete_button.setToolTip("Delete")
 
-        self.add_download_button.clicked.connect(self.download_video)
+        self.add_download_button.clicked.connect(self.on_download_button_clicked)
 
-        self.add_delete_button.clicked.connect(self.delete_widget)
+        self.add_delete_button.clicked.connect(self.on_delete_button_clicked)
 
         self.add_settings_button.clicked.connect(self.show_settings_dialog)
 
         self.top_layout.addWidget(yt_label)
 
         self.bottom_layout.addWidget(self.add_url_entry)
-        self.bottom_layout.addSpacing(int(5 * UI_SCALE))
+        self.bottom_layout.addSpacing(0)
         self.bottom_layout.addWidget(self.add_download_button)
-        self.bottom_layout.addSpacing(int(5 * UI_SCALE))
+        self.bottom_layout.addSpacing(0)
         self.bottom_layout.addWidget(self.add_settings_button)
-        self.bottom_layout.addSpacing(int(5 * UI_SCALE))
+        self.bottom_layout.addSpacing(0)
         self.bottom_layout.addWidget(self.add_delete_button)
         self.bottom_layout.addStretch()
 
@@ -399,50 +599,87 @@ class DownloaderWorker(QWidget):
 
         self.progress_bar.setRange(0, 100)
         self.progress_bar.setValue(0)
-        self.progress_bar.setFixedHeight(int(5 * UI_SCALE))
 
         self.progress_layout.addWidget(self.progress_bar)
 
+        self._apply_scale()
+        ui_scale.changed.connect(self._apply_scale)
+
+    def _apply_scale(self) -> None:
+        # set minimum width
+        self.setMinimumWidth(scaled(580))
+        self.yt_label.setFont(get_font(size=scaled(16)))
+        # set minimum width and font size of the url entry
+        self.add_url_entry.setMinimumWidth(scaled(430))
+        self.add_url_entry.setFont(get_font(size=scaled(11)))
+        for i in range(self.bottom_layout.count() - 1):  # the last item is the stretch
+            if (spacer := self.bottom_layout.itemAt(i).spacerItem()) is not None:
+                spacer.changeSize(scaled(5), 0)
+        self.bottom_layout.invalidate()
+        self.progress_bar.setFixedHeight(scaled(5))
+
+    def on_download_button_clicked(self) -> None:
+        """Starts a download, or pauses/resumes the current download of this widget."""
+        if self.job is None or not self.job.active:
+            self.download_video()
+        elif self.job.paused:
+            download_manager.resume(self.job.id)
+            self.add_download_button.setToolTip("Pause")
+        else:
+            download_manager.pause(self.job.id)
+            self.add_download_button.setToolTip("Resume")
+
+    def on_delete_button_clicked(self) -> None:
+        """Cancels the current download of this widget, or deletes the widget if it is not downloading."""
+        if self.job is not None and self.job.active:
+            download_manager.cancel(self.job.id)
+        else:
+            self.delete_widget()
+
     def download_video(self) -> None:
         if self.add_url_entry.text() and self.add_url_entry.text().startswith("https://www.youtube.com/watch?v="):
             self.video_url = self.add_url_entry.text()
         if self.video_url:
-            download_youtube_video(
+            self.progress_bar.setValue(0)
+            self.job = download_manager.add(
                 self.video_url,
-                download_path=self.video_location,
+                download_path=self.video_location or DEFAULT_DOWNLOAD_PATH,
                 video_type=self.video_type,
                 resolution=self.video_resolution,
-                progress=self.download_progress_signal,
-                filesize=self.video_size_signal
             )
         else:
             self._show_warning("Please enter a valid URL")
 
-    def update_progress_bar(self, chunk, file_handle, bytes_remaining):
-        if self.video_size:
-            percentage = int((1 - bytes_remaining / self.video_size) * 100)
-        else:
-            percentage = bytes_remaining
-        print(f"Progress: {percentage}%")
-        self.progress_bar.setValue(percentage)
-
-    def update_video_size(self, size: int) -> None:
-        self.video_size = size
+    def update_progress_bar(self, job_id: int, downloaded: int, total: int) -> None:
+        if self.job is not None and job_id == self.job.id and total:
+            self.progress_bar.setValue(downloaded * 100 // total)
+            self.progress_bar.setToolTip(f"{format_speed(self.job.speed)}, {format_eta(self.job.eta)} left")
+
+    def update_state(self, job_id: int, state: str) -> None:
+        if self.job is None or job_id != self.job.id:
+            return
+        if state == DOWNLOADING:
+            self.add_download_button.setToolTip("Pause")
+            self.add_delete_button.setToolTip("Cancel")
+        elif state in (FINISHED, FAILED, CANCELLED):
+            self.add_download_button.setToolTip("Download")
+            self.add_delete_button.setToolTip("Delete")
+            if state == CANCELLED:
+                self.progress_bar.setValue(0)
+            elif state == FAILED:
+                self._show_warning(f"Error downloading video: {self.job.error}")
 
     def delete_widget(self) -> None:
+        download_manager.progress.disconnect(self.update_progress_bar)
+        download_manager.state_changed.disconnect(self.update_state)
         self.parent.layout.removeWidget(self)
         self.deleteLater()
 
-        length = len([worker for worker in self.parent.workers.values() if worker is not None])
-        self.parent.setFixedHeight(int(self.height() * length * 1.05))
-
         self.parent.workers[self.ind] = None
-        length = len([worker for worker in self.parent.workers.values() if worker is not None])
         if len([worker for worker in self.parent.workers.values() if worker is not None]) == 0:
             self.parent.toggle_edit_mode(False)
-            self.parent.setFixedWidth(0)
-            self.parent.setFixedHeight(0)
-            self.parent.adjustSize()
+        # the window shrinks to the remaining workers and the queue.
+        QTimer.singleShot(0, self.parent.adjustSize)
 
     def _show_warning(self, msg: str) -> None:
         warning = BaseDialog(
@@ -456,21 +693,39 @@ class DownloaderWorker(QWidget):
         warning.exec_()
 
     def show_settings_dialog(self) -> None:
-        if not self.add_url_entry.text():
+        url = self.add_url_entry.text()
+        if not url:
             self._show_warning("Please enter a valid URL first")
-        else:
-            available_videos = get_available_videos(self.add_url_entry.text())
-            settings_dialog = SettingsDialog(
-                title="Settings",
-                available_videos=available_videos,
-            )
-            settings_dialog.exec_()
+            return
+        try:
+            future = video_cache.fetch(url)
+        except ValueError:
+            self._show_warning("Please enter a valid URL first")
+            return
+        # the dialog is shown when the video is fetched, the UI doesn't wait for the fetch.
+        self.add_settings_button.setEnabled(False)
+        future.add_done_callback(lambda future: self._video_fetched.emit(url, future))
+
+    def _on_video_fetched(self, url: str, future) -> None:
+        self.add_settings_button.setEnabled(True)
+        if url != self.add_url_entry.text():
+            return  # the url was changed while fetching
+        try:
+            available_videos = _available_videos(future.result())
+        except Exception as err:  # pylint: disable=broad-except
+            self._show_warning(f"Error getting available videos: {err}")
+            return
+        settings_dialog = SettingsDialog(
+            title="Settings",
+            available_videos=available_videos,
+        )
+        settings_dialog.exec_()
 
-            settings = settings_dialog.get_settings()
-            self.video_type = settings["video_type"]
-            self.video_resolution = settings["resolution"]
-            self.video_location = settings["download_path"]
-            print(self.video_location)
+        settings = settings_dialog.get_settings()
+        self.video_type = settings["video_type"]
+        self.video_resolution = settings["resolution"]
+        self.video_location = settings["download_path"]
+        print(self.video_location)
 
 if __name__ == '__main__':
     app = QApplication(sys.argv)
@@ -479,6 +734,7 @@ if __name__ == '__main__':
     sys.exit(app.exec_())
 else:
     window = YoutubeDownloader()
+    QApplication.instance().aboutToQuit.connect(download_manager.shutdown)
 
     menu = AddOnBase.system_tray_icon.contextMenu()
     action = menu.addAction("Youtube Downloader")
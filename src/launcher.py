@@ -29,8 +29,10 @@ from PyQt5.QtGui import (
     QPixmap,
 )
 
-from settings import apply_ui_scale as scaled
+from settings import ui_scale, apply_ui_scale as scaled
 from ui.utils import get_font
+from ui.command_palette import CommandPalette
+from search_index import index as search_index, ADDON
 
 from FileSystem import icon as get_icon, abspath
 from SaveFile import apply_setting, get_setting, remove_setting, NotFoundException
@@ -54,8 +56,8 @@ class IconButton(QPushButton):
         self._icon = icon_path
         self._hover_icon = hover_icon_path
         
-        self.setFixedSize(QSize(scaled(100), scaled(100)))
-        self.setIconSize(QSize(scaled(100), scaled(100)))
+        self._apply_scale()
+        ui_scale.changed.connect(self._apply_scale)
         
         self.setStyleSheet(
             (
@@ -79,6 +81,10 @@ class IconButton(QPushButton):
             )
         )
 
+    def _apply_scale(self) -> None:
+        self.setFixedSize(QSize(scaled(100), scaled(100)))
+        self.setIconSize(QSize(scaled(100), scaled(100)))
+
 
 class ShortcutLabel(QWidget):
     
@@ -88,6 +94,9 @@ class ShortcutLabel(QWidget):
             
             self.is_plus = text == "+"
             
+            self.apply_scale()
+
+        def apply_scale(self) -> None:
             self.setFont(get_font(size=scaled(11), weight="semibold"))
             self.setFixedSize(self.sizeHint())
             
@@ -123,14 +132,21 @@ class ShortcutLabel(QWidget):
         
         layout.addStretch()
 
+        self._labels = []
         for key in self.shortcut_keys:
             label = self.Label(key)
             layout.addWidget(label)
+            self._labels.append(label)
 
         layout.addStretch()
         
         self.adjustSize()
 
+    def apply_scale(self) -> None:
+        for label in self._labels:
+            label.apply_scale()
+        self.adjustSize()
+
 
 class GroupWidget(QWidget):
     animating: int = 0
@@ -140,21 +156,30 @@ class GroupWidget(QWidget):
         super().__init__(parent)
         
         self.index = index
-        self.setFixedWidth(scaled(100 + 40))  # 40 padding
         
         self.icon_button = IconButton(self, icon_path, hover_icon_path)
         self.icon_button.clicked.connect(activate_callback)
-        self.icon_button.setGeometry(QRect(scaled(20), 0, self.icon_button.width(), self.icon_button.height()))
         
         self.title_label = QLabel(title, self)
         self.title_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
         self.title_label.setWordWrap(True)
-        self.title_label.setFont(get_font(size = scaled(12), weight="medium"))
         self.title_label.setStyleSheet("QLabel { color : #ECECEC }")
-        self.title_label.setGeometry(QRect(0, scaled(85+11), self.width(), self.title_label.height() + scaled(10)))
+        self._title_label_height = self.title_label.height()
 
-        if shortcut is not None:
-            self.hotkey_label = ShortcutLabel(self, shortcut)
+        self.hotkey_label = ShortcutLabel(self, shortcut) if shortcut is not None else None
+        
+        self.apply_scale()
+
+    def apply_scale(self) -> None:
+        """Updates the geometry and fonts of this widget for the current UI scale."""
+        self.setFixedWidth(scaled(100 + 40))  # 40 padding
+        self.icon_button.setGeometry(QRect(scaled(20), 0, self.icon_button.width(), self.icon_button.height()))
+
+        self.title_label.setFont(get_font(size = scaled(12), weight="medium"))
+        self.title_label.setGeometry(QRect(0, scaled(85+11), self.width(), self._title_label_height + scaled(10)))
+
+        if self.hotkey_label is not None:
+            self.hotkey_label.apply_scale()
             self.hotkey_label.setGeometry(QRect(0, scaled(98+17+17)+self.title_label.sizeHint().height(),
                                                 self.width(),
                                                 self.hotkey_label.height()))
@@ -205,21 +230,13 @@ class LowerWidget(QMainWindow):
             self.lower_position = QPoint(screen.width() // 2 - self.size().width() // 2,
                                          screen.height() - 60 - self.size().height())
 
-        self.icon: QPixmap = QPixmap(get_icon("icon.png")).scaled(scaled(35), scaled(35),
-                                                                  Qt.AspectRatioMode.KeepAspectRatio,
-                                                                  Qt.TransformationMode.SmoothTransformation)
-
         self.icon_label = QLabel(self)
-        self.icon_label.setPixmap(self.icon)
-        self.icon_label.setGeometry(scaled(40), scaled(13), scaled(35), scaled(35))
         
         self.title_label = QLabel("FlowBuddy", self)
-        self.title_label.setFont(get_font(size=scaled(16), weight="medium"))
         self.title_label.setStyleSheet("QLabel { color : #ECECEC }")
-        self.title_label.move(scaled(43 + 40), scaled(9 + 5))
-        self.title_label.adjustSize()
 
-        self.setFixedSize(self.size())
+        self._apply_scale()
+        ui_scale.changed.connect(self._apply_scale)
         
         
         self.main_window = MainWindow(add_ons)
@@ -227,11 +244,28 @@ class LowerWidget(QMainWindow):
         hotkey = get_setting("hotkey") if check_setting("hotkey") else "<Ctrl>+`"
         HotKeys.add_global_shortcut(hotkey, self.window_toggle_signal.emit)
 
+        self.command_palette = CommandPalette()
+        palette_hotkey = get_setting("palette_hotkey") if check_setting("palette_hotkey") else "<ctrl>+<shift>+<space>"
+        HotKeys.add_global_shortcut(palette_hotkey, self.command_palette.window_toggle_signal.emit)
+
         self.move(self.lower_position)
         self.setHidden(get_setting("lower-hidden")) if check_setting("lower-hidden") else self.show()
         self.main_window.setHidden(get_setting("upper-hidden")) if check_setting("upper-hidden") else self.show()
         
 
+    def _apply_scale(self) -> None:
+        self.icon: QPixmap = QPixmap(get_icon("icon.png")).scaled(scaled(35), scaled(35),
+                                                                  Qt.AspectRatioMode.KeepAspectRatio,
+                                                                  Qt.TransformationMode.SmoothTransformation)
+        self.icon_label.setPixmap(self.icon)
+        self.icon_label.setGeometry(scaled(40), scaled(13), scaled(35), scaled(35))
+
+        self.title_label.setFont(get_font(size=scaled(16), weight="medium"))
+        self.title_label.move(scaled(43 + 40), scaled(9 + 5))
+        self.title_label.adjustSize()
+
+        self.setFixedSize(self.size())
+
     def toggle_windows(self) -> None:
         if self.isHidden():
             for window in self.active_windows:
@@ -320,6 +354,13 @@ class MainWindow(QWidget):
 
         self.setGeometry(QRect(self.upper_position, current_window_size))
 
+        ui_scale.changed.connect(self._apply_scale)
+
+    def _apply_scale(self) -> None:
+        for widget in self.widgets:
+            widget.apply_scale()
+        self.resize(self.get_window_size())
+
         
     def get_window_size(self) -> QSize:
         """Returns the size of the window acording to the GroupWidgets created."""
@@ -342,6 +383,9 @@ class MainWindow(QWidget):
 
         widget = GroupWidget(self, index, title, icon_path, hover_icon_path, shortcut, activate)
         self.widgets.append(widget)
+
+        # activate is looked up when the entry is chosen, addons may replace it after loading.
+        search_index.add(f"{ADDON}:{add_on_name}", title, ADDON, lambda: AddOnBase(add_on_name).activate())
         
         
     def toggle_windows(self) -> None:
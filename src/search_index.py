@@ -0,0 +1,190 @@
+"""In-memory fuzzy search index used by the command palette.
+
+Entries are added, updated and removed one at a time by whoever owns the data
+(the launcher for addons, the shortcuts addon for tasks, the notes addon for notes),
+so the index never has to be rebuilt from scratch.
+
+Owners can also provide suggestions, entries shown before anything is typed, like the most used tasks,
+and content loaders, which fill in the contents of their entries at the first search instead of at startup."""
+
+from __future__ import annotations
+
+import heapq
+from typing import Callable, Optional
+
+
+ADDON = "addon"
+TASK = "task"
+NOTE = "note"
+
+# contents longer than this are cut before indexing. contents are only matched as a substring,
+# so indexing the head of a huge note is enough and keeps the memory of the index bounded.
+CONTENT_LIMIT = 1 << 20
+
+# score weights
+_TITLE_WEIGHT = 3
+_SUBTITLE_WEIGHT = 1
+_CONTENT_SCORE = 1
+
+
+def _char_mask(text: str) -> int:
+    """Returns a 64 bit mask of the characters in text. used to reject entries before matching."""
+    mask = 0
+    for char in set(text):
+        mask |= 1 << (ord(char) & 63)
+    return mask
+
+
+def _fuzzy_score(query: str, text: str) -> int:
+    """Returns the score of query as a subsequence of text. Returns 0 if query is not a subsequence of text.
+    Both strings should be lower case."""
+    find = text.find
+    position = find(query[0])
+    if position < 0:
+        return 0
+
+    # matches at the start of the text or the start of a word are worth more.
+    score = 8 if position == 0 else (4 if not text[position - 1].isalnum() else 1)
+    last = position
+    for char in query[1:]:
+        position = find(char, last + 1)
+        if position < 0:
+            return 0
+        if position == last + 1:
+            score += 5  # consecutive
+        elif not text[position - 1].isalnum():
+            score += 3  # word start
+        else:
+            score += 1
+        last = position
+
+    # prefer short texts, the match covers more of them.
+    return score * 100 // (100 + len(text)) + score
+
+
+class SearchEntry:
+    __slots__ = ("key", "title", "kind", "action", "subtitle", "text",
+                 "_title", "_subtitle", "_mask")
+
+    def __init__(self, key: str, title: str, kind: str, action: Callable,
+                 subtitle: str = "", text: str = "") -> None:
+        self.key = key
+        self.title = title
+        self.kind = kind
+        self.action = action
+        self.subtitle = subtitle
+        self.set_text(text)
+        self._title = title.lower()
+        self._subtitle = subtitle.lower()
+        self._mask = _char_mask(self._title) | _char_mask(self._subtitle)
+
+    def __repr__(self) -> str:
+        return f"SearchEntry({self.kind}: {self.title})"
+
+    def set_text(self, text: str) -> None:
+        self.text = text[:CONTENT_LIMIT].lower()
+
+    def score(self, query: str, mask: int) -> int:
+        """Returns the score of this entry for the lower cased query. 0 if it doesn't match."""
+        score = 0
+        if mask & self._mask == mask:
+            score = max(_fuzzy_score(query, self._title) * _TITLE_WEIGHT,
+                        _fuzzy_score(query, self._subtitle) * _SUBTITLE_WEIGHT)
+        if not score and query in self.text:
+            score = _CONTENT_SCORE
+        return score
+
+
+class SearchIndex:
+    def __init__(self) -> None:
+        self._entries: dict[str, SearchEntry] = {}
+        # the last query and its matches. a query that extends the last one
+        # only has to be matched against the last matches.
+        self._last_query: Optional[str] = None
+        self._last_matches: list[SearchEntry] = []
+        self._suggestion_providers: list[Callable[[int], list[SearchEntry]]] = []
+        self._content_loaders: list[Callable[[], None]] = []
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._entries
+
+
+    def add(self, key: str, title: str, kind: str, action: Callable,
+            subtitle: str = "", text: str = "") -> SearchEntry:
+        """Adds a new entry to the index. if an entry with the same key exists, it will be replaced."""
+        entry = SearchEntry(key, title, kind, action, subtitle, text)
+        self._entries[key] = entry
+        self._invalidate()
+        return entry
+
+    def remove(self, key: str) -> None:
+        """Removes the entry of the given key if it exists."""
+        if self._entries.pop(key, None) is not None:
+            self._invalidate()
+
+    def update_text(self, key: str, text: str) -> None:
+        """Updates the indexed contents of an existing entry."""
+        if (entry := self._entries.get(key)) is not None:
+            entry.set_text(text)
+            self._invalidate()
+
+    def get(self, key: str) -> SearchEntry | None:
+        return self._entries.get(key)
+
+
+    def search(self, query: str, limit: int = 50) -> list[SearchEntry]:
+        """Returns the best matching entries for the query, best first.
+        An empty query returns no entries."""
+        query = query.strip().lower()
+        if not query:
+            return []
+        self._load_contents()
+
+        if self._last_query is not None and query.startswith(self._last_query):
+            candidates = self._last_matches
+        else:
+            candidates = self._entries.values()
+
+        mask = _char_mask(query)
+        scored = []
+        for order, entry in enumerate(candidates):
+            if score := entry.score(query, mask):
+                scored.append((score, -order, entry))
+
+        self._last_query = query
+        self._last_matches = [entry for _, _, entry in scored]
+
+        return [entry for _, _, entry in heapq.nlargest(limit, scored, key=lambda x: (x[0], x[1]))]
+
+    def add_suggestions(self, provider: Callable[[int], list[SearchEntry]]) -> None:
+        """Adds a provider of suggestions. It's called with the number of entries wanted, best first."""
+        self._suggestion_providers.append(provider)
+
+    def suggestions(self, limit: int = 10) -> list[SearchEntry]:
+        """Entries for an empty query, from the providers in the order they were added."""
+        entries: list[SearchEntry] = []
+        for provider in self._suggestion_providers:
+            if len(entries) >= limit:
+                break
+            entries.extend(provider(limit - len(entries)))
+        return entries[:limit]
+
+    def add_content_loader(self, loader: Callable[[], None]) -> None:
+        """Adds a function that updates the contents of entries with update_text.
+        It's called once, before the first search after it's added."""
+        self._content_loaders.append(loader)
+
+    def _load_contents(self) -> None:
+        loaders, self._content_loaders = self._content_loaders, []
+        for loader in loaders:
+            loader()
+
+    def _invalidate(self) -> None:
+        self._last_query = None
+        self._last_matches = []
+
+
+index = SearchIndex()
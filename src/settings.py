@@ -3,7 +3,8 @@ This module contains settings values of our application.
 """
 
 from typing import Any
-from importlib import reload
+
+from PyQt5.QtCore import QCoreApplication, QObject, QSize, QPoint, QTimer, pyqtSignal
 
 import SaveFile as Data
 
@@ -19,15 +20,90 @@ def _get_setting(setting_name: str) -> tuple[Any, bool]:
 
 CORNER_RADIUS = 12
 STROKE_WIDTH = 2
+DEFAULT_UI_SCALE = 1.0
+# milliseconds the UI scale has to stay unchanged before it is written to the save file.
+SAVE_DELAY = 500
 
-# Assign the retrieved value if it is found; otherwise, assign the default value.
-UI_SCALE: float = _load[0] if (_load:=_get_setting("ui_scale"))[1] and isinstance(_load[0], (int, float)) else 1.0
 
+class UIScale(QObject):
+    """Holds the current UI scale of the application.
+
+    Widgets should scale their values with `scaled` when they are needed and connect to `changed`
+    to update their geometry and fonts, instead of keeping the value of UI_SCALE from import time."""
+
+    changed = pyqtSignal(float)
+    """This signal is emitted with the new scale when the UI scale is changed."""
+
+    def __init__(self, value: float) -> None:
+        super().__init__()
+        self._value = value
+        # scaled numbers are cached until the scale is changed.
+        self._int_cache: dict[int, int] = {}
+        self._float_cache: dict[float, float] = {}
+        # a spin box changes the scale on every step, only the last value is saved.
+        self._save_timer = QTimer(self)
+        self._save_timer.setSingleShot(True)
+        self._save_timer.setInterval(SAVE_DELAY)
+        self._save_timer.timeout.connect(self.save)
+        self._flush_on_quit = False
+
+    @property
+    def value(self) -> float:
+        return self._value
+
+    def set_value(self, value: float, save: bool = True) -> None:
+        """Changes the UI scale and notifies the widgets. If save is True, the value is saved to the save file
+        once it stays unchanged for SAVE_DELAY milliseconds."""
+        global UI_SCALE
+        if value != self._value:
+            self._value = UI_SCALE = value
+            self._int_cache.clear()
+            self._float_cache.clear()
+            self.changed.emit(value)
+        if save:
+            self._schedule_save()
 
+    def _schedule_save(self) -> None:
+        if not self._flush_on_quit and (application := QCoreApplication.instance()) is not None:
+            application.aboutToQuit.connect(self.flush)
+            self._flush_on_quit = True
+        self._save_timer.start()
 
+    def save(self) -> None:
+        self._save_timer.stop()
+        Data.apply_setting("ui_scale", self._value)
+
+    def flush(self) -> None:
+        """Saves a value that is waiting for its delay."""
+        if self._save_timer.isActive():
+            self.save()
+
+    def reset(self) -> None:
+        """Removes the saved UI scale and sets the scale back to default."""
+        self._save_timer.stop()
+        try:
+            Data.remove_setting("ui_scale")
+        except Data.NotFoundException:
+            pass
+        self.set_value(DEFAULT_UI_SCALE, save=False)
+
+    def scaled(self, value: int | float | QSize | QPoint) -> int | float | QSize | QPoint:
+        if type(value) is int:
+            if (scaled_value := self._int_cache.get(value)) is None:
+                scaled_value = self._int_cache[value] = int(value * self._value)
+            return scaled_value
+        if type(value) is float:
+            if (scaled_value := self._float_cache.get(value)) is None:
+                scaled_value = self._float_cache[value] = value * self._value
+            return scaled_value
+        return type(value)(value * self._value)
+
+
+# Assign the retrieved value if it is found; otherwise, assign the default value.
+# NOTE: UI_SCALE is kept up to date for reading it from this module (settings.UI_SCALE).
+# a value imported with 'from settings import UI_SCALE' will not be updated, use ui_scale instead.
+UI_SCALE: float = _load[0] if (_load:=_get_setting("ui_scale"))[1] and isinstance(_load[0], (int, float)) else DEFAULT_UI_SCALE
 
-from PyQt5.QtCore import QSize, QPoint
+ui_scale = UIScale(UI_SCALE)
 
-def apply_ui_scale(value: int | float | QSize | QPoint) -> int | float | QSize | QPoint:
-    scaled_value = value * UI_SCALE
-    return type(value)(scaled_value)
\ No newline at end of file
+apply_ui_scale = ui_scale.scaled
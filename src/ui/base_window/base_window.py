@@ -14,7 +14,7 @@ from PyQt5.QtGui import (
     QResizeEvent,
 )
 
-from settings import CORNER_RADIUS, apply_ui_scale as scaled
+from settings import CORNER_RADIUS, ui_scale, apply_ui_scale as scaled
 from ui.custom_button import RedButton
 
 from .title_bar_layer import TabButton, TitleBarLayer
@@ -31,15 +31,14 @@ def add_base_window(widget: QWidget | TabWidget, title_bar: Literal["title", "ta
     shadow_layer.setAttribute(Qt.WA_TranslucentBackground)
     
     shadow_layer.setLayout(shadow_layer_layout := QVBoxLayout(shadow_layer))
-    shadow_layer_layout.setContentsMargins(x := scaled(50), x, x, x)
     shadow_layer_layout.setSpacing(0)
 
     # create widget for show title bar.
     shadow_layer_layout.addWidget(title_bar_layer := TitleBarLayer(title_bar, shadow_layer)) 
     title_bar_layer.setLayout(title_bar_layer_layout := QVBoxLayout(title_bar_layer))
     title_bar_layer_layout.setContentsMargins(0, 0, 0, 0)
-    if title_bar == "tab": spacing = scaled(50)
-    elif title_bar == "title": spacing = scaled(34)
+    if title_bar == "tab": spacing = 50
+    elif title_bar == "title": spacing = 34
     else: spacing = 0
     title_bar_layer_layout.addSpacing(scaled(spacing))
 
@@ -49,15 +48,12 @@ def add_base_window(widget: QWidget | TabWidget, title_bar: Literal["title", "ta
     # adding shadow that shows behind the main window.
     main_window_shadow = QGraphicsDropShadowEffect(title_bar_layer)
     main_window_shadow.setColor(QColor(118, 118, 118, 70))
-    main_window_shadow.setOffset(0, scaled(10))
     main_window_shadow.setBlurRadius(60)
     title_bar_layer.setGraphicsEffect(main_window_shadow)
     
     # adding shadow that shows in the title bar
     title_bar_shadow = QGraphicsDropShadowEffect()
     title_bar_shadow.setColor(QColor(118, 118, 118, 25))
-    title_bar_shadow.setOffset(0, scaled(-4.33))
-    title_bar_shadow.setBlurRadius(scaled(27))
     # the shadow doesn't apply to the title bar if the title_bar is "hidden"
     if title_bar != "hidden":
         widget.setGraphicsEffect(title_bar_shadow)
@@ -73,6 +69,26 @@ def add_base_window(widget: QWidget | TabWidget, title_bar: Literal["title", "ta
     widget.title_bar_layer = title_bar_layer
     widget.shadow_effect = title_bar_shadow
 
+    def apply_scale() -> None:
+        shadow_layer_layout.setContentsMargins(x := scaled(50), x, x, x)
+        title_bar_layer_layout.itemAt(0).spacerItem().changeSize(0, scaled(spacing))
+        title_bar_layer_layout.invalidate()
+        main_window_shadow.setOffset(0, scaled(10))
+        title_bar_shadow.setOffset(0, scaled(-4.33))
+        title_bar_shadow.setBlurRadius(scaled(27))
+        
+    apply_scale()
+    ui_scale.changed.connect(apply_scale)
+    shadow_layer.destroyed.connect(lambda *_: _disconnect_scale(apply_scale))
+
+
+def _disconnect_scale(slot) -> None:
+    try:
+        ui_scale.changed.disconnect(slot)
+    except (RuntimeError, TypeError):
+        # ui_scale is already deleted when the application is closing.
+        pass
+
 
 class Buttons:
     def __init__(self):
@@ -15,7 +15,7 @@ from PyQt5.QtGui import (
     QPen,
 )
 
-from settings import apply_ui_scale as scaled, CORNER_RADIUS
+from settings import ui_scale, apply_ui_scale as scaled, CORNER_RADIUS
 from ui.custom_button import RedButton, YelButton, GrnButton
 from ui.utils import get_font
 
@@ -38,26 +38,28 @@ class TabButton(QWidget):
         self.tab_id: int = tab_id
         self.focused: bool = False
         self.title: str = title
-        
-        self.setFont(get_font(size=scaled(16)))
 
         self._red_button = RedButton(self, "radial")
-        self._red_button.move(QPoint(self.size().width() - scaled(22 + 10), scaled(8)))
-        self._red_button.setIconSize(size := scaled(QSize(22, 22)))
-        self._red_button.setFixedSize(size)
         self._red_button.hide()
         
-        self.setFixedSize(self.size())
-        
-        
         self.shadow_effect = QGraphicsDropShadowEffect(self)
-        self.shadow_effect.setOffset(0, scaled(4.3))
         self.shadow_effect.setBlurRadius(16)
         
         self.setGraphicsEffect(self.shadow_effect)
         
         self.set_focused(self.focused)  # updating the shadow color
 
+        self._apply_scale()
+        ui_scale.changed.connect(self._apply_scale)
+
+    def _apply_scale(self) -> None:
+        self.setFont(get_font(size=scaled(16)))
+        self._red_button.move(QPoint(self.size().width() - scaled(22 + 10), scaled(8)))
+        self._red_button.setIconSize(size := scaled(QSize(22, 22)))
+        self._red_button.setFixedSize(size)
+        self.setFixedSize(self.size())
+        self.shadow_effect.setOffset(0, scaled(4.3))
+
 
     @property
     def red_button(self) -> RedButton:
@@ -125,7 +127,6 @@ class Buttons(QWidget):
 
         self.setLayout(QHBoxLayout(self))
         self.layout().setContentsMargins(0, 0, 0, 0)
-        self.layout().setSpacing(scaled(9))
         self.red_button = RedButton(self, "radial")
         self.yel_button = YelButton(self, "radial")
         self.grn_button = GrnButton(self, "radial")
@@ -136,6 +137,12 @@ class Buttons(QWidget):
         self.yel_button.hide()
         self.grn_button.hide()
 
+        self._apply_scale()
+        ui_scale.changed.connect(self._apply_scale)
+
+    def _apply_scale(self) -> None:
+        self.layout().setSpacing(scaled(9))
+
 
 class TitleBarLayer(QWidget):
     def __init__(self, title_bar: Optional[Literal["title", "tab", "hidden"]] = None,
@@ -157,6 +164,21 @@ class TitleBarLayer(QWidget):
         else:
             self._init_for_tabs()
 
+        ui_scale.changed.connect(self._apply_scale)
+
+    def _apply_scale(self) -> None:
+        """Updates the title bar after the UI scale is changed."""
+        if self.mode == "title":
+            self.title_label.move(scaled(20), scaled(5))
+            self.title_label.setFont(get_font(size=scaled(16)))
+            self.title_label.adjustSize()
+        else:
+            self.add_button.setIconSize(size := scaled(QSize(22, 22)))
+            self.add_button.setFixedSize(size)
+            self.add_button.move(self.add_button.x(), scaled(50)//2 - self.add_button.height()//2)
+            self._reset_tab_positions()
+        self._set_button_position()
+
 
     def _init_for_title(self) -> None:
         """initialize title bar for title."""
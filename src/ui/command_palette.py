@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+from PyQt5.QtCore import Qt, pyqtSignal
+from PyQt5.QtGui import QKeyEvent, QCursor
+from PyQt5.QtWidgets import (
+    QApplication,
+    QListWidget,
+    QListWidgetItem,
+    QVBoxLayout,
+    QWidget,
+)
+
+from search_index import index as search_index, SearchEntry
+from settings import ui_scale, apply_ui_scale as scaled, CORNER_RADIUS
+from .base_window import BaseWindow
+from .entry_box import Entry
+from .utils import get_font
+
+
+RESULTS_LIMIT = 50
+SUGGESTIONS_LIMIT = 10
+
+
+def results_style() -> str:
+    return f"""
+    QListWidget {{
+        border: none;
+        background-color: transparent;
+        color: #282828;
+    }}
+    QListWidget::item {{
+        border-radius: {scaled(CORNER_RADIUS)}px;
+        padding: {scaled(6)}px;
+    }}
+    QListWidget::item:selected {{
+        background-color: #DADADA;
+        color: #282828;
+    }}
+    """
+
+
+class CommandPalette(BaseWindow):
+    """Searches addons, shortcut tasks and notes from the search index and activates the chosen entry.
+    Before anything is typed, it lists the suggestions of the index."""
+
+    window_toggle_signal = pyqtSignal()
+
+    def __init__(self, parent: QWidget | None = None) -> None:
+        super().__init__(hide_title_bar=True, parent=parent)
+
+        self._entries: list[SearchEntry] = []
+
+        self.setLayout(layout := QVBoxLayout())
+
+        self._entry = Entry(self, "Search addons, shortcuts and notes")
+        self._entry.textChanged.connect(self._update_results)
+        self._entry.keyPressEvent = self._entry_key_press_event
+        layout.addWidget(self._entry)
+
+        self._results = QListWidget(self)
+        self._results.setFocusPolicy(Qt.FocusPolicy.NoFocus)
+        self._results.itemActivated.connect(self._activate_item)
+        self._results.itemClicked.connect(self._activate_item)
+        layout.addWidget(self._results)
+
+        self.window_toggle_signal.connect(self.toggle_window)
+
+        self._apply_scale()
+        ui_scale.changed.connect(self._apply_scale)
+
+    def _apply_scale(self) -> None:
+        self.layout().setContentsMargins(x := scaled(15), x, x, x)
+        self.layout().setSpacing(scaled(10))
+        self._entry.setFixedWidth(scaled(500))
+        self._results.setFont(get_font(size=scaled(12)))
+        self._results.setStyleSheet(results_style())
+        self._results.setFixedHeight(scaled(300))
+
+    def toggle_window(self) -> None:
+        if self.isHidden():
+            self._entry.clear()
+            self._update_results("")
+            self.show()
+            self.shadow_layer.adjustSize()
+            self._move_to_cursor_screen()
+            self.shadow_layer.activateWindow()
+            self._entry.setFocus()
+        else:
+            self.hide()
+
+    def _move_to_cursor_screen(self) -> None:
+        screen = QApplication.screenAt(QCursor.pos()) or QApplication.primaryScreen()
+        geometry = screen.availableGeometry()
+        self.shadow_layer.move(geometry.center().x() - self.shadow_layer.width() // 2,
+                               geometry.top() + geometry.height() // 5)
+
+    def _update_results(self, query: str) -> None:
+        if query.strip():
+            self._entries = search_index.search(query, RESULTS_LIMIT)
+        else:
+            self._entries = search_index.suggestions(SUGGESTIONS_LIMIT)
+        self._results.clear()
+        for entry in self._entries:
+            item = QListWidgetItem(f"{entry.title}  ({entry.kind})")
+            if entry.subtitle:
+                item.setToolTip(entry.subtitle)
+            self._results.addItem(item)
+        if self._entries:
+            self._results.setCurrentRow(0)
+
+    def _activate_item(self, item: QListWidgetItem) -> None:
+        self._activate(self._results.row(item))
+
+    def _activate(self, row: int) -> None:
+        if not 0 <= row < len(self._entries):
+            return
+        entry = self._entries[row]
+        self.hide()
+        entry.action()
+
+    def _entry_key_press_event(self, event: QKeyEvent) -> None:
+        key = event.key()
+        if key in (Qt.Key.Key_Enter, Qt.Key.Key_Return):
+            self._activate(self._results.currentRow())
+        elif key == Qt.Key.Key_Escape:
+            self.hide()
+        elif key in (Qt.Key.Key_Down, Qt.Key.Key_Up):
+            step = 1 if key == Qt.Key.Key_Down else -1
+            if count := self._results.count():
+                self._results.setCurrentRow((self._results.currentRow() + step) % count)
+        else:
+            Entry.keyPressEvent(self._entry, event)
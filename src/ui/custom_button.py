@@ -12,22 +12,28 @@ from PyQt5.QtGui import (
 
 from FileSystem import icon as icon_path
 from .utils import get_font
-from settings import CORNER_RADIUS, UI_SCALE
+from settings import CORNER_RADIUS, ui_scale, apply_ui_scale as scaled
 
 
+# sizes of the buttons before scaling. use button_size to get the scaled size.
 BUTTON_SIZE = {
-    "radial": QSize(int(28 * UI_SCALE), int(28 * UI_SCALE)),
-    "long": QSize(int(104 * UI_SCALE), int(28 * UI_SCALE)),
+    "radial": QSize(28, 28),
+    "long": QSize(104, 28),
 }
 
 
+def button_size(button_type: Literal["long", "radial"]) -> QSize:
+    return scaled(BUTTON_SIZE[button_type])
+
+
 class Button(QPushButton):
     def __init__(self, parent: Optional[QWidget] = None,
                  button_type: Literal["long", "radial"] = "radial",
                  custom_size: QSize = None):
         super().__init__(parent=parent)
         
-        self._size = custom_size if custom_size is not None else BUTTON_SIZE[button_type]
+        self._custom_size = custom_size is not None
+        self._size = custom_size if custom_size is not None else button_size(button_type)
         self._button_type = button_type
         self.animate = False
         
@@ -39,6 +45,16 @@ class Button(QPushButton):
         self.animation.valueChanged.connect(self.set_size)
         self.easing_curve = QEasingCurve.OutBack
         self.duration = 500
+        
+        ui_scale.changed.connect(self._apply_scale)
+
+    def _apply_scale(self) -> None:
+        # custom sizes and sizes that are changed after creating the button are left to the owner.
+        if self._custom_size or self.size() != self._size:
+            return
+        self._size = button_size(self._button_type)
+        self.setFixedSize(self._size)
+        self.setIconSize(self._size)
 
     def set_icons(self, icon_name: str) -> None:
         suffix = ("_long" if self._button_type == "long" else "") + ".png"
@@ -117,10 +133,15 @@ class TextButton(QPushButton):
                  text: str = "Text Button"):
         super().__init__(parent, text=text)
         self.setCursor(Qt.PointingHandCursor)
-        self._x_padding = int(35 * UI_SCALE)
-        self._y_padding = int(7 * UI_SCALE)
-        self.setFont(get_font(size=int(16 * UI_SCALE)))
         self.setStyleSheet("color: #282828")
+        self._apply_scale()
+        ui_scale.changed.connect(self._apply_scale)
+
+    def _apply_scale(self) -> None:
+        self._x_padding = scaled(35)
+        self._y_padding = scaled(7)
+        self.setFont(get_font(size=scaled(16)))
+        self.updateGeometry()
         
     def sizeHint(self):
         font_metrics = QFontMetrics(self.font())
@@ -135,6 +156,6 @@ class TextButton(QPushButton):
         painter.setRenderHint(QPainter.Antialiasing)
         painter.setPen(Qt.NoPen)
         painter.setBrush(QColor("#DADADA" if self.underMouse() else "#ECECEC"))
-        painter.drawRoundedRect(self.rect(), CORNER_RADIUS * UI_SCALE, CORNER_RADIUS * UI_SCALE)
+        painter.drawRoundedRect(self.rect(), scaled(float(CORNER_RADIUS)), scaled(float(CORNER_RADIUS)))
         painter.setPen(self.palette().buttonText().color())
         painter.drawText(self.rect(), Qt.AlignCenter, self.text())
@@ -9,7 +9,7 @@ from PyQt5.QtWidgets import (
 from PyQt5.QtGui import QKeyEvent, QShowEvent
 
 
-from settings import UI_SCALE
+from settings import apply_ui_scale as scaled
 from .custom_button import RedButton, GrnButton
 from .utils import get_font
 
@@ -29,7 +29,7 @@ class BaseDialog(QDialog):
         
         self._title = QLabel(title, self)
         self._layout.addWidget(self._title)
-        self._title.setFont(get_font(size=int(24 * UI_SCALE), weight="semibold"))
+        self._title.setFont(get_font(size=scaled(24), weight="semibold"))
         self._title.setStyleSheet("color: #282828")
         self._title.setAlignment(Qt.AlignCenter)
         
@@ -41,7 +41,7 @@ class BaseDialog(QDialog):
         
         button_layout.addStretch()
         button_layout.addWidget(reject_button:=RedButton(self, "long"))
-        button_layout.addSpacing(int(7 * UI_SCALE))
+        button_layout.addSpacing(scaled(7))
         button_layout.addWidget(accept_button:=GrnButton(self, "long"))
         button_layout.addStretch()
         accept_button.clicked.connect(lambda : self.accept())
@@ -78,5 +78,5 @@ class ConfirmationDialog(BaseDialog):
     def __init__(self, title: str = "Title", parent: QWidget | None = None) -> None:
         super().__init__(title, parent)
         
-        self._title.setFont(get_font(size=int(16 * UI_SCALE)))
+        self._title.setFont(get_font(size=scaled(16)))
         self._title.setStyleSheet("color: #282828")
@@ -1,13 +1,14 @@
 from PyQt5.QtWidgets import QLineEdit, QWidget
-from settings import CORNER_RADIUS, UI_SCALE
+from settings import CORNER_RADIUS, ui_scale, apply_ui_scale as scaled
 from .utils import get_font
 
 
-ENTRY_BOX_STYLE = f"""
+def entry_box_style() -> str:
+    return f"""
     background-color: #DADADA;
-    border-radius: {CORNER_RADIUS * UI_SCALE}px;
-    padding-left: {int((27 - 4) * UI_SCALE)}px;
-    padding-right: {int((27 - 4) * UI_SCALE)}px;
+    border-radius: {scaled(float(CORNER_RADIUS))}px;
+    padding-left: {scaled(27 - 4)}px;
+    padding-right: {scaled(27 - 4)}px;
     """
 
 
@@ -15,7 +16,10 @@ class Entry(QLineEdit):
     def __init__(self, parent: QWidget = None, place_holder: str = "Text") -> None:
         super().__init__(parent)
         self.setPlaceholderText(place_holder)
-        self.setFixedSize(int(200 * UI_SCALE), int(40 * UI_SCALE))
-        self.setFont(get_font(size=int(16 * UI_SCALE)))
-        self.setStyleSheet("color: #282828")
-        self.setStyleSheet(ENTRY_BOX_STYLE)
+        self._apply_scale()
+        ui_scale.changed.connect(self._apply_scale)
+
+    def _apply_scale(self) -> None:
+        self.setFixedSize(scaled(200), scaled(40))
+        self.setFont(get_font(size=scaled(16)))
+        self.setStyleSheet(entry_box_style())
@@ -19,7 +19,7 @@ from PyQt5.QtGui import (
 
 
 from .custom_button import RedButton, GrnButton, Button
-from settings import CORNER_RADIUS, UI_SCALE
+from settings import CORNER_RADIUS, apply_ui_scale as scaled
 
 
 class Buddy(QWidget):
@@ -28,17 +28,17 @@ class Buddy(QWidget):
         self.setAttribute(Qt.WA_TranslucentBackground)
         
         self.setLayout(layout:=QVBoxLayout(self))
-        layout.setContentsMargins(int(10 * UI_SCALE), int(10 * UI_SCALE), int(10 * UI_SCALE), int(10 * UI_SCALE))
+        layout.setContentsMargins(scaled(10), scaled(10), scaled(10), scaled(10))
         layout.setSpacing(0)
         
         layout.addLayout(eye_layout:=QHBoxLayout())
         eye_layout.addWidget(l_button:=RedButton(self))
-        eye_layout.addSpacing(int(12 * UI_SCALE))
+        eye_layout.addSpacing(scaled(12))
         eye_layout.addWidget(r_button:=GrnButton(self))
 
-        layout.addSpacing(int(10 * UI_SCALE))
+        layout.addSpacing(scaled(10))
 
-        layout.addWidget(smile:=Button(self, custom_size=QSize(int(47 * UI_SCALE), int(18 * UI_SCALE))), alignment=Qt.AlignCenter)
+        layout.addWidget(smile:=Button(self, custom_size=QSize(scaled(47), scaled(18))), alignment=Qt.AlignCenter)
         smile.set_icons("edit_button")
         
         smile.clicked.connect(self.spawn)
@@ -56,7 +56,7 @@ class Buddy(QWidget):
     def spawn(self) -> None:
         pos = self.pos()
         self._spawner.setStartValue(pos)
-        pos.setY(pos.y()-int(100 * UI_SCALE))
+        pos.setY(pos.y()-scaled(100))
         self._spawner.setEndValue(pos)
         self._spawner.start()
 
@@ -58,7 +58,8 @@ class HotKeys:
         Args:
             shortcut (str): The key combination of the global shortcut for which the callback functions need to be called.
         """
-        (func() for func in HotKeys._shortcuts_and_callbacks[shortcut])
+        for func in HotKeys._shortcuts_and_callbacks[shortcut]:
+            func()
 
 
     @staticmethod
@@ -0,0 +1,179 @@
+import io
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from addons.shortcuts import bookmarks
+from addons.shortcuts import shortcuts_save as Data
+
+
+NETSCAPE = """<!DOCTYPE NETSCAPE-Bookmark-file-1>
+<META HTTP-EQUIV="Content-Type" CONTENT="text/html; charset=UTF-8">
+<TITLE>Bookmarks</TITLE>
+<H1>Bookmarks</H1>
+<DL><p>
+    <DT><A HREF="https://top.example/">Top &amp; level</A>
+    <DT><H3 ADD_DATE="1">Work</H3>
+    <DL><p>
+        <DT><A HREF="https://mail.example/?a=1&amp;b=2">Mail</A>
+        <DT><H3>Docs</H3>
+        <DL><p>
+            <DT><A HREF="https://docs.example/">Docs</A>
+        </DL><p>
+        <DT><A HREF="javascript:alert(1)">Bookmarklet</A>
+        <DT><A HREF="https://tracker.example/">Tracker</A>
+    </DL><p>
+</DL><p>
+"""
+
+CHROMIUM = {
+    "checksum": "0",
+    "roots": {
+        "bookmark_bar": {"name": "Bookmarks bar", "type": "folder", "children": [
+            {"name": "News", "type": "url", "url": "https://news.example/"},
+            {"name": "Dev", "type": "folder", "children": [
+                {"name": "Repo", "type": "url", "url": "https://repo.example/"}]}]},
+        "other": {"name": "Other bookmarks", "type": "folder", "children": []},
+        "synced": {"name": "Mobile bookmarks", "type": "folder", "children": [
+            {"name": "Phone", "type": "url", "url": "https://phone.example/"}]},
+    },
+    "version": 1,
+}
+
+FIREFOX = {
+    "guid": "root________", "title": "", "type": "text/x-moz-place-container", "root": "placesRoot", "children": [
+        {"guid": "menu________", "title": "menu", "type": "text/x-moz-place-container", "children": [
+            {"title": "Wiki", "type": "text/x-moz-place", "uri": "https://wiki.example/"},
+            {"title": "Recent", "type": "text/x-moz-place", "uri": "place:sort=8&maxResults=10"},
+            {"type": "text/x-moz-place-separator"}]},
+        {"guid": "toolbar_____", "title": "toolbar", "type": "text/x-moz-place-container", "children": [
+            {"title": "Tools", "type": "text/x-moz-place-container", "children": [
+                {"title": "Calc", "type": "text/x-moz-place", "uri": "https://calc.example/"}]}]},
+    ],
+}
+
+
+class TestReadBookmarks(unittest.TestCase):
+    def test_netscape(self):
+        expected = [
+            ((), "Top & level", "https://top.example/"),
+            (("Work",), "Mail", "https://mail.example/?a=1&b=2"),
+            (("Work", "Docs"), "Docs", "https://docs.example/"),
+            (("Work",), "Bookmarklet", "javascript:alert(1)"),
+            (("Work",), "Tracker", "https://tracker.example/"),
+        ]
+        self.assertEqual(list(bookmarks.read_bookmarks(io.StringIO(NETSCAPE))), expected)
+        # tags and entities cut by the chunks
+        with mock.patch.object(bookmarks, "CHUNK_SIZE", 7):
+            self.assertEqual(list(bookmarks.read_bookmarks(io.StringIO(NETSCAPE))), expected)
+
+    def test_chromium(self):
+        self.assertEqual(list(bookmarks.read_bookmarks(io.StringIO(json.dumps(CHROMIUM)))), [
+            (("Bookmarks bar",), "News", "https://news.example/"),
+            (("Bookmarks bar", "Dev"), "Repo", "https://repo.example/"),
+            (("Mobile bookmarks",), "Phone", "https://phone.example/"),
+        ])
+
+    def test_firefox(self):
+        self.assertEqual(list(bookmarks.read_bookmarks(io.StringIO(json.dumps(FIREFOX)))), [
+            (("Bookmarks Menu",), "Wiki", "https://wiki.example/"),
+            (("Bookmarks Menu",), "Recent", "place:sort=8&maxResults=10"),
+            (("Bookmarks Toolbar", "Tools"), "Calc", "https://calc.example/"),
+        ])
+
+    def test_other_json(self):
+        with self.assertRaises(ValueError):
+            bookmarks.read_bookmarks(io.StringIO('{"groups": {}}'))
+
+    def test_broken_json(self):
+        chromium = {"roots": {"bookmark_bar": {"name": "Bar", "children": [
+            "x", None, {"type": "url", "name": 7, "url": "https://a.example/"}, {"name": "Sub", "children": 3}]},
+            "other": None}}
+        self.assertEqual(list(bookmarks.read_bookmarks(io.StringIO(json.dumps(chromium)))),
+                         [(("Bar",), "", "https://a.example/")])
+        firefox = {"type": "text/x-moz-place-container", "children": [
+            None, {"guid": "menu________", "type": "text/x-moz-place-container", "children": [
+                None, {"type": "text/x-moz-place", "title": "Wiki", "uri": None},
+                {"type": "text/x-moz-place", "title": "Docs", "uri": "https://docs.example/"}]},
+            {"type": "text/x-moz-place-container", "title": ["x"], "children": {"a": 1}}]}
+        self.assertEqual(list(bookmarks.read_bookmarks(io.StringIO(json.dumps(firefox)))), [
+            (("Bookmarks Menu",), "Wiki", ""),
+            (("Bookmarks Menu",), "Docs", "https://docs.example/"),
+        ])
+
+
+class TestImport(unittest.TestCase):
+    def setUp(self):
+        self._file_path = Data.FILE_PATH
+        self.directory = tempfile.TemporaryDirectory()
+        Data.FILE_PATH = os.path.join(self.directory.name, "save.json")
+        with open(Data.FILE_PATH, "w") as save_file:
+            save_file.write('{"settings": {}, "groups": {}, "tasks": {}}')
+        Data.GroupClass("existing", group_id="G_1", group_tasks=[])
+
+    def tearDown(self):
+        Data.FILE_PATH = self._file_path
+        self.directory.cleanup()
+
+    def _write(self, name, text):
+        path = os.path.join(self.directory.name, name)
+        with open(path, "w", encoding="utf-8") as file:
+            file.write(text)
+        return path
+
+    def test_import(self):
+        with mock.patch.object(Data.TaskClass, "verify_url_root") as verify:
+            result = bookmarks.import_bookmarks(self._write("bookmarks.html", NETSCAPE))
+        verify.assert_not_called()
+        self.assertEqual((result.task_count, result.skipped), (4, 1))
+        self.assertEqual([group.group_name for group, _ in result.groups], ["Imported Bookmarks", "Work", "Work / Docs"])
+
+        loaded = Data.load_all()
+        self.assertEqual([group.group_name for group, _ in loaded], ["existing", "Imported Bookmarks", "Work", "Work / Docs"])
+        group, tasks = loaded[2]
+        self.assertEqual([(task.task_name, task.url, task.button_text) for task in tasks],
+                         [("Mail", ["https://mail.example/?a=1&b=2"], "Open"), ("Tracker", ["https://tracker.example/"], "Open")])
+        self.assertEqual(group.group_tasks, [task.task_id for task in tasks])
+        self.assertEqual(Data.get_group_id_of_task(tasks[0].task_id), group.group_id)
+        self.assertIn("4 bookmarks", str(result))
+
+    def test_read_without_saving(self):
+        with mock.patch.object(Data, "save_groups") as save_groups:
+            result = bookmarks.read_bookmark_file(self._write("Bookmarks", json.dumps(CHROMIUM)), {"G_1"})
+        save_groups.assert_not_called()
+        self.assertEqual(result.task_count, 3)
+        self.assertEqual([group.group_name for group, _ in Data.load_all()], ["existing"])
+        bookmarks.save_import(result)
+        self.assertEqual([len(tasks) for _, tasks in Data.load_all()], [0, 1, 1, 1])
+
+    def test_single_write(self):
+        with mock.patch.object(Data, "save_groups", wraps=Data.save_groups) as save_groups:
+            bookmarks.import_bookmarks(self._write("Bookmarks", json.dumps(CHROMIUM)))
+        self.assertEqual(save_groups.call_count, 1)
+        self.assertFalse(os.path.exists(f"{Data.FILE_PATH}.tmp"))
+
+    def test_export(self):
+        bookmarks.import_bookmarks(self._write("places.json", json.dumps(FIREFOX)))
+        path = os.path.join(self.directory.name, "export.html")
+        self.assertEqual(bookmarks.export_bookmarks(path, Data.load_all()), 2)
+        with open(path) as file:
+            self.assertEqual(list(bookmarks.read_bookmarks(file)), [
+                (("Bookmarks Menu",), "Wiki", "https://wiki.example/"),
+                (("Bookmarks Toolbar / Tools",), "Calc", "https://calc.example/"),
+            ])
+
+    def test_ten_thousand(self):
+        folders = "".join(
+            f'<DT><H3>Folder {folder}</H3>\n<DL><p>\n' +
+            "".join(f'<DT><A HREF="https://host{folder}-{i}.example/page?id={i}">Page {i}</A>\n' for i in range(1000)) +
+            "</DL><p>\n" for folder in range(10))
+        path = self._write("big.html", f"<DL><p>\n{folders}</DL><p>\n")
+        result = bookmarks.import_bookmarks(path)
+        self.assertEqual((result.task_count, len(result.groups)), (10000, 10))
+        self.assertEqual(len({task.task_id for _, tasks in Data.load_all() for task in tasks}), 10000)
+
+
+if __name__ == "__main__":
+    unittest.main()
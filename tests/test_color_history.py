@@ -0,0 +1,76 @@
+import unittest
+
+from PyQt5.QtWidgets import QApplication
+
+from addons.colorpicker.color_history import ColorHistory, ColorHistoryModel
+from SaveFile import NotFoundException
+
+
+app = QApplication.instance() or QApplication([])
+
+
+class FakeStore:
+    """Stands in for the AddOnBase of the addon."""
+
+    def __init__(self, **settings):
+        self.settings = settings
+
+    def get_setting(self, name):
+        if name not in self.settings:
+            raise NotFoundException(name)
+        return self.settings[name]
+
+    def apply_setting(self, name, value):
+        self.settings[name] = value
+
+
+class TestColorHistory(unittest.TestCase):
+    def test_ring_buffer(self):
+        history = ColorHistory(3)
+        self.assertEqual(history.add("#000001"), (True, None))
+        self.assertEqual(history.add("#000001"), (False, None))
+        history.add("#000002")
+        history.add("#000003")
+        self.assertEqual(history.add("#000004"), (True, "#000001"))
+        self.assertEqual(list(history), ["#000004", "#000003", "#000002"])
+        self.assertNotIn("#000001", history)
+        # an evicted color can be added again
+        self.assertEqual(history.add("#000001"), (True, "#000002"))
+        self.assertEqual(history.remove(1), "#000004")
+        self.assertEqual(list(history), ["#000001", "#000003"])
+        self.assertEqual(history.pop_oldest(), "#000003")
+        self.assertEqual(list(history), ["#000001"])
+
+    def test_model_rows_and_persistence(self):
+        store = FakeStore(history_size=50, color_history=["#ff0000", "#00ff00", "invalid", 3])
+        model = ColorHistoryModel(store)
+        self.assertEqual(model.rowCount(), 2)
+        self.assertEqual(model.data(model.index(0), ColorHistoryModel.ColorRole), "#ff0000")
+
+        inserted, removed = [], []
+        model.rowsInserted.connect(lambda parent, first, last: inserted.append((first, last)))
+        model.rowsRemoved.connect(lambda parent, first, last: removed.append((first, last)))
+        for value in range(200):
+            model.add("#%06x" % value)
+        model.add("#0000c7")  # duplicate of the newest
+        self.assertEqual(model.rowCount(), 50)
+        # every color is one row inserted at the top, and one row removed at the bottom when full.
+        self.assertEqual(len(inserted), 200)
+        self.assertEqual(set(inserted), {(0, 0)})
+        self.assertEqual(set(removed), {(49, 49)})
+
+        model.save()
+        self.assertEqual(store.settings["color_history"][:2], ["#0000c7", "#0000c6"])
+        self.assertEqual(len(store.settings["color_history"]), 50)
+        self.assertEqual(list(ColorHistoryModel(store).history), store.settings["color_history"])
+
+    def test_default_settings(self):
+        model = ColorHistoryModel(FakeStore())
+        self.assertEqual(model.rowCount(), 0)
+        model.add("#123456")
+        model.clear()
+        self.assertEqual(model.rowCount(), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,63 @@
+import colorsys
+import unittest
+
+import numpy as np
+
+from addons.colorpicker import colorspace
+
+
+try:
+    from utils.colors import lighten_color
+except ImportError:  # the utils package imports pynput, which needs a display
+    lighten_color = None
+
+
+COLORS = np.random.default_rng(0).integers(0, 256, size=(2000, 3), dtype=np.uint8)
+# the corners of the rgb cube and the grays have the special cases of the hue.
+EDGE_COLORS = np.array([[r, g, b] for r in (0, 128, 255) for g in (0, 128, 255) for b in (0, 128, 255)],
+                       dtype=np.uint8)
+
+
+class TestColorSpace(unittest.TestCase):
+    def test_matches_colorsys(self):
+        colors = np.concatenate((EDGE_COLORS, COLORS[:2000]))
+        hsv, hls = colorspace.rgb_to_hsv(colors), colorspace.rgb_to_hls(colors)
+        for color, color_hsv, color_hls in zip(colors.tolist(), hsv, hls):
+            unit = [channel / 255 for channel in color]
+            np.testing.assert_allclose(color_hsv, colorsys.rgb_to_hsv(*unit), atol=1e-9)
+            np.testing.assert_allclose(color_hls, colorsys.rgb_to_hls(*unit), atol=1e-9)
+        np.testing.assert_array_equal(colorspace.to_rgb8(colorspace.hsv_to_rgb(hsv)), colors)
+        np.testing.assert_array_equal(colorspace.to_rgb8(colorspace.hls_to_rgb(hls)), colors)
+
+    def test_scalar_path(self):
+        self.assertEqual(colorspace.rgb_to_hsv((255, 0, 0)), (0.0, 1.0, 1.0))
+        self.assertEqual(colorspace.to_rgb8(colorspace.hsv_to_rgb((2 / 3, 1.0, 1.0))), (0, 0, 255))
+        self.assertEqual(colorspace.hex_to_rgb("#12aBcd"), (0x12, 0xab, 0xcd))
+        self.assertEqual(colorspace.rgb_to_hex((18, 171, 205)), "#12abcd")
+        self.assertEqual(colorspace.lighten((0x33, 0x66, 0x99), 0.2), (0x66, 0x99, 0xcc))
+
+    def test_hex(self):
+        colors = COLORS[:1000]
+        hex_colors = colorspace.rgb_to_hex(colors)
+        self.assertEqual(hex_colors[:3], ["#%02x%02x%02x" % tuple(color) for color in colors[:3].tolist()])
+        np.testing.assert_array_equal(colorspace.hex_to_rgb(hex_colors), colors)
+        np.testing.assert_array_equal(colorspace.hex_to_rgb(["FFFFFF", "#000000"]), [[255, 255, 255], [0, 0, 0]])
+        with self.assertRaises(ValueError):
+            colorspace.hex_to_rgb(["#12345g"])
+        with self.assertRaises(ValueError):
+            colorspace.hex_to_rgb("#123")
+
+    @unittest.skipIf(lighten_color is None, "utils can't be imported without a display")
+    def test_lighten_matches_utils(self):
+        colors = COLORS[:500]
+        for amount in (0.1, 0.5):
+            lightened = colorspace.rgb_to_hex(colorspace.lighten(colors, amount))
+            for color, light in zip(colorspace.rgb_to_hex(colors), lightened):
+                self.assertEqual(light, lighten_color(color[1:], amount))
+            # the array and scalar paths can round a channel that ends in .5 differently.
+            darkened = colorspace.darken(colors, amount).astype(int)
+            np.testing.assert_allclose(darkened, [colorspace.darken(tuple(color), amount) for color in colors.tolist()],
+                                       atol=1)
+
+if __name__ == "__main__":
+    unittest.main()
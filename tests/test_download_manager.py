@@ -0,0 +1,170 @@
+import threading
+import time
+import unittest
+from unittest import mock
+
+from PyQt5.QtWidgets import QApplication
+
+from addons.youtube_downloader.download_manager import (
+    DownloadManager,
+    DownloadJob,
+    HostRateLimiter,
+    FINISHED,
+    FAILED,
+    CANCELLED,
+    PAUSED,
+    SPEED_SMOOTHING,
+    format_speed,
+    format_eta,
+)
+
+
+app = QApplication.instance() or QApplication([])
+
+
+def wait_until(condition, timeout=5.0):
+    end = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > end:
+            raise TimeoutError
+        app.processEvents()
+        time.sleep(0.005)
+
+
+def fake_download(job: DownloadJob):
+    if job.url == "broken":
+        raise ValueError("broken url")
+    total = 1000
+    for downloaded in range(0, total + 1, 10):
+        time.sleep(0.001)
+        job.checkpoint(downloaded, total)
+
+
+class TestDownloadManager(unittest.TestCase):
+    def setUp(self):
+        self.manager = DownloadManager(fake_download, max_workers=2, rate_limiter=HostRateLimiter(0))
+        self.progress = []
+        self.manager.progress.connect(lambda *args: self.progress.append(args))
+
+    def tearDown(self):
+        self.manager.shutdown()
+
+    def test_downloads_in_parallel(self):
+        jobs = [self.manager.add(f"url{i}", "", "mp4", "720p") for i in range(4)]
+        jobs.append(self.manager.add("broken", "", "mp4", "720p"))
+        wait_until(lambda: not any(job.active for job in jobs))
+        self.assertEqual([job.state for job in jobs], [FINISHED] * 4 + [FAILED])
+        self.assertEqual(jobs[-1].error, "broken url")
+
+        wait_until(lambda: (jobs[0].id, 1000, 1000) in self.progress)
+        # 101 checkpoints of ~1 ms, only a few of them reach the UI.
+        self.assertLess(len([p for p in self.progress if p[0] == jobs[0].id]), 30)
+
+    def test_pause_resume_cancel(self):
+        job = self.manager.add("url", "", "mp4", "720p")
+        self.manager.pause(job.id)
+        wait_until(lambda: job.state == PAUSED)
+        downloaded = job.downloaded
+        time.sleep(0.05)
+        self.assertEqual(job.downloaded, downloaded)
+
+        self.manager.resume(job.id)
+        wait_until(lambda: job.downloaded > downloaded)
+        self.manager.cancel(job.id)
+        wait_until(lambda: not job.active)
+        self.assertEqual(job.state, CANCELLED)
+        self.assertLess(job.downloaded, 1000)
+
+    def test_cancel_queued_job(self):
+        blocker = threading.Event()
+        manager = DownloadManager(lambda job: blocker.wait(), max_workers=1, rate_limiter=HostRateLimiter(0))
+        running = manager.add("first", "", "mp4", "720p")
+        queued = manager.add("second", "", "mp4", "720p")
+        manager.cancel(queued.id)
+        self.assertEqual(queued.state, CANCELLED)
+        blocker.set()
+        wait_until(lambda: running.state == FINISHED)
+        self.assertEqual(queued.state, CANCELLED)
+        manager.shutdown()
+
+    def test_concurrency_limit(self):
+        running, peak = [0], [0]
+        lock = threading.Lock()
+
+        def download(job):
+            with lock:
+                running[0] += 1
+                peak[0] = max(peak[0], running[0])
+            time.sleep(0.02)
+            with lock:
+                running[0] -= 1
+
+        manager = DownloadManager(download, max_workers=1, rate_limiter=HostRateLimiter(0))
+        jobs = [manager.add(f"url{i}", "", "mp4", "720p") for i in range(4)]
+        wait_until(lambda: not any(job.active for job in jobs))
+        self.assertEqual(peak[0], 1)
+
+        manager.set_max_workers(3)
+        jobs = [manager.add(f"url{i}", "", "mp4", "720p") for i in range(6)]
+        wait_until(lambda: not any(job.active for job in jobs))
+        self.assertEqual(peak[0], 3)
+        manager.shutdown()
+
+    def test_speed_and_eta(self):
+        release = threading.Event()
+        manager = DownloadManager(lambda job: release.wait(), rate_limiter=HostRateLimiter(0))
+        updates = []
+        manager.progress.connect(lambda *args: updates.append(args))
+        job = manager.add("url", "", "mp4", "720p")
+        wait_until(lambda: job.id in manager._running_jobs)
+
+        # the samples are taken at the times of a fake clock.
+        now = [0.0]
+        with mock.patch("addons.youtube_downloader.download_manager.monotonic", lambda: now[0]):
+            job._sample = (0.0, 0)
+            job.downloaded, job.total = 100_000, 400_000
+            now[0] = 1.0
+            manager._sample_progress()
+            self.assertEqual(job.speed, 100_000)
+            self.assertEqual(job.eta, 3.0)
+
+            job.downloaded = 150_000
+            now[0] = 2.0
+            manager._sample_progress()
+            self.assertAlmostEqual(job.speed, SPEED_SMOOTHING * 50_000 + (1 - SPEED_SMOOTHING) * 100_000)
+            self.assertAlmostEqual(job.eta, 250_000 / job.speed)
+
+            # a sample without progress slows the speed down and emits nothing.
+            now[0] = 3.0
+            manager._sample_progress()
+            self.assertAlmostEqual(job.speed, (1 - SPEED_SMOOTHING) ** 2 * 100_000
+                                   + (1 - SPEED_SMOOTHING) * SPEED_SMOOTHING * 50_000)
+            manager._sample_progress()  # no time passed
+        self.assertEqual(updates, [(job.id, 100_000, 400_000), (job.id, 150_000, 400_000)])
+
+        release.set()
+        wait_until(lambda: job.state == FINISHED)
+        wait_until(lambda: updates[-1] == (job.id, 150_000, 400_000) and len(updates) == 3)
+        manager.shutdown()
+
+    def test_format(self):
+        self.assertEqual(format_speed(512), "512 B/s")
+        self.assertEqual(format_speed(3 * 1024 * 1024), "3.0 MB/s")
+        self.assertEqual(format_eta(-1), "--:--")
+        self.assertEqual(format_eta(75), "1:15")
+        self.assertEqual(format_eta(3725), "1:02:05")
+
+
+class TestHostRateLimiter(unittest.TestCase):
+    def test_interval_per_host(self):
+        limiter = HostRateLimiter(0.05)
+        start = time.monotonic()
+        for _ in range(3):
+            limiter.wait("https://www.youtube.com/watch?v=1")
+        limiter.wait("https://example.com/video")
+        # the third start from youtube.com waits two intervals, example.com doesn't wait.
+        self.assertGreaterEqual(time.monotonic() - start, 0.1)
+
+
+if __name__ == "__main__":
+    unittest.main()
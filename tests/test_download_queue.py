@@ -0,0 +1,81 @@
+import os
+import tempfile
+import threading
+import unittest
+
+from PyQt5.QtCore import Qt
+from PyQt5.QtWidgets import QApplication
+
+from addons.youtube_downloader.download_manager import DownloadManager, HostRateLimiter, QUEUED, FAILED
+from addons.youtube_downloader.download_queue import DownloadQueueModel, parse_urls, is_playlist_url
+
+
+app = QApplication.instance() or QApplication([])
+
+
+class TestParsing(unittest.TestCase):
+    def test_parse_urls(self):
+        text = """https://www.youtube.com/watch?v=aaaaaaaaaaa, https://youtu.be/bbbbbbbbbbb
+        not a url
+        https://www.youtube.com/watch?v=aaaaaaaaaaa\thttps://www.youtube.com/playlist?list=PL123"""
+        self.assertEqual(parse_urls(text), [
+            "https://www.youtube.com/watch?v=aaaaaaaaaaa",
+            "https://youtu.be/bbbbbbbbbbb",
+            "https://www.youtube.com/playlist?list=PL123",
+        ])
+
+    def test_is_playlist_url(self):
+        self.assertTrue(is_playlist_url("https://www.youtube.com/playlist?list=PL123"))
+        self.assertFalse(is_playlist_url("https://www.youtube.com/watch?v=aaaaaaaaaaa&list=PL123"))
+
+
+class TestDownloadQueueModel(unittest.TestCase):
+    def setUp(self):
+        self.release = threading.Event()
+        self.manager = DownloadManager(lambda job: self.release.wait(), max_workers=1,
+                                       rate_limiter=HostRateLimiter(0))
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "queue.json")
+
+    def tearDown(self):
+        self.release.set()
+        self.manager.shutdown()
+        self.directory.cleanup()
+
+    def test_many_jobs_and_persistence(self):
+        model = DownloadQueueModel(self.manager, self.path)
+        urls = [f"https://www.youtube.com/watch?v={i:011d}" for i in range(500)]
+        model.add_urls(urls, "downloads", "mp4", "highest")
+        self.assertEqual(model.rowCount(), 500)
+        self.assertEqual(model.index(499).data(), f"{urls[499]}  —  {QUEUED}")
+        job_id = model.index(0).data(DownloadQueueModel.JobIdRole)
+        self.assertEqual(self.manager.job(job_id).url, urls[0])
+
+        model.save()
+        self.manager.cancel(model.index(1).data(DownloadQueueModel.JobIdRole))
+        model.clear_inactive()
+        self.assertEqual(model.rowCount(), 499)
+
+        # a new model (the next start of the app) queues the saved jobs again.
+        self.assertEqual(DownloadQueueModel(self.manager, self.path).load(), 1)
+        restored = DownloadQueueModel(self.manager, self.path)
+        restored.load()
+        self.assertEqual(restored.rowCount(), 500)
+        self.assertEqual(restored.jobs()[0].resolution, "highest")
+
+    def test_failed_playlist(self):
+        model = DownloadQueueModel(self.manager, self.path)
+        playlist = "https://www.youtube.com/playlist?list=PL123"
+        model.add_failed(playlist, "offline")
+        self.assertEqual(model.rowCount(), 1)
+        self.assertEqual(model.index(0).data(), f"{playlist}  —  {FAILED}")
+        self.assertEqual(model.index(0).data(Qt.ItemDataRole.ToolTipRole), "offline")
+        model.save()
+        self.assertEqual(DownloadQueueModel(self.manager, self.path).load(), 1)
+        restored = DownloadQueueModel(self.manager, self.path)
+        restored.load()
+        self.assertEqual(restored.rowCount(), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
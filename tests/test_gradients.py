@@ -0,0 +1,43 @@
+import unittest
+
+from PyQt5.QtGui import QColor
+
+from addons.colorpicker.vcolorpicker.gradients import hue_bucket, sv_image, hue_image, HUE_BUCKETS, SV_SIZE
+
+
+def color_at(image, x, y):
+    return QColor(image.pixel(x, y)).getRgb()[:3]
+
+
+class TestGradients(unittest.TestCase):
+    def test_hue_bucket(self):
+        self.assertEqual(hue_bucket(0), 0)
+        self.assertEqual(hue_bucket(100), 0)  # red at both ends
+        self.assertEqual(hue_bucket(50), HUE_BUCKETS // 2)
+        self.assertEqual(hue_bucket(-3), 0)
+        # neighbouring positions of the hue selector (1.85 pixels per hue) get their own bucket.
+        self.assertNotEqual(hue_bucket(100 - 100 / 1.85), hue_bucket(100 - 101 / 1.85))
+
+    def test_sv_image(self):
+        image = sv_image(hue_bucket(100 / 3))  # green
+        self.assertTrue(all(channel > 250 for channel in color_at(image, 0, 0)))
+        red, green, blue = color_at(image, SV_SIZE - 1, 0)
+        self.assertLess(max(red, blue), 5)
+        self.assertGreater(green, 250)
+        self.assertTrue(all(channel < 5 for channel in color_at(image, SV_SIZE // 2, SV_SIZE - 1)))
+
+    def test_cached(self):
+        self.assertIs(sv_image(7), sv_image(7))
+        self.assertIsNot(sv_image(7), sv_image(8))
+        self.assertIs(hue_image(20, 200), hue_image(20, 200))
+
+    def test_hue_image(self):
+        image = hue_image(20, 200)
+        self.assertEqual(color_at(image, 10, 199)[0], 255)  # red at the bottom
+        red, green, blue = color_at(image, 10, 100)  # cyan in the middle
+        self.assertLess(red, 10)
+        self.assertGreater(min(green, blue), 245)
+
+
+if __name__ == "__main__":
+    unittest.main()
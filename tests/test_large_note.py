@@ -0,0 +1,130 @@
+import os
+import random
+import tempfile
+import time
+import unittest
+
+from PyQt5.QtGui import QTextCursor
+from PyQt5.QtWidgets import QApplication
+
+from addons.notes.large_note import LargeNote, LargeNoteEdit, PieceTable, WINDOW_SIZE, read_head
+
+
+app = QApplication.instance() or QApplication([])
+
+
+class TestPieceTable(unittest.TestCase):
+    def test_random_edits(self):
+        rng = random.Random(0)
+        expected = bytearray(b"0123456789" * 100)
+        table = PieceTable(bytes(expected))
+        for _ in range(2000):
+            start = rng.randint(0, len(expected))
+            length = rng.randint(0, min(20, len(expected) - start))
+            data = bytes(rng.choice(b"abcxyz") for _ in range(rng.randint(0, 20)))
+            table.replace(start, length, data)
+            expected[start:start + length] = data
+            self.assertEqual(len(table), len(expected))
+        self.assertEqual(table.read(0, len(table)), bytes(expected))
+        self.assertEqual(b"".join(table.iter_chunks(7)), bytes(expected))
+        self.assertEqual(table.read(10, 30), bytes(expected[10:40]))
+
+    def test_out_of_range(self):
+        table = PieceTable(b"abc")
+        with self.assertRaises(ValueError):
+            table.replace(2, 5, b"")
+        table = PieceTable()
+        table.replace(0, 0, b"new")
+        self.assertEqual(table.read(0, 10), b"new")
+
+
+class TestLargeNote(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "log.txt")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def _write(self, data: bytes):
+        with open(self.path, "wb") as file:
+            file.write(data)
+
+    def _read(self):
+        with open(self.path, "rb") as file:
+            return file.read()
+
+    def test_journal_and_compaction(self):
+        self._write(b"first line\nsecond line\n")
+        note = LargeNote(self.path)
+        note.replace(0, 5, b"1st")
+        note.close(compact=False)
+        self.assertEqual(self._read(), b"first line\nsecond line\n")
+
+        # the edits are replayed from the journal, a broken record at the end is dropped.
+        with open(self.path + ".delta", "ab") as journal:
+            journal.write(b"\x01\x02")
+        note = LargeNote(self.path)
+        self.assertEqual(note.read(0, len(note)), b"1st line\nsecond line\n")
+        self.assertEqual(note.line_start(12), 9)
+        self.assertEqual(note.line_end(12), len(note))
+        note.close()
+        self.assertEqual(self._read(), b"1st line\nsecond line\n")
+        self.assertFalse(os.path.exists(self.path + ".delta"))
+
+    def test_read_head(self):
+        self._write(b"first line\nsecond line\n")
+        self.assertEqual(read_head(self.path, 5), b"first")
+        self.assertFalse(os.path.exists(self.path + ".delta"))
+        note = LargeNote(self.path)
+        note.replace(0, 5, b"1st")
+        note.close(compact=False)
+        self.assertEqual(read_head(self.path, 8), b"1st line")
+        self.assertTrue(os.path.exists(self.path + ".delta"))
+
+    def test_windows_of_note(self):
+        line = b"2024-01-01 00:00:00 INFO something happened in the application\n"
+        self._write(line * (4 * WINDOW_SIZE // len(line)))
+        note = LargeNote(self.path)
+        edit = LargeNoteEdit(note)
+        size = len(note)
+        for position in range(0, size, size // 10):
+            edit.show_window(position)
+            text = edit.text_edit.toPlainText()
+            self.assertLessEqual(len(text), WINDOW_SIZE + len(line))
+            self.assertTrue(text.startswith(line.decode()))
+
+        committed = []
+        edit.committed.connect(committed.append)
+        edit.show_window(size // 2)
+        edit.commit()
+        self.assertEqual(committed, [])
+        edit.text_edit.moveCursor(QTextCursor.Start)
+        edit.text_edit.insertPlainText("edited\n")
+        edit.commit()
+        self.assertEqual(committed, [edit._window_start])
+        self.assertEqual(len(note), size + 7)
+        edit.close_note()
+        self.assertEqual(os.path.getsize(self.path), size + 7)
+
+    def test_typing_is_committed(self):
+        self._write(b"first line\nsecond line\n")
+        note = LargeNote(self.path)
+        edit = LargeNoteEdit(note)
+        committed = []
+        edit.committed.connect(committed.append)
+        edit.text_edit.moveCursor(QTextCursor.End)
+        edit.text_edit.insertPlainText("third")
+        edit.text_edit.insertPlainText(" line")
+        end = time.monotonic() + 5
+        while not committed and time.monotonic() < end:
+            app.processEvents()
+            time.sleep(0.005)
+        self.assertEqual(committed, [23])
+        # the edit is in the journal without closing the note.
+        self.assertEqual(read_head(self.path, 100), b"first line\nsecond line\nthird line")
+        note.close(compact=False)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,98 @@
+import unittest
+from unittest import mock
+
+from PyQt5.QtCore import QPoint
+from PyQt5.QtGui import QColor, QImage
+from PyQt5.QtWidgets import QApplication, QWidget
+
+from addons.colorpicker.magnifier import Magnifier, MagnifierView, MAGNIFIER_RADIUS, MAGNIFIER_SIZE, IDLE_INTERVAL
+
+
+app = QApplication.instance() or QApplication([])
+
+SIZE = 2 * MAGNIFIER_RADIUS + 1
+
+
+def solid_image(color):
+    image = QImage(SIZE, SIZE, QImage.Format_RGB32)
+    image.fill(QColor(color))
+    return image
+
+
+class TestMagnifierView(unittest.TestCase):
+    def _center(self, view):
+        # rendered over white, an opaque widget that doesn't paint all of itself leaves it showing.
+        image = QImage(MAGNIFIER_SIZE, MAGNIFIER_SIZE, QImage.Format_RGB32)
+        image.fill(QColor("white"))
+        view.render(image, flags=QWidget.RenderFlags())
+        return image.pixelColor(MAGNIFIER_SIZE // 2, MAGNIFIER_SIZE // 2).name()
+
+    def test_empty_view_is_filled(self):
+        self.assertEqual(self._center(MagnifierView()), "#000000")
+
+    def test_image_is_scaled_up(self):
+        view = MagnifierView()
+        view.set_image(solid_image("#ff0000"))
+        self.assertEqual(self._center(view), "#ff0000")
+
+
+class TestCaptureScheduling(unittest.TestCase):
+    def setUp(self):
+        self.position = QPoint(100, 100)
+        self.image = solid_image("#00ff00")
+        patchers = [
+            mock.patch("addons.colorpicker.magnifier.QCursor.pos", lambda: self.position),
+            mock.patch("addons.colorpicker.magnifier.grab_around", lambda position, radius: self.image),
+        ]
+        for patcher in patchers:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.magnifier = Magnifier()
+        self.magnifier.set_track_color(True)
+        self.magnifier._wake_up()
+        self.timer = self.magnifier.timer
+
+    def tearDown(self):
+        self.timer.stop()
+
+    def test_slows_down_when_nothing_changes(self):
+        self.magnifier.capture()
+        frame = self.magnifier._frame_interval
+        self.assertEqual(self.timer.interval(), frame)
+        self.assertEqual(self.magnifier.color, "#00ff00")
+
+        intervals = []
+        for _ in range(12):
+            self.magnifier.capture()
+            intervals.append(self.timer.interval())
+        self.assertEqual(intervals[:2], [frame * 2, frame * 4])
+        self.assertEqual(intervals[-1], IDLE_INTERVAL)
+        self.assertEqual(intervals, sorted(intervals))
+
+        # a change of the pixels under the still cursor.
+        self.image = solid_image("#0000ff")
+        self.magnifier.capture()
+        self.assertEqual(self.timer.interval(), frame)
+        self.assertEqual(self.magnifier.color, "#0000ff")
+
+    def test_mouse_move_wakes_up(self):
+        self.magnifier.capture()
+        frame = self.magnifier._frame_interval
+        self.magnifier.capture()
+        self.assertGreater(self.timer.interval(), frame)
+        self.magnifier._on_mouse_move(101, 100)
+        self.assertEqual(self.timer.interval(), frame)
+        self.assertTrue(self.timer.isActive())
+
+        self.position = QPoint(101, 100)
+        self.magnifier.capture()
+        self.assertEqual(self.timer.interval(), frame)
+
+    def test_stops_when_not_tracking(self):
+        self.magnifier.set_track_color(False)
+        self.magnifier.capture()
+        self.assertFalse(self.timer.isActive())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,116 @@
+import os
+import random
+import stat
+import sys
+import tempfile
+import textwrap
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from addons.youtube_downloader.mux import mux_streams, FFmpegError
+
+
+VIDEO = random.Random(0).randbytes(3 << 20)
+AUDIO = random.Random(1).randbytes(300 << 10)
+
+# stands in for ffmpeg: reads every input at the same time and writes them one after the other to the output.
+FAKE_FFMPEG = textwrap.dedent(f"""\
+    #!{sys.executable}
+    import os, sys, threading
+    args = sys.argv[1:]
+    if os.environ.get("FAKE_FFMPEG_FAIL"):
+        sys.stderr.write("Invalid data found when processing input")
+        sys.exit(1)
+    inputs = [args[i + 1] for i, arg in enumerate(args) if arg == "-i"]
+    data = [b""] * len(inputs)
+    def read(index, source):
+        fd = int(source.split(":")[1]) if source.startswith("pipe:") else os.open(source, os.O_RDONLY)
+        with os.fdopen(fd, "rb") as file:
+            data[index] = file.read()
+    threads = [threading.Thread(target=read, args=item) for item in enumerate(inputs)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    with open(args[-1], "wb") as file:
+        file.write(b"".join(data))
+    """)
+
+
+class StreamHandler(BaseHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        body = VIDEO if self.path == "/video" else AUDIO
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class Cancelled(Exception):
+    pass
+
+
+@unittest.skipIf(sys.platform == "win32", "the audio pipe is POSIX only")
+class TestMux(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), StreamHandler)
+        cls.url = f"http://127.0.0.1:{cls.server.server_port}"
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "video.mp4")
+        self.ffmpeg = os.path.join(self.directory.name, "ffmpeg")
+        with open(self.ffmpeg, "w") as file:
+            file.write(FAKE_FFMPEG)
+        os.chmod(self.ffmpeg, os.stat(self.ffmpeg).st_mode | stat.S_IEXEC)
+
+    def tearDown(self):
+        os.environ.pop("FAKE_FFMPEG_FAIL", None)
+        self.directory.cleanup()
+
+    def test_streams_are_piped(self):
+        updates = []
+        mux_streams(f"{self.url}/video", f"{self.url}/audio", self.path, "mp4",
+                    progress=lambda downloaded, total: updates.append((downloaded, total)), ffmpeg=self.ffmpeg)
+        with open(self.path, "rb") as file:
+            self.assertEqual(file.read(), VIDEO + AUDIO)
+        self.assertEqual(updates[-1], (len(VIDEO) + len(AUDIO), len(VIDEO) + len(AUDIO)))
+        # only the muxed file is written
+        self.assertEqual(sorted(os.listdir(self.directory.name)), ["ffmpeg", "video.mp4"])
+
+    def test_cancel_removes_partial_file(self):
+        def progress(downloaded, total):
+            if downloaded > len(VIDEO) // 2:
+                raise Cancelled()
+
+        with self.assertRaises(Cancelled):
+            mux_streams(f"{self.url}/video", f"{self.url}/audio", self.path, "mp4",
+                        progress=progress, ffmpeg=self.ffmpeg)
+        self.assertEqual(os.listdir(self.directory.name), ["ffmpeg"])
+
+    def test_ffmpeg_error(self):
+        os.environ["FAKE_FFMPEG_FAIL"] = "1"
+        with self.assertRaises(FFmpegError) as context:
+            mux_streams(f"{self.url}/video", f"{self.url}/audio", self.path, "mp4", ffmpeg=self.ffmpeg)
+        self.assertIn("Invalid data", str(context.exception))
+        self.assertFalse(os.path.exists(self.path))
+
+    def test_missing_ffmpeg(self):
+        with self.assertRaises(FFmpegError):
+            mux_streams(f"{self.url}/video", f"{self.url}/audio", self.path, "mp4",
+                        ffmpeg=os.path.join(self.directory.name, "missing"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,168 @@
+import os
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+
+from PyQt5.QtGui import QTextCursor
+from PyQt5.QtWidgets import QApplication, QTextEdit
+
+from addons.notes.autosave import AutoSave, SaveWorker, AUTOSAVE_MAX_DELAY
+
+
+app = QApplication.instance() or QApplication([])
+
+
+def wait_until(condition, timeout=5.0):
+    end = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > end:
+            raise TimeoutError
+        app.processEvents()
+        time.sleep(0.005)
+
+
+class TestSaveWorker(unittest.TestCase):
+    def test_latest_snapshot_wins(self):
+        release = threading.Event()
+        written = []
+
+        def save(file_name, text):
+            release.wait()
+            written.append((file_name, text))
+
+        worker = SaveWorker(save)
+        worker.submit("a", "first")
+        time.sleep(0.05)  # "first" is being written now
+        for i in range(100):
+            worker.submit("a", str(i))
+        worker.submit("b", "other")
+        release.set()
+        self.assertTrue(worker.wait(5))
+        self.assertEqual(written[0], ("a", "first"))
+        self.assertEqual(sorted(written[1:]), [("a", "99"), ("b", "other")])
+
+    def test_discard(self):
+        written = []
+        worker = SaveWorker(lambda file_name, text: written.append(file_name))
+        worker.wait()
+        with worker._condition:  # keep the worker from taking the snapshot
+            worker.submit("a", "text")
+            worker.discard("a")
+        self.assertTrue(worker.wait(5))
+        self.assertEqual(written, [])
+
+
+class TestAutoSave(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.writes = 0
+
+        def save(file_name, text):
+            self.writes += 1
+            with open(os.path.join(self.directory.name, file_name), "w") as file:
+                file.write(text)
+
+        self.worker = SaveWorker(save)
+        self.text_edit = QTextEdit()
+        self.text_edit.setAcceptRichText(False)
+        self.autosave = AutoSave(self.text_edit, self.worker, "note.txt")
+
+    def tearDown(self):
+        self.worker.wait()
+        self.directory.cleanup()
+
+    def _read(self):
+        with open(os.path.join(self.directory.name, "note.txt")) as file:
+            return file.read()
+
+    def test_loaded_text_is_not_saved(self):
+        self.text_edit.setPlainText("loaded")
+        self.autosave.mark_saved()
+        self.autosave.flush()
+        self.autosave.save()
+        self.worker.wait()
+        self.assertEqual(self.writes, 0)
+
+    def test_flush_writes_latest_text(self):
+        self.text_edit.setPlainText("hello")
+        self.autosave.mark_saved()
+        self.text_edit.moveCursor(QTextCursor.End)
+        self.text_edit.insertPlainText(" world")
+        self.assertTrue(self.autosave.pending)
+        self.autosave.flush()
+        self.worker.wait()
+        self.assertEqual(self._read(), "hello world")
+        self.assertFalse(self.autosave.pending)
+
+    def test_typing_is_coalesced(self):
+        """Typing into a large note must not convert or write the note on every keystroke."""
+        self.text_edit.setPlainText("lorem ipsum dolor sit amet\n" * 10_000)
+        self.autosave.mark_saved()
+        self.text_edit.moveCursor(QTextCursor.End)
+        saved = []
+        self.autosave.saved.connect(saved.append)
+
+        keystrokes = 200
+        for _ in range(keystrokes):
+            self.text_edit.insertPlainText("x")
+        self.assertTrue(self.autosave.pending)
+        self.assertEqual(saved, [])
+        self.assertEqual(self.writes, 0)
+
+        wait_until(lambda: not self.autosave.pending)
+        self.worker.wait()
+        self.assertEqual(len(saved), 1)
+        self.assertEqual(self.writes, 1)
+        self.assertTrue(self._read().endswith("x" * keystrokes))
+
+    def test_keeps_debouncing_until_max_delay(self):
+        self.text_edit.setPlainText("text")
+        self.autosave.mark_saved()
+        timer = self.autosave._timer = mock.Mock()
+        timer.isActive.return_value = False
+        now = [100.0]
+        with mock.patch("addons.notes.autosave.monotonic", lambda: now[0]):
+            self.text_edit.insertPlainText("a")
+            timer.isActive.return_value = True
+            self.text_edit.insertPlainText("b")
+            self.assertEqual(timer.start.call_count, 2)
+            now[0] += AUTOSAVE_MAX_DELAY / 1000  # the user kept typing
+            self.text_edit.insertPlainText("c")
+        self.assertEqual(timer.start.call_count, 2)
+        self.assertEqual(self.writes, 0)
+
+    def test_failed_write_is_reported(self):
+        def save(file_name, text):
+            raise PermissionError("read only")
+
+        worker = SaveWorker(save)
+        failures = []
+        worker.failed.connect(lambda file_name, error: failures.append((file_name, error)))
+        worker.submit("note", "text")
+        self.assertTrue(worker.wait(5))
+        wait_until(lambda: failures)
+        self.assertEqual(failures, [("note", "read only")])
+
+    def test_worker_survives_any_error(self):
+        written = []
+
+        def save(file_name, text):
+            text.encode("ascii")  # UnicodeEncodeError, like a note the locale encoding can't hold
+            written.append(file_name)
+
+        worker = SaveWorker(save)
+        failures = []
+        worker.failed.connect(lambda file_name, error: failures.append(file_name))
+        worker.submit("note", "\u2603")
+        self.assertTrue(worker.wait(5))
+        worker.submit("other", "text")
+        self.assertTrue(worker.wait(5))
+        self.assertEqual(written, ["other"])
+        wait_until(lambda: failures)
+        self.assertEqual(failures, ["note"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,102 @@
+import unittest
+from unittest import mock
+
+import numpy as np
+from PyQt5.QtCore import QRect
+from PyQt5.QtGui import QColor, QImage, QPixmap
+from PyQt5.QtWidgets import QApplication
+
+from addons.colorpicker.palette import extract_palette, downsample, MAX_SAMPLES
+from addons.colorpicker.screen_capture import image_pixels, grab_region
+
+
+app = QApplication.instance() or QApplication([])
+
+
+class FakeScreen:
+    def __init__(self, geometry, color):
+        self._geometry = geometry
+        self._color = QColor(color)
+
+    def geometry(self):
+        return self._geometry
+
+    def grabWindow(self, window, x, y, width, height):
+        pixmap = QPixmap(width, height)
+        pixmap.fill(self._color)
+        return pixmap
+
+
+def blocks_image(height, width):
+    """An image that is half red, a third green and a sixth blue, with a little noise."""
+    image = np.zeros((height, width, 3), dtype=np.uint8)
+    image[:, :width // 2] = (200, 20, 20)
+    image[:, width // 2:width * 5 // 6] = (20, 200, 20)
+    image[:, width * 5 // 6:] = (20, 20, 200)
+    noise = np.random.default_rng(0).integers(-5, 6, size=image.shape)
+    return np.clip(image + noise, 0, 255).astype(np.uint8)
+
+
+class TestPalette(unittest.TestCase):
+    def test_downsample(self):
+        pixels = np.zeros((2160, 3840, 3), dtype=np.uint8)
+        samples = downsample(pixels)
+        self.assertLessEqual(len(samples), MAX_SAMPLES)
+        self.assertGreater(len(samples), MAX_SAMPLES // 2)
+        self.assertEqual(len(downsample(pixels[:10, :10])), 100)
+
+    def test_palette(self):
+        palettes = list(extract_palette(blocks_image(600, 1200), k=3))
+        self.assertFalse(palettes[0].final)
+        self.assertTrue(palettes[-1].final)
+        self.assertTrue(all(not palette.final for palette in palettes[:-1]))
+
+        palette = palettes[-1]
+        colors = [color for color, _ in palette.dominant]
+        shares = [share for _, share in palette.dominant]
+        for color, expected in zip(colors, [(200, 20, 20), (20, 200, 20), (20, 20, 200)]):
+            np.testing.assert_allclose(color, expected, atol=2)
+        np.testing.assert_allclose(shares, [1 / 2, 1 / 3, 1 / 6], atol=0.02)
+        # the median is per channel, two thirds of the pixels have 20 green and 20 blue.
+        np.testing.assert_allclose(palette.median[1:], (20, 20), atol=6)
+        np.testing.assert_allclose(palette.average, (110, 80, 50), atol=2)
+
+    def test_single_color(self):
+        palette = list(extract_palette(np.full((50, 50, 3), 7, dtype=np.uint8)))[-1]
+        self.assertEqual(palette.dominant, [((7, 7, 7), 1.0)])
+        self.assertEqual(palette.average, (7, 7, 7))
+
+    def test_full_screen(self):
+        palettes = list(extract_palette(blocks_image(2160, 3840), k=3))
+        self.assertTrue(palettes[-1].final)
+        self.assertFalse(any(palette.final for palette in palettes[:-1]))
+        for (color, share), expected in zip(palettes[-1].dominant, [((200, 20, 20), 1 / 2), ((20, 200, 20), 1 / 3),
+                                                                   ((20, 20, 200), 1 / 6)]):
+            np.testing.assert_allclose(color, expected[0], atol=2)
+            self.assertAlmostEqual(share, expected[1], delta=0.02)
+
+    def test_image_pixels(self):
+        image = QImage(5, 3, QImage.Format_RGB32)
+        image.fill(QColor(10, 20, 30))
+        image.setPixel(4, 2, QColor(1, 2, 3).rgb())
+        pixels = image_pixels(image)
+        self.assertEqual(pixels.shape, (3, 5, 3))
+        self.assertEqual(tuple(pixels[0, 0]), (10, 20, 30))
+        self.assertEqual(tuple(pixels[2, 4]), (1, 2, 3))
+
+
+class TestGrabRegion(unittest.TestCase):
+    def test_region_across_screens(self):
+        screens = [FakeScreen(QRect(0, 0, 100, 100), "#ff0000"), FakeScreen(QRect(100, 0, 100, 100), "#0000ff")]
+        with mock.patch("addons.colorpicker.screen_capture.QGuiApplication.screens", lambda: screens):
+            image = grab_region(90, 95, 20, 10)
+            self.assertEqual((image.width(), image.height()), (20, 10))
+            self.assertEqual(image.pixelColor(0, 0).name(), "#ff0000")
+            self.assertEqual(image.pixelColor(19, 0).name(), "#0000ff")
+            # below the screens
+            self.assertEqual(image.pixelColor(0, 9).name(), "#000000")
+            self.assertEqual(grab_region(110, 10, 5, 5).pixelColor(2, 2).name(), "#0000ff")
+
+
+if __name__ == "__main__":
+    unittest.main()
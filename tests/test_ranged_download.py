@@ -0,0 +1,103 @@
+import os
+import random
+import tempfile
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from addons.youtube_downloader.ranged_download import download_file, SEGMENT_SIZE
+
+
+DATA = random.Random(0).randbytes(5 * SEGMENT_SIZE + 12345)
+
+
+class RangeHandler(BaseHTTPRequestHandler):
+    """Serves DATA and supports single byte ranges, like the stream servers of youtube."""
+    ranges = True
+    requests = []
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        range_header = self.headers.get("Range")
+        RangeHandler.requests.append(range_header)
+        if self.ranges and range_header:
+            start, end = (int(x) for x in range_header.split("=")[1].split("-"))
+            body = DATA[start:end + 1]
+            self.send_response(206)
+            self.send_header("Content-Range", f"bytes {start}-{end}/{len(DATA)}")
+        else:
+            body = DATA
+            self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class Interrupted(Exception):
+    pass
+
+
+class TestRangedDownload(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), RangeHandler)
+        cls.url = f"http://127.0.0.1:{cls.server.server_port}/video.mp4"
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        RangeHandler.ranges = True
+        RangeHandler.requests = []
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "video.mp4")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def _read(self):
+        with open(self.path, "rb") as file:
+            return file.read()
+
+    def test_download(self):
+        progress = []
+        download_file(self.url, self.path, progress=lambda done, total: progress.append((done, total)))
+        self.assertEqual(self._read(), DATA)
+        self.assertEqual(progress[-1], (len(DATA), len(DATA)))
+        self.assertEqual(os.listdir(self.directory.name), ["video.mp4"])
+        # the probe and one request per segment
+        self.assertEqual(len(RangeHandler.requests), 1 + 6)
+
+    def test_resume(self):
+        def interrupt(done, total):
+            if done > 3 * SEGMENT_SIZE:
+                raise Interrupted()
+
+        with self.assertRaises(Interrupted):
+            download_file(self.url, self.path, key="video", connections=1, progress=interrupt)
+        self.assertFalse(os.path.exists(self.path))
+        self.assertEqual(os.path.getsize(self.path + ".part"), len(DATA))
+
+        RangeHandler.requests = []
+        progress = []
+        # the url of the stream changed, the key is the same.
+        download_file(self.url + "?expire=2", self.path, key="video",
+                      progress=lambda done, total: progress.append(done))
+        self.assertEqual(self._read(), DATA)
+        self.assertEqual(progress[0], 3 * SEGMENT_SIZE)
+        self.assertEqual(len(RangeHandler.requests), 1 + 3)
+        self.assertFalse(os.path.exists(self.path + ".part.json"))
+
+    def test_server_without_ranges(self):
+        RangeHandler.ranges = False
+        download_file(self.url, self.path)
+        self.assertEqual(self._read(), DATA)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,118 @@
+import json
+import os
+import tempfile
+import unittest
+
+from addons.shortcuts.reorder import DropTargets
+from addons.shortcuts import shortcuts_save as Data
+
+
+class TestDropTargets(unittest.TestCase):
+    def setUp(self):
+        # five nodes of 10 pixels, the third one (20-30) is dragged.
+        self.targets = DropTargets([(0, 10), (10, 20), (20, 30), (30, 40), (40, 50)], 2)
+
+    def test_index_at(self):
+        self.assertEqual(len(self.targets), 4)
+        self.assertEqual(self.targets.index_at(-100), 0)
+        self.assertEqual(self.targets.index_at(4), 0)
+        self.assertEqual(self.targets.index_at(6), 1)
+        self.assertEqual(self.targets.index_at(20), 2)
+        self.assertEqual(self.targets.index_at(36), 3)
+        self.assertEqual(self.targets.index_at(1000), 4)
+
+    def test_boundary_and_move(self):
+        self.assertEqual(self.targets.boundary(0), 0)
+        self.assertEqual(self.targets.boundary(2), 20)
+        self.assertEqual(self.targets.boundary(4), 50)
+        self.assertFalse(self.targets.is_move(2))
+        self.assertTrue(self.targets.is_move(0))
+
+    def test_foreign_node(self):
+        targets = DropTargets([(0, 10), (10, 20), (20, 30)], -1)
+        self.assertEqual(len(targets), 3)
+        self.assertEqual(targets.index_at(16), 2)
+        self.assertTrue(targets.is_move(0))
+        self.assertEqual([targets.nearest(y) for y in (-5, 0, 9, 10, 29, 100)], [0, 0, 0, 1, 2, 2])
+
+    def test_matches_walking_the_nodes(self):
+        spans = [(i * 7, i * 7 + 7) for i in range(50)]
+        for source in (0, 13, 49):
+            targets = DropTargets(spans, source)
+            siblings = [span for i, span in enumerate(spans) if i != source]
+            for y in range(-5, 360):
+                expected = sum(1 for top, bottom in siblings if y >= (top + bottom) / 2)
+                self.assertEqual(targets.index_at(y), expected)
+
+
+class TestMovePersistence(unittest.TestCase):
+    def setUp(self):
+        self._file_path = Data.FILE_PATH
+        handle, Data.FILE_PATH = tempfile.mkstemp(suffix=".json")
+        with os.fdopen(handle, "w") as save_file:
+            save_file.write('{"settings": {}, "groups": {}, "tasks": {}}')
+
+    def tearDown(self):
+        os.remove(Data.FILE_PATH)
+        Data.FILE_PATH = self._file_path
+
+    def _load(self):
+        with open(Data.FILE_PATH) as save_file:
+            return json.load(save_file)
+
+    def test_move_group(self):
+        for name in "abcd":
+            Data.GroupClass(name, group_id=name)
+        Data.move_group("a", 2)
+        self.assertEqual(list(self._load()["groups"]), ["b", "c", "a", "d"])
+        Data.move_group("d", 0)
+        self.assertEqual(Data.load_groups(), ["d", "b", "c", "a"])
+        with self.assertRaises(Data.NotFoundInFile):
+            Data.move_group("x", 0)
+
+    def test_move_task(self):
+        group = Data.GroupClass("group", group_id="g", group_tasks=["t1", "t2", "t3"])
+        group.move_task("t3", 0)
+        self.assertEqual(group.group_tasks, ["t3", "t1", "t2"])
+        self.assertEqual(self._load()["groups"]["g"]["group_tasks"], ["t3", "t1", "t2"])
+        with self.assertRaises(Data.TaskNotFoundInGroup):
+            group.move_task("t9", 0)
+
+    def test_move_after_delete(self):
+        group = Data.GroupClass("group", group_id="g")
+        for number in (1, 2, 3):
+            group.create_task(f"task {number}", task_id=f"t{number}")
+        (loaded, _), = Data.load_all()
+        Data.get_task_by_id("t2").delete_task()  # through another copy of the group
+        loaded.move_task("t3", 0)
+        self.assertEqual(loaded.group_tasks, ["t3", "t1"])
+        self.assertEqual([task.task_id for task in Data.load_all()[0][1]], ["t3", "t1"])
+
+        target = Data.GroupClass("target", group_id="h")
+        Data.get_task_by_id("t1").delete_task()
+        loaded.transfer_task(Data.get_task_by_id("t3"), target)
+        self.assertEqual((loaded.group_tasks, target.group_tasks), ([], ["t3"]))
+        self.assertEqual([[task.task_id for task in tasks] for _, tasks in Data.load_all()], [[], ["t3"]])
+
+    def test_transfer_task(self):
+        source = Data.GroupClass("source", group_id="a", group_tasks=["t1", "t2"])
+        target = Data.GroupClass("target", group_id="b", group_tasks=["t3"])
+        task = Data.TaskClass("a", "task", task_id="t2")
+        source.transfer_task(task, target, 0)
+        groups = self._load()["groups"]
+        self.assertEqual((groups["a"]["group_tasks"], groups["b"]["group_tasks"]), (["t1"], ["t2", "t3"]))
+        self.assertEqual((source.group_tasks, target.group_tasks), (["t1"], ["t2", "t3"]))
+        self.assertEqual(task.group_id, "b")
+        self.assertEqual(Data.get_group_id_of_task("t2"), "b")
+        self.assertFalse(os.path.exists(f"{Data.FILE_PATH}.tmp"))
+
+        Data.move_task_to_group("t1", "a", "b")  # appended without an index
+        self.assertEqual(self._load()["groups"]["b"]["group_tasks"], ["t2", "t3", "t1"])
+        with self.assertRaises(Data.TaskNotFoundInGroup):
+            source.transfer_task(task, target)
+        with self.assertRaises(Data.NotFoundInFile):
+            Data.move_task_to_group("t1", "b", "x")
+
+
+if __name__ == "__main__":
+    unittest.main()
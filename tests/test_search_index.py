@@ -0,0 +1,80 @@
+import unittest
+
+from search_index import SearchIndex, TASK, NOTE, ADDON
+
+
+def _noop():
+    pass
+
+
+class TestSearchIndex(unittest.TestCase):
+    def setUp(self):
+        self.index = SearchIndex()
+        self.index.add("addon:notes", "Notes", ADDON, _noop)
+        self.index.add("addon:shortcuts", "Shortcuts", ADDON, _noop)
+        self.index.add("task:T_1", "Open mail", TASK, _noop, subtitle="https://mail.example.com")
+        self.index.add("note:todo", "todo", NOTE, _noop, text="Buy milk and bread")
+
+    def test_fuzzy_match(self):
+        self.assertEqual(self.index.search("shcut")[0].key, "addon:shortcuts")
+        self.assertEqual(self.index.search("notes")[0].key, "addon:notes")
+        self.assertEqual(self.index.search("zzz"), [])
+        self.assertEqual(self.index.search("   "), [])
+
+    def test_subtitle_and_contents(self):
+        self.assertEqual(self.index.search("example")[0].key, "task:T_1")
+        self.assertEqual(self.index.search("milk")[0].key, "note:todo")
+
+    def test_incremental_updates(self):
+        self.assertEqual(self.index.search("bre")[0].key, "note:todo")
+        self.index.update_text("note:todo", "nothing here")
+        self.assertEqual(self.index.search("bread"), [])
+
+        self.index.remove("addon:notes")
+        self.assertNotIn("addon:notes", self.index)
+        self.assertNotIn("addon:notes", [entry.key for entry in self.index.search("notes")])
+
+        self.index.add("task:T_1", "Renamed", TASK, _noop)
+        self.assertEqual(len(self.index), 3)
+        self.assertEqual(self.index.search("renamed")[0].key, "task:T_1")
+
+    def test_narrowing_query(self):
+        self.index.add("task:T_2", "Open calendar", TASK, _noop)
+        self.assertEqual(len(self.index.search("op")), 2)
+        self.assertEqual([entry.key for entry in self.index.search("open ma")], ["task:T_1"])
+        self.assertEqual(len(self.index.search("o")), 5)
+
+    def test_large_index(self):
+        for i in range(30000):
+            self.index.add(f"task:{i}", f"task number {i}", TASK, _noop, subtitle=f"https://host{i}.example.com")
+        for query in ("t", "ta", "tas", "task", "task 29", "task 299"):
+            results = self.index.search(query)
+        self.assertEqual(results[0].title, "task number 299")
+        self.assertEqual(self.index.search("task 29999")[0].title, "task number 29999")
+
+    def test_suggestions(self):
+        self.assertEqual(self.index.suggestions(), [])
+        tasks = [self.index.get("task:T_1")]
+        self.index.add_suggestions(lambda limit: tasks[:limit])
+        self.index.add_suggestions(lambda limit: [self.index.get("note:todo")] * limit)
+        self.assertEqual([entry.key for entry in self.index.suggestions(3)], ["task:T_1", "note:todo", "note:todo"])
+        self.assertEqual([entry.key for entry in self.index.suggestions(1)], ["task:T_1"])
+
+    def test_contents_are_loaded_at_first_search(self):
+        calls = []
+
+        def load():
+            calls.append(1)
+            self.index.update_text("addon:notes", "a note about groceries")
+
+        self.index.add_content_loader(load)
+        self.index.suggestions()
+        self.index.search("")
+        self.assertEqual(calls, [])
+        self.assertEqual(self.index.search("groceries")[0].key, "addon:notes")
+        self.index.search("groceries")
+        self.assertEqual(calls, [1])
+
+
+if __name__ == "__main__":
+    unittest.main()
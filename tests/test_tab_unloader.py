@@ -0,0 +1,74 @@
+import unittest
+from unittest import mock
+
+from PyQt5.QtWidgets import QApplication, QTabWidget, QWidget
+
+from addons.notes.tab_unloader import TabUnloader
+
+
+app = QApplication.instance() or QApplication([])
+
+
+class Tab(QWidget):
+    def __init__(self):
+        super().__init__()
+        self.loaded = False
+        self.last_used = 0.0
+        self.loads = 0
+
+    def load(self):
+        if not self.loaded:
+            self.loaded = True
+            self.loads += 1
+
+    def unload(self):
+        self.loaded = False
+
+
+class TestTabUnloader(unittest.TestCase):
+    def setUp(self):
+        self.now = 1000.0
+        patcher = mock.patch("addons.notes.tab_unloader.monotonic", lambda: self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.tab_widget = QTabWidget()
+        self.unloader = TabUnloader(self.tab_widget, unload_after=300, check_interval=10)
+        self.tabs = [Tab() for _ in range(3)]
+        for i, tab in enumerate(self.tabs):
+            self.tab_widget.addTab(tab, str(i))
+
+    def test_tabs_are_loaded_when_selected(self):
+        self.assertEqual([tab.loaded for tab in self.tabs], [True, False, False])
+        self.tab_widget.setCurrentIndex(2)
+        self.assertEqual([tab.loaded for tab in self.tabs], [True, False, True])
+        self.tab_widget.setCurrentIndex(0)
+        self.assertEqual(self.tabs[0].loads, 1)
+
+    def test_inactive_tabs_are_unloaded(self):
+        self.tab_widget.setCurrentIndex(1)  # tab 0 is left now
+        self.now += 200
+        self.tab_widget.setCurrentIndex(2)  # tab 1 is left now
+        self.now += 200
+        self.unloader.unload_inactive_tabs()
+        self.assertEqual([tab.loaded for tab in self.tabs], [False, True, True])
+
+        self.now += 1000
+        self.unloader.unload_inactive_tabs()
+        self.assertEqual([tab.loaded for tab in self.tabs], [False, False, True])
+
+        self.tab_widget.setCurrentIndex(0)
+        self.assertTrue(self.tabs[0].loaded)
+        self.assertEqual(self.tabs[0].loads, 2)
+
+    def test_timer_unloads_tabs(self):
+        self.tab_widget.setCurrentIndex(1)
+        self.now += 301
+        self.assertTrue(self.tabs[0].loaded)
+        self.unloader._timer.timeout.emit()
+        self.assertFalse(self.tabs[0].loaded)
+        self.assertTrue(self.unloader._timer.isActive())
+        self.assertEqual(self.unloader._timer.interval(), 10)
+
+
+if __name__ == "__main__":
+    unittest.main()
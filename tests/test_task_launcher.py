@@ -0,0 +1,163 @@
+import json
+import os
+import stat
+import sys
+import tempfile
+import textwrap
+import time
+import unittest
+from concurrent.futures import wait
+
+from PyQt5.QtWidgets import QApplication
+
+from addons.shortcuts import task_launcher as launcher
+from addons.shortcuts import shortcuts_save as Data
+
+
+app = QApplication.instance() or QApplication([])
+
+# stands in for xdg-open: logs its arguments, takes a while and fails for targets with "broken" in them.
+FAKE_OPENER = textwrap.dedent(f"""\
+    #!{sys.executable}
+    import sys, time
+    with open(sys.argv[1], "a") as log:
+        log.write(repr(sys.argv[2:]) + "\\n")
+    time.sleep(0.3)
+    if "broken" in sys.argv[2]:
+        sys.stderr.write("no application for " + sys.argv[2])
+        sys.exit(4)
+    """)
+
+
+class FakeTask:
+    def __init__(self, url=(), file_path=None, directory_path=None):
+        self.url = list(url)
+        self.file_path = file_path
+        self.directory_path = directory_path
+
+
+@unittest.skipIf(sys.platform == "win32", "uses an executable script as the opener")
+class TestTaskLauncher(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.log = os.path.join(self.directory.name, "log")
+        opener = os.path.join(self.directory.name, "opener")
+        with open(opener, "w") as file:
+            file.write(FAKE_OPENER)
+        os.chmod(opener, os.stat(opener).st_mode | stat.S_IEXEC)
+        self._open_command = launcher.open_command
+        launcher.open_command = lambda target: [opener, self.log, target]
+        self.launcher = launcher.TaskLauncher()
+        self.failures = []
+        self.launcher.failed.connect(lambda target, error: self.failures.append((target, error)))
+
+    def tearDown(self):
+        self.launcher.shutdown()
+        launcher.open_command = self._open_command
+        self.directory.cleanup()
+
+    def _wait(self, futures):
+        wait(futures)
+        app.processEvents()
+
+    def test_targets_open_concurrently(self):
+        path = os.path.join(self.directory.name, "a file with 'quotes' and spaces; rm -rf ~")
+        open(path, "w").close()
+        task = FakeTask(["https://example.com/?q=a b", "https://example.org"], path, self.directory.name)
+        self.assertEqual(launcher.task_targets(task), [*task.url, path, self.directory.name])
+
+        self._wait(self.launcher.launch_task(task))
+        with open(self.log) as log:
+            logged = sorted(log.read().splitlines())
+        self.assertEqual(logged, sorted(repr([target]) for target in launcher.task_targets(task)))
+        self.assertEqual(self.failures, [])
+
+    def test_errors(self):
+        missing = os.path.join(self.directory.name, "missing")
+        self._wait(self.launcher.launch(["https://broken.example", missing, "https://example.com"]))
+        failures = dict(self.failures)
+        self.assertEqual(set(failures), {"https://broken.example", missing})
+        self.assertIn("no application", failures["https://broken.example"])
+        self.assertIn("does not exist", failures[missing])
+
+    def test_delay(self):
+        targets = ["https://a.example", "https://b.example", "https://c.example"]
+        self._wait(self.launcher.launch(targets, delay=0.4))
+        with open(self.log) as log:
+            self.assertEqual(log.read().splitlines(), [repr([target]) for target in targets])
+
+    def test_delayed_launches_dont_hold_workers(self):
+        targets = [f"https://{name}.example" for name in "abcdef"]
+        group = self.launcher.launch(targets, delay=60)
+        self._wait(self.launcher.launch(["https://single.example"]))
+        self.assertEqual(len(group), len(targets))
+        self._wait(group[:1])
+        self.assertFalse(any(future.done() for future in group[1:]))
+        self.launcher.shutdown()
+        self.assertTrue(all(future.cancelled() for future in group[1:]))
+        with open(self.log) as log:
+            self.assertEqual(sorted(log.read().splitlines()),
+                             [repr(["https://a.example"]), repr(["https://single.example"])])
+
+    def test_is_url(self):
+        self.assertTrue(launcher.is_url("https://example.com"))
+        self.assertTrue(launcher.is_url("file:///tmp"))
+        self.assertFalse(launcher.is_url("C:\\Users"))
+        self.assertFalse(launcher.is_url("/home/user/file.txt"))
+
+
+class TestGroupLaunch(unittest.TestCase):
+    def setUp(self):
+        self.tasks = [
+            FakeTask(["https://a.example", "https://b.example"], "/file"),
+            FakeTask(["https://b.example"], None, "/folder"),
+            FakeTask(["https://c.example"], "/file"),
+        ]
+
+    def test_orders(self):
+        self.assertEqual(launcher.group_targets(self.tasks),
+                         ["https://a.example", "https://b.example", "/file", "/folder", "https://c.example"])
+        self.assertEqual(launcher.group_targets(self.tasks, launcher.URLS_FIRST),
+                         ["https://a.example", "https://b.example", "https://c.example", "/file", "/folder"])
+        self.assertEqual(launcher.group_targets(self.tasks, launcher.FILES_FIRST),
+                         ["/file", "/folder", "https://a.example", "https://b.example", "https://c.example"])
+        with self.assertRaises(ValueError):
+            launcher.group_targets(self.tasks, "random")
+
+    def test_settings(self):
+        file_path = Data.FILE_PATH
+        handle, Data.FILE_PATH = tempfile.mkstemp(suffix=".json")
+        try:
+            with os.fdopen(handle, "w") as save_file:
+                json.dump({"settings": {}, "groups": {}, "tasks": {}}, save_file)
+            self.assertEqual(launcher.launch_settings(), (launcher.TASK_ORDER, 0))
+            self.assertTrue(launcher.prewarm_enabled())
+            Data.apply_settings(launcher.LAUNCH_ORDER_SETTING, launcher.URLS_FIRST)
+            Data.apply_settings(launcher.LAUNCH_DELAY_SETTING, 250)
+            Data.apply_settings(launcher.PREWARM_SETTING, False)
+            self.assertEqual(launcher.launch_settings(), (launcher.URLS_FIRST, 0.25))
+            self.assertFalse(launcher.prewarm_enabled())
+            Data.apply_settings(launcher.LAUNCH_DELAY_SETTING, "soon")
+            self.assertEqual(launcher.launch_settings(), (launcher.URLS_FIRST, launcher.DEFAULT_LAUNCH_DELAY / 1000))
+        finally:
+            os.remove(Data.FILE_PATH)
+            Data.FILE_PATH = file_path
+
+    def test_prewarm(self):
+        self.assertEqual(launcher.url_host("https://user@Example.com:8080/path"), "example.com")
+        self.assertIsNone(launcher.url_host("file:///tmp"))
+        self.assertIsNone(launcher.url_host("/home/user"))
+
+        prewarmer = launcher.HostPrewarmer()
+        try:
+            urls = ["http://localhost/a", "https://localhost/b", "/folder"]
+            wait(prewarmer.prewarm(urls))
+            self.assertEqual(prewarmer.prewarm(urls), [])  # resolved recently
+            prewarmer._resolved["localhost"] -= launcher.PREWARM_TTL
+            self.assertEqual(len(prewarmer.prewarm(urls)), 1)
+        finally:
+            prewarmer.shutdown()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,43 @@
+import unittest
+from unittest import mock
+
+from PyQt5.QtWidgets import QApplication
+
+import settings
+
+
+app = QApplication.instance() or QApplication([])
+
+
+class TestUIScale(unittest.TestCase):
+    def setUp(self):
+        self.scale = settings.UIScale(1.0)
+        self.changes = []
+        self.scale.changed.connect(self.changes.append)
+        patcher = mock.patch.object(settings.Data, "apply_setting")
+        self.apply_setting = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_saves_last_value_once(self):
+        for value in (1.1, 1.2, 1.3):
+            self.scale.set_value(value)
+        self.assertEqual(self.changes, [1.1, 1.2, 1.3])
+        self.assertEqual(self.scale.scaled(10), 13)
+        self.apply_setting.assert_not_called()
+
+        self.scale.flush()
+        self.apply_setting.assert_called_once_with("ui_scale", 1.3)
+        self.scale.flush()
+        self.assertEqual(self.apply_setting.call_count, 1)
+
+    def test_reset_drops_pending_save(self):
+        self.scale.set_value(2.0)
+        with mock.patch.object(settings.Data, "remove_setting"):
+            self.scale.reset()
+        self.scale.flush()
+        self.apply_setting.assert_not_called()
+        self.assertEqual(self.scale.value, settings.DEFAULT_UI_SCALE)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,69 @@
+import os
+import tempfile
+import time
+import unittest
+
+from addons.shortcuts.usage import UsageLog, HALF_LIFE
+
+
+DAY = 24 * 60 * 60
+
+
+class TestUsageLog(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "usage.log")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def _lines(self):
+        with open(self.path) as log:
+            return log.read().splitlines()
+
+    def test_frecency(self):
+        usage = UsageLog(self.path)
+        now = 1_700_000_000
+        usage.record(["old"] * 4, now - 2 * HALF_LIFE)
+        usage.record(["recent"] * 2, now - DAY)
+        usage.record(["mail", "news"], now)
+        self.assertAlmostEqual(usage.score("old", now), 1.0)
+        self.assertAlmostEqual(usage.score("mail", now), 1.0)
+        self.assertEqual(usage.score("never", now), 0)
+        self.assertEqual(usage.count("old"), 4)
+        self.assertEqual(usage.top(1), ["recent"])
+        self.assertEqual(usage.top(5, among={"old", "news"}), ["news", "old"])
+        self.assertEqual(usage.ranked(["never", "old", "recent", "other"]), ["recent", "old", "never", "other"])
+        self.assertEqual(len(self._lines()), 8)  # appended, one line per launch
+
+        usage.forget("recent")
+        self.assertEqual(usage.top(1, among={"recent", "old"}), ["old"])
+
+    def test_reload_and_compaction(self):
+        now = time.time()  # compaction drops what has decayed by now
+        usage = UsageLog(self.path, compact_lines=20)
+        usage.record(["stale"], now - 20 * HALF_LIFE)
+        for i in range(9):
+            usage.record(["a", "b"], now - i)
+        scores = {task_id: usage.score(task_id, now) for task_id in "ab"}
+        self.assertEqual(len(self._lines()), 19)
+
+        reloaded = UsageLog(self.path, compact_lines=20)
+        self.assertAlmostEqual(reloaded.score("a", now), scores["a"])
+
+        usage.record(["a", "b"], now)  # past the limit
+        self.assertEqual(len(self._lines()), 2)
+        self.assertNotIn("stale", {line.split("\t")[1] for line in self._lines()})
+        compacted = UsageLog(self.path, compact_lines=20)
+        self.assertEqual((compacted.count("a"), compacted.count("b"), compacted.count("stale")), (10, 10, 0))
+        self.assertAlmostEqual(compacted.score("a", now), scores["a"] + 1, places=6)
+        self.assertFalse(os.path.exists(f"{self.path}.tmp"))
+
+    def test_broken_line(self):
+        with open(self.path, "w") as log:
+            log.write("1700000000.000\ta\n17000")
+        self.assertEqual(UsageLog(self.path).count("a"), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,49 @@
+import unittest
+
+from PyQt5.QtWidgets import QApplication
+
+from addons.colorpicker.vcolorpicker.vcolorpicker import ColorPicker
+from addons.colorpicker.vcolorpicker.ui_colorpicker import THEMES, PICKER_STYLE, EDITFIELDS_STYLE
+
+
+app = QApplication.instance() or QApplication([])
+
+
+class TestColorPicker(unittest.TestCase):
+    def test_set_theme(self):
+        picker = ColorPicker(lightTheme=True)
+        widgets = (picker.ui.picker, picker.ui.editfields, picker.ui.title_bar)
+        self.assertEqual(picker.ui.picker.styleSheet(), PICKER_STYLE % THEMES["light"])
+
+        picker.setTheme(False)
+        self.assertFalse(picker.usingLightTheme)
+        self.assertEqual(picker.ui.picker.styleSheet(), PICKER_STYLE % THEMES["dark"])
+        self.assertEqual(picker.ui.editfields.styleSheet(), EDITFIELDS_STYLE % THEMES["dark"])
+        self.assertIn(THEMES["dark"]["title_bar"], picker.ui.title_bar.styleSheet())
+        self.assertEqual(picker.ui.title_bar.minimumHeight(), THEMES["dark"]["title_bar_height"])
+        # the widgets are restyled, not rebuilt.
+        self.assertEqual((picker.ui.picker, picker.ui.editfields, picker.ui.title_bar), widgets)
+
+        picker.setTheme(True)
+        self.assertEqual(picker.ui.picker.styleSheet(), PICKER_STYLE % THEMES["light"])
+        self.assertEqual(picker.ui.title_bar.minimumHeight(), THEMES["light"]["title_bar_height"])
+
+    def test_set_use_alpha(self):
+        picker = ColorPicker(useAlpha=True)
+        self.assertFalse(picker.ui.alpha.isHidden())
+        self.assertFalse(picker.ui.lbl_alpha.isHidden())
+
+        picker.setUseAlpha(False)
+        self.assertFalse(picker.usingAlpha)
+        self.assertTrue(picker.ui.alpha.isHidden())
+        self.assertTrue(picker.ui.lbl_alpha.isHidden())
+        # the previews take the height of the alpha row.
+        self.assertGreater(picker.ui.color_vis.minimumHeight(), 24)
+
+        picker.setUseAlpha(True)
+        self.assertFalse(picker.ui.alpha.isHidden())
+        self.assertEqual(picker.ui.lastcolor_vis.minimumHeight(), 24)
+
+
+if __name__ == "__main__":
+    unittest.main()
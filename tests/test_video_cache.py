@@ -0,0 +1,85 @@
+import threading
+import time
+import unittest
+
+from addons.youtube_downloader.video_cache import VideoCache, get_video_id
+
+
+URL = "https://www.youtube.com/watch?v=dQw4w9WgXcQ"
+
+
+class TestVideoCache(unittest.TestCase):
+    def setUp(self):
+        self.fetches = []
+        self.release = threading.Event()
+        self.release.set()
+
+        def fetch(video_id):
+            self.release.wait()
+            self.fetches.append(video_id)
+            if video_id == "brokenvideo":
+                raise ConnectionError("offline")
+            return f"YouTube({video_id})"
+
+        self.cache = VideoCache(fetch, ttl=0.2, max_entries=2)
+
+    def test_video_id(self):
+        self.assertEqual(get_video_id("https://youtu.be/dQw4w9WgXcQ"), "dQw4w9WgXcQ")
+        self.assertIsNone(get_video_id("not a url"))
+        with self.assertRaises(ValueError):
+            self.cache.get("not a url")
+
+    def test_one_fetch_per_video(self):
+        self.assertEqual(self.cache.get(URL), "YouTube(dQw4w9WgXcQ)")
+        self.cache.get("https://youtu.be/dQw4w9WgXcQ")
+        self.cache.get(URL + "&t=10s")
+        self.assertEqual(self.fetches, ["dQw4w9WgXcQ"])
+
+        time.sleep(0.25)  # expired
+        self.cache.get(URL)
+        self.assertEqual(len(self.fetches), 2)
+
+    def test_prefetch_is_shared(self):
+        self.release.clear()
+        self.cache.prefetch(URL)
+        self.cache.prefetch("hello")  # ignored
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(self.cache.get(URL))) for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        self.release.set()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(results, ["YouTube(dQw4w9WgXcQ)"] * 3)
+        self.assertEqual(self.fetches, ["dQw4w9WgXcQ"])
+
+    def test_fetch_doesnt_block(self):
+        self.release.clear()
+        future = self.cache.fetch(URL)
+        self.assertFalse(future.done())
+        self.assertIs(self.cache.fetch(URL), future)
+        done = threading.Event()
+        future.add_done_callback(lambda future: done.set())
+        self.release.set()
+        self.assertTrue(done.wait(5))
+        self.assertEqual(future.result(), "YouTube(dQw4w9WgXcQ)")
+        self.assertEqual(self.cache.get(URL), "YouTube(dQw4w9WgXcQ)")
+        self.assertEqual(self.fetches, ["dQw4w9WgXcQ"])
+        with self.assertRaises(ValueError):
+            self.cache.fetch("not a url")
+
+    def test_errors_are_not_cached(self):
+        url = "https://www.youtube.com/watch?v=brokenvideo"
+        for _ in range(2):
+            with self.assertRaises(ConnectionError):
+                self.cache.get(url)
+        self.assertEqual(len(self.fetches), 2)
+
+    def test_eviction(self):
+        for video_id in ("aaaaaaaaaaa", "bbbbbbbbbbb", "ccccccccccc", "aaaaaaaaaaa"):
+            self.cache.get(f"https://youtu.be/{video_id}")
+        self.assertEqual(self.fetches, ["aaaaaaaaaaa", "bbbbbbbbbbb", "ccccccccccc", "aaaaaaaaaaa"])
+
+
+if __name__ == "__main__":
+    unittest.main()